@@ -0,0 +1,236 @@
+"""
+Benchmark reproducible del autocompletado (Trie de punto1).
+
+Genera historiales sintéticos con distribución Zipf a partir de las plantillas
+y temas de consultas.txt ("<plantilla> <tema>"), construye el Trie, mide
+tiempo de construcción y memoria, y reproduce sesiones de tecleo carácter a
+carácter midiendo la latencia por pulsación (p50/p95/p99) de cada modo.
+Los resultados se guardan en JSON para comparar versiones.
+
+Uso:
+    python benchmark.py --tamanos 10000 100000 1000000 --salida resultados.json
+    python benchmark.py --tamanos 100000 --comparar resultados_anteriores.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+from punto1 import Trie, NormalizedTrie
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONSULTAS_PATH = os.path.join(BASE_DIR, "consultas.txt")
+SILABAS = ["ca", "fe", "lo", "ma", "ri", "to", "pa", "sa", "de", "mu", "ne", "bo",
+           "la", "gi", "tu", "ra", "co", "me", "da", "sol", "mar", "pre", "tra", "con"]
+MODOS = ["suggest", "top_k", "cursor", "fuzzy"]
+
+
+# ====================
+# Generación de historiales sintéticos
+# ====================
+def extraer_plantillas(consultas):
+    """Separa cada consulta en (plantilla, tema) por el corte con más temas y plantillas distintos combinados"""
+    temas_por_plantilla = defaultdict(set)
+    plantillas_por_tema = defaultdict(set)
+    cortes = []
+    for consulta in consultas:
+        palabras = consulta.split()
+        opciones = [(" ".join(palabras[:i]), " ".join(palabras[i:])) for i in range(1, len(palabras))]
+        for plantilla, tema in opciones:
+            temas_por_plantilla[plantilla].add(tema)
+            plantillas_por_tema[tema].add(plantilla)
+        cortes.append(opciones)
+
+    plantillas, temas = set(), set()
+    for opciones in cortes:
+        if not opciones:
+            continue
+        plantilla, tema = max(opciones, key=lambda o: len(temas_por_plantilla[o[0]]) *
+                              len(plantillas_por_tema[o[1]]))
+        plantillas.add(plantilla)
+        temas.add(tema)
+    return sorted(plantillas), sorted(temas)
+
+
+def generar_historial(plantillas, temas, tamano, zipf_s, rng):
+    """Historial de `tamano` búsquedas con frecuencias Zipf sobre consultas distintas"""
+    distintas_objetivo = max(len(plantillas), tamano // 5)
+    temas = list(temas)
+    # temas sintéticos hasta tener suficientes combinaciones plantilla + tema
+    while len(plantillas) * len(temas) < distintas_objetivo:
+        palabra = "".join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            palabra += " " + "".join(rng.choice(SILABAS) for _ in range(rng.randint(2, 3)))
+        temas.append(palabra)
+
+    distintas = list({f"{p} {t}" for p, t in itertools.product(plantillas, temas)})
+    rng.shuffle(distintas)
+    distintas = distintas[:distintas_objetivo]
+
+    # pesos acumulados 1/rango^s para muestrear con random.choices
+    pesos = list(itertools.accumulate(1 / (rango ** zipf_s) for rango in range(1, len(distintas) + 1)))
+    return rng.choices(distintas, cum_weights=pesos, k=tamano), len(distintas)
+
+
+# ====================
+# Mediciones
+# ====================
+def construir(historial, clase):
+    trie = clase()
+    for consulta in historial:
+        trie.insert(consulta)
+    return trie
+
+
+def contar_nodos(trie):
+    total = 0
+    pila = [trie.root]
+    while pila:
+        nodo = pila.pop()
+        total += 1
+        pila.extend(nodo.children.values())
+    return total
+
+
+def percentiles(muestras):
+    ordenadas = sorted(muestras)
+    n = len(ordenadas)
+
+    def p(q):
+        return ordenadas[min(n - 1, int(round(q / 100 * (n - 1))))] * 1000
+
+    return {"p50": p(50), "p95": p(95), "p99": p(99),
+            "media": sum(ordenadas) / n * 1000, "muestras": n}
+
+
+def reproducir_tecleo(trie, sesiones, modo):
+    """Latencia por pulsación tecleando cada sesión carácter a carácter"""
+    latencias = []
+    reloj = time.perf_counter
+    for consulta in sesiones:
+        cursor = trie.cursor()
+        for i in range(1, len(consulta) + 1):
+            prefijo = consulta[:i]
+            inicio = reloj()
+            if modo == "suggest":
+                trie.suggest(prefijo)
+            elif modo == "top_k":
+                trie.top_k(prefijo, 10)
+            elif modo == "cursor":
+                cursor.sync(prefijo)
+                cursor.suggestions(limit=10)
+            elif modo == "fuzzy":
+                trie.suggest_fuzzy(prefijo, max_edits=1 if len(prefijo) < 8 else 2)
+            latencias.append(reloj() - inicio)
+    return percentiles(latencias)
+
+
+def medir_tamano(plantillas, temas, tamano, args, rng):
+    historial, distintas = generar_historial(plantillas, temas, tamano, args.zipf, rng)
+    clase = NormalizedTrie if args.normalizado else Trie
+
+    inicio = time.perf_counter()
+    trie = construir(historial, clase)
+    construccion = time.perf_counter() - inicio
+
+    memoria_mb = None
+    if not args.sin_memoria:
+        tracemalloc.start()
+        _ = construir(historial, clase)  # vivo hasta medir la memoria retenida
+        memoria_mb = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        del _
+
+    # las sesiones siguen la misma distribución que el historial
+    sesiones = rng.sample(historial, min(args.sesiones, len(historial)))
+    resultado = {
+        "tamano": tamano,
+        "consultas_distintas": distintas,
+        "nodos": contar_nodos(trie),
+        "construccion_s": construccion,
+        "inserciones_por_s": tamano / construccion,
+        "memoria_mb": memoria_mb,
+        "latencias_ms": {modo: reproducir_tecleo(trie, sesiones, modo) for modo in args.modos},
+    }
+    return resultado
+
+
+def version_codigo():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def imprimir(resultado, anterior=None):
+    memoria = f"{resultado['memoria_mb']:.1f} MB" if resultado["memoria_mb"] is not None else "-"
+    print(f"\n▶ {resultado['tamano']} búsquedas ({resultado['consultas_distintas']} distintas, "
+          f"{resultado['nodos']} nodos): construcción {resultado['construccion_s']:.2f} s, {memoria}")
+    for modo, lat in resultado["latencias_ms"].items():
+        linea = f"   {modo:<8} p50 {lat['p50']:8.3f} ms  p95 {lat['p95']:8.3f} ms  p99 {lat['p99']:8.3f} ms"
+        if anterior and modo in anterior["latencias_ms"]:
+            previo = anterior["latencias_ms"][modo]["p95"]
+            if previo:
+                linea += f"  (p95 x{lat['p95'] / previo:.2f} vs anterior)"
+        print(linea)
+
+
+# ====================
+# Main
+# ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de latencia del autocompletado")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--zipf", type=float, default=1.1, help="exponente de la distribución Zipf")
+    parser.add_argument("--sesiones", type=int, default=200, help="consultas tecleadas por tamaño")
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=MODOS)
+    parser.add_argument("--normalizado", action="store_true", help="usar NormalizedTrie")
+    parser.add_argument("--sin-memoria", action="store_true", help="omitir la medición con tracemalloc")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--consultas", default=CONSULTAS_PATH)
+    parser.add_argument("--salida", default="resultados_benchmark.json")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    with open(args.consultas, "r", encoding="utf-8") as f:
+        consultas = [linea.strip() for linea in f if linea.strip()]
+    plantillas, temas = extraer_plantillas(consultas)
+    print(f"✔ {len(plantillas)} plantillas y {len(temas)} temas extraídos de {args.consultas}")
+
+    anteriores = {}
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            anteriores = {r["tamano"]: r for r in json.load(f)["resultados"]}
+
+    rng = random.Random(args.semilla)
+    resultados = []
+    for tamano in args.tamanos:
+        resultado = medir_tamano(plantillas, temas, tamano, args, rng)
+        imprimir(resultado, anteriores.get(tamano))
+        resultados.append(resultado)
+
+    salida = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": version_codigo(),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "zipf": args.zipf,
+            "semilla": args.semilla,
+            "sesiones": args.sesiones,
+            "normalizado": args.normalizado,
+        },
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(salida, f, ensure_ascii=False, indent=2)
+    print(f"\n✔ Resultados guardados en {args.salida}")
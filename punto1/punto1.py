@@ -1,8 +1,27 @@
 import os
+import sys
+import heapq
+import struct
+import unicodedata
+from array import array
+from collections import deque
+from functools import lru_cache
 import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+# ====================
+# Normalización de claves
+# ====================
+@lru_cache(maxsize=65536)
+def normalize_key(text: str, strip_accents: bool = True) -> str:
+    """Clave de indexación cacheada: NFKD + casefold y, opcionalmente, sin diacríticos ("Fútbol" -> "futbol")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    if strip_accents:
+        decomposed = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return decomposed.casefold()
+
+
 # ====================
 # Clase Trie y Nodo
 # ====================
@@ -11,44 +30,518 @@ class TrieNode:
         self.children = {}
         self.is_end_of_word = False
         self.frequency = 0  # contador de frecuencia
+        self.max_frequency = 0  # mayor frecuencia dentro del subárbol
+        self.display_forms = None  # {forma original: frecuencia} (solo en NormalizedTrie)
 
 class Trie:
     def __init__(self):
         self.root = TrieNode()
+        self.version = 0  # cambia cada vez que se crean nodos nuevos
+
+    def normalize(self, text: str) -> str:
+        """Clave con la que se indexa un texto (el Trie básico no lo transforma)"""
+        return text
+
+    def _display(self, node, key):
+        """Forma que se muestra al usuario para la clave de un nodo terminal"""
+        return key
 
     def insert(self, word: str):
         node = self.root
+        path = [node]
         for char in word:
             if char not in node.children:
                 node.children[char] = TrieNode()
+                self.version += 1
             node = node.children[char]
+            path.append(node)
         node.is_end_of_word = True
         node.frequency += 1
+        # propagar la frecuencia máxima hacia los ancestros
+        for ancestor in path:
+            if ancestor.max_frequency < node.frequency:
+                ancestor.max_frequency = node.frequency
+        return node
 
     def _find_words_from_node(self, node, prefix, suggestions):
         if node.is_end_of_word:
-            suggestions.append((prefix, node.frequency))
+            suggestions.append((self._display(node, prefix), node.frequency))
         for char, child in node.children.items():
             self._find_words_from_node(child, prefix + char, suggestions)
 
+    def _ranked_from_node(self, node, prefix):
+        """Devuelve las palabras bajo un nodo ordenadas por frecuencia"""
+        suggestions = []
+        self._find_words_from_node(node, prefix, suggestions)
+        # ordenar por frecuencia (más populares primero)
+        suggestions.sort(key=lambda x: x[1], reverse=True)
+        return [w for w, _ in suggestions]
+
     def suggest(self, prefix: str):
+        prefix = self.normalize(prefix)
         node = self.root
         for char in prefix:
             if char not in node.children:
                 return []
             node = node.children[char]
 
-        suggestions = []
-        self._find_words_from_node(node, prefix, suggestions)
-        # ordenar por frecuencia (más populares primero)
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return [w for w, _ in suggestions]
+        return self._ranked_from_node(node, prefix)
+
+    def suggest_fuzzy(self, prefix: str, max_edits: int = 1, limit: int = 10):
+        """Consultas cuyo prefijo está a distancia de Levenshtein <= max_edits, ordenadas por (distancia, frecuencia)"""
+        prefix = self.normalize(prefix)
+
+        # 1. Recorrer el Trie calculando una fila de la matriz de Levenshtein por nodo,
+        #    solo en la banda |i - profundidad| <= max_edits (fuera de ella se supera el
+        #    presupuesto) y con los valores recortados a max_edits + 1
+        n = len(prefix)
+        cap = max_edits + 1
+        seeds = []  # (distancia, nodo, prefijo del nodo) de cada nodo que coincide
+        stack = [(self.root, "", [min(i, cap) for i in range(n + 1)])]
+        while stack:
+            node, path, row = stack.pop()
+            if row[-1] <= max_edits:
+                seeds.append((row[-1], node, path))
+                if row[-1] == min(row):
+                    continue  # ningún descendiente puede quedar más cerca: sobra bajar
+            depth = len(path) + 1
+            if depth > n + max_edits:
+                continue
+            lo, hi = max(1, depth - max_edits), min(n, depth + max_edits)
+            band = range(lo, hi + 1)
+            for char, child in node.children.items():
+                new_row = [cap] * (n + 1)
+                new_row[0] = best = min(depth, cap)
+                left = new_row[lo - 1]
+                for i in band:
+                    cell = row[i - 1] if prefix[i - 1] == char else row[i - 1] + 1
+                    if row[i] < cell:
+                        cell = row[i] + 1
+                    if left < cell:
+                        cell = left + 1
+                    if cell > cap:
+                        cell = cap
+                    new_row[i] = left = cell
+                    if cell < best:
+                        best = cell
+                # poda: si ninguna celda está dentro del presupuesto, la rama no puede coincidir
+                if best <= max_edits:
+                    stack.append((child, path + char, new_row))
 
+        return [w for w, _ in self._best_first(seeds, limit)]
+
+    def _best_first(self, seeds, limit):
+        """Pares (palabra, frecuencia) por (distancia, frecuencia) expandiendo desde semillas (distancia, nodo, prefijo)"""
+        heap = []
+        counter = 0
+        for dist, node, path in seeds:
+            heap.append((dist, -node.max_frequency, counter, node, path))
+            counter += 1
+        heapq.heapify(heap)
+
+        results = []
+        seen = set()
+        expanded = set()  # un nodo alcanzable desde varias semillas se expande una vez
+        while heap and len(results) < limit:
+            dist, neg_freq, _, node, word = heapq.heappop(heap)
+            if node is None:
+                # entrada de palabra completa
+                if word not in seen:
+                    seen.add(word)
+                    results.append((word, -neg_freq))
+                continue
+            if node in expanded:
+                continue  # ya salió antes con una distancia menor o igual
+            expanded.add(node)
+            if node.is_end_of_word:
+                heapq.heappush(heap, (dist, -node.frequency, counter, None, self._display(node, word)))
+                counter += 1
+            for char, child in node.children.items():
+                heapq.heappush(heap, (dist, -child.max_frequency, counter, child, word + char))
+                counter += 1
+        return results
+
+    def top_k(self, prefix: str, k: int = 10):
+        """Las k consultas más frecuentes con el prefijo dado, como pares (consulta, frecuencia)"""
+        prefix = self.normalize(prefix)
+        node = self.root
+        for char in prefix:
+            if char not in node.children:
+                return []
+            node = node.children[char]
+        return self._best_first([(0, node, prefix)], k)
+
+    def items(self):
+        """Recorre todas las consultas almacenadas como pares (consulta, frecuencia)"""
+        stack = [(self.root, "")]
+        while stack:
+            node, word = stack.pop()
+            if node.is_end_of_word:
+                yield self._display(node, word), node.frequency
+            for char, child in node.children.items():
+                stack.append((child, word + char))
+
+    def cursor(self):
+        """Crea un cursor incremental para autocompletar pulsación a pulsación"""
+        return PrefixCursor(self)
+
+
+class NormalizedTrie(Trie):
+    """Trie por claves normalizadas que muestra la forma original más usada de cada consulta"""
+    def __init__(self, strip_accents: bool = True):
+        super().__init__()
+        self.strip_accents = strip_accents
+
+    def normalize(self, text: str) -> str:
+        return normalize_key(text, self.strip_accents)
+
+    def _display(self, node, key):
+        forms = node.display_forms
+        if not forms:
+            return key
+        return max(forms, key=forms.get)
+
+    def insert(self, word: str):
+        node = super().insert(self.normalize(word))
+        if node.display_forms is None:
+            node.display_forms = {}
+        node.display_forms[word] = node.display_forms.get(word, 0) + 1
+        return node
+
+
+class PrefixCursor:
+    """Cursor que recuerda el nodo del prefijo actual para avanzar o retroceder un carácter por pulsación"""
+    def __init__(self, trie):
+        self.trie = trie
+        self.reset()
+
+    def reset(self):
+        self._chars = []
+        # pila de nodos: _stack[i] es el nodo del prefijo de longitud i
+        # (None cuando el prefijo ya no existe en el Trie)
+        self._stack = [self.trie.root]
+        self._version = self.trie.version
+
+    @property
+    def prefix(self):
+        return "".join(self._chars)
+
+    def advance(self, char: str):
+        """Avanza un carácter desde el nodo actual (O(1))"""
+        node = self._stack[-1]
+        child = node.children.get(char) if node is not None else None
+        self._chars.append(char)
+        self._stack.append(child)
+
+    def retreat(self):
+        """Retrocede un carácter (backspace) recuperando el nodo anterior de la pila"""
+        if self._chars:
+            self._chars.pop()
+            self._stack.pop()
+
+    def sync(self, text: str):
+        """Ajusta el cursor al texto actual avanzando/retrocediendo solo lo que cambió"""
+        text = self.trie.normalize(text)
+        if self._version != self.trie.version and None in self._stack:
+            # se insertaron nodos nuevos: los prefijos sin coincidencia pueden existir ahora
+            self.reset()
+
+        common = 0
+        limit = min(len(self._chars), len(text))
+        while common < limit and self._chars[common] == text[common]:
+            common += 1
+
+        while len(self._chars) > common:
+            self.retreat()
+        for char in text[common:]:
+            self.advance(char)
+
+    def suggestions(self, limit=None):
+        """Sugerencias para el prefijo actual ordenadas por frecuencia (todas o las `limit` mejores)"""
+        node = self._stack[-1]
+        if node is None:
+            return []
+        if limit is not None:
+            return [w for w, _ in self.trie._best_first([(0, node, self.prefix)], limit)]
+        return self.trie._ranked_from_node(node, self.prefix)
+
+
+# ====================
+# Índice invertido por palabras
+# ====================
+class TokenTrieNode:
+    def __init__(self):
+        self.children = {}
+        self.postings = []  # ids de las consultas que contienen la palabra (ordenados)
+
+
+class TokenIndex:
+    """Índice por palabras: encuentra 'receta de pasta' escribiendo 'pasta'"""
+    def __init__(self, normalize=str.lower):
+        self.root = TokenTrieNode()
+        self.normalize = normalize  # función que produce la clave de cada consulta
+        self.queries = []  # id -> consulta tal como se muestra
+        self.frequencies = []  # id -> frecuencia
+        self.ids = {}  # clave de la consulta -> id
+
+    def _tokens(self, text: str):
+        return self.normalize(text).split()
+
+    def add(self, query: str, count: int = 1):
+        """Suma `count` a la consulta; se mostrará con la última forma recibida"""
+        key = self.normalize(query)
+        query_id = self.ids.get(key)
+        if query_id is None:
+            query_id = len(self.queries)
+            self.ids[key] = query_id
+            self.queries.append(query)
+            self.frequencies.append(0)
+            for token in set(key.split()):
+                node = self.root
+                for char in token:
+                    if char not in node.children:
+                        node.children[char] = TokenTrieNode()
+                    node = node.children[char]
+                # los ids crecen, así que la lista de postings queda ordenada
+                node.postings.append(query_id)
+        self.queries[query_id] = query
+        self.frequencies[query_id] += count
+
+    def _find_node(self, token: str):
+        node = self.root
+        for char in token:
+            if char not in node.children:
+                return None
+            node = node.children[char]
+        return node
+
+    def _postings_exact(self, token: str):
+        node = self._find_node(token)
+        return node.postings if node else []
+
+    def _postings_prefix(self, token: str):
+        """Unión de los postings de todas las palabras que empiezan con token"""
+        node = self._find_node(token)
+        if node is None:
+            return set()
+        result = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            result.update(node.postings)
+            stack.extend(node.children.values())
+        return result
+
+    def search(self, text: str, limit: int = 10):
+        """Consultas con todas las palabras escritas (la última como prefijo), ordenadas por frecuencia"""
+        tokens = self._tokens(text)
+        if not tokens:
+            return []
+        partial = None if text[-1].isspace() else tokens.pop()
+
+        # intersección empezando por la lista más corta
+        posting_lists = sorted((self._postings_exact(t) for t in tokens), key=len)
+        if posting_lists:
+            candidates = set(posting_lists[0])
+            for postings in posting_lists[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(postings)
+            if partial is not None and candidates:
+                candidates &= self._postings_prefix(partial)
+        else:
+            candidates = self._postings_prefix(partial)
+
+        ranked = heapq.nsmallest(limit, candidates,
+                                 key=lambda i: (-self.frequencies[i], self.queries[i]))
+        return [self.queries[i] for i in ranked]
+
+
+# ====================
+# Persistencia: snapshot binario + WAL
+# ====================
+SNAPSHOT_MAGIC = b"TRIE"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sIII")  # magic, versión, generación del WAL, número de nodos
+DISPLAY_ENTRY = struct.Struct("<III")  # índice del nodo, frecuencia, bytes de la forma original
+
+
+def _array_to_file(values, f):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+
+
+def _array_from_bytes(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def save_snapshot(trie, path, generation=0):
+    """Guarda el Trie de forma atómica en orden por niveles: hijos, frecuencia y carácter de cada nodo como uint32"""
+    child_counts = array("I")
+    frequencies = array("I")
+    labels = array("I")
+    display = []
+    queue = deque([trie.root])
+    while queue:
+        node = queue.popleft()
+        if node.display_forms:
+            for form, count in node.display_forms.items():
+                display.append((len(child_counts), count, form.encode("utf-8")))
+        child_counts.append(len(node.children))
+        frequencies.append(node.frequency)
+        for char, child in node.children.items():
+            labels.append(ord(char))
+            queue.append(child)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, generation, len(child_counts)))
+        _array_to_file(child_counts, f)
+        _array_to_file(frequencies, f)
+        _array_to_file(labels, f)
+        if display:
+            f.write(struct.pack("<I", len(display)))
+            for index, count, form in display:
+                f.write(DISPLAY_ENTRY.pack(index, count, len(form)))
+                f.write(form)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path, trie_factory=Trie):
+    """Reconstruye el Trie desde un snapshot; devuelve (trie, generación del WAL)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, generation, count = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} no es un snapshot de Trie válido")
+
+    # las columnas se leen directamente como arrays, sin parsear texto
+    offset = SNAPSHOT_HEADER.size
+    size = 4 * count
+    child_counts = _array_from_bytes("I", data[offset:offset + size])
+    frequencies = _array_from_bytes("I", data[offset + size:offset + 2 * size])
+    labels = _array_from_bytes("I", data[offset + 2 * size:offset + 3 * size - 4])
+
+    trie = trie_factory()
+    nodes = [trie.root] + [TrieNode() for _ in range(count - 1)]
+    next_child = 1
+    for i, node in enumerate(nodes):
+        if frequencies[i]:
+            node.is_end_of_word = True
+            node.frequency = frequencies[i]
+        for _ in range(child_counts[i]):
+            node.children[chr(labels[next_child - 1])] = nodes[next_child]
+            next_child += 1
+
+    # sección opcional de formas originales
+    offset += 3 * size - 4
+    if offset < len(data):
+        (entries,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(entries):
+            index, count, length = DISPLAY_ENTRY.unpack_from(data, offset)
+            offset += DISPLAY_ENTRY.size
+            form = data[offset:offset + length].decode("utf-8")
+            offset += length
+            if nodes[index].display_forms is None:
+                nodes[index].display_forms = {}
+            nodes[index].display_forms[form] = count
+
+    # en orden por niveles los hijos van después del padre: recorrido inverso para max_frequency
+    for node in reversed(nodes):
+        best = node.frequency
+        for child in node.children.values():
+            if child.max_frequency > best:
+                best = child.max_frequency
+        node.max_frequency = best
+    trie.version = count
+    return trie, generation
+
+
+class TrieStore:
+    """Persistencia del Trie: snapshot binario periódico más un WAL por generación con las búsquedas posteriores"""
+    def __init__(self, snapshot_path, wal_path, trie_factory=Trie):
+        self.snapshot_path = snapshot_path
+        self.wal_path = wal_path
+        self.trie_factory = trie_factory
+        self.generation = 0
+        self.dirty = False  # hay búsquedas (o un Trie entero) que no están en el snapshot
+        self._wal = None
+
+    def load(self, queries_path=None):
+        """Carga el snapshot (o construye desde el archivo de consultas) y reproduce el WAL"""
+        if os.path.exists(self.snapshot_path):
+            trie, self.generation = load_snapshot(self.snapshot_path, self.trie_factory)
+        else:
+            trie = self.trie_factory()
+            self.dirty = True
+            if queries_path and os.path.exists(queries_path):
+                with open(queries_path, "r", encoding="utf-8") as f:
+                    for linea in f:
+                        consulta = linea.strip()
+                        if consulta:
+                            trie.insert(consulta)
+
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, "r", encoding="utf-8") as f:
+                header = f.readline().split()
+                wal_generation = int(header[1]) if len(header) == 2 else -1
+                # un WAL de una generación anterior ya está incluido en el snapshot
+                if wal_generation >= self.generation:
+                    for linea in f:
+                        consulta = linea.rstrip("\n")
+                        if consulta:
+                            trie.insert(consulta)
+                            self.dirty = True
+                    self.generation = wal_generation
+                    self._wal = open(self.wal_path, "a", encoding="utf-8")
+        if self._wal is None:
+            self._start_wal()
+        return trie
+
+    def _start_wal(self):
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self.wal_path, "w", encoding="utf-8")
+        self._wal.write(f"WAL {self.generation}\n")
+        self._wal.flush()
+
+    def log(self, query: str):
+        """Registra una búsqueda confirmada antes de que llegue al próximo snapshot"""
+        self._wal.write(query.replace("\n", " ") + "\n")
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self.dirty = True
+
+    def checkpoint(self, trie):
+        """Escribe un snapshot nuevo y empieza un WAL vacío de la siguiente generación"""
+        self.generation += 1
+        save_snapshot(trie, self.snapshot_path, self.generation)
+        self._start_wal()
+        self.dirty = False
+
+    def close(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
 
 
 class AutocompleteApp:
-    def __init__(self, root, trie):
+    CHECKPOINT_MS = 60_000  # intervalo entre snapshots
+
+    def __init__(self, root, trie, token_index=None, store=None):
         self.trie = trie
+        self.token_index = token_index
+        self.store = store
+        self.cursor = trie.cursor()
         self.root = root
         self.root.title("Motor de Búsqueda (Trie)")
 
@@ -76,19 +569,52 @@ class AutocompleteApp:
                                        command=self.confirm_search)
         self.search_button.pack(pady=5)
 
+        if self.store is not None:
+            self.root.after(self.CHECKPOINT_MS, self._periodic_checkpoint)
+            self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _periodic_checkpoint(self):
+        # sin búsquedas nuevas en el WAL el snapshot actual sigue al día
+        if self.store.dirty:
+            self.store.checkpoint(self.trie)
+        self.root.after(self.CHECKPOINT_MS, self._periodic_checkpoint)
+
+    def _on_close(self):
+        if self.store.dirty:
+            self.store.checkpoint(self.trie)
+        self.store.close()
+        self.root.destroy()
+
     def update_suggestions(self, event=None):
         prefix = self.entry.get()
         self.listbox.delete(0, tk.END)
 
+        # el cursor solo avanza/retrocede los caracteres que cambiaron
+        self.cursor.sync(prefix)
         if prefix:
-            suggestions = self.trie.suggest(prefix)
+            suggestions = self.cursor.suggestions()
+            if not suggestions:
+                # sin coincidencia exacta: probar con tolerancia a errores de tipeo
+                suggestions = self.trie.suggest_fuzzy(prefix, max_edits=1 if len(prefix) < 8 else 2)
+            if self.token_index is not None:
+                # fuente adicional: consultas que contienen las palabras en cualquier posición
+                # (se deduplica por clave: "Qué es" y "que es" son la misma consulta)
+                shown = {self.trie.normalize(q) for q in suggestions}
+                suggestions += [q for q in self.token_index.search(prefix)
+                                if self.trie.normalize(q) not in shown]
             for word in suggestions:
                 self.listbox.insert(tk.END, word)
 
     def confirm_search(self):
         query = self.entry.get()
         if query:
-            self.trie.insert(query)
+            if self.store is not None:
+                self.store.log(query)
+            node = self.trie.insert(query)
+            if self.token_index is not None:
+                # la misma forma que muestra el Trie (en NormalizedTrie, la más usada)
+                self.token_index.add(self.trie._display(node, self.trie.normalize(query)))
+            self.cursor.reset()
             self.entry.delete(0, tk.END)
             self.listbox.delete(0, tk.END)
 
@@ -97,24 +623,29 @@ class AutocompleteApp:
 # Main
 # ====================
 if __name__ == "__main__":
-    trie = Trie()
-
-    
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     CONSULTAS_PATH = os.path.join(BASE_DIR, "consultas.txt")
+    SNAPSHOT_PATH = os.path.join(BASE_DIR, "consultas.snap")
+    WAL_PATH = os.path.join(BASE_DIR, "consultas.wal")
 
-    # 1. Cargar historial inicial desde consultas.txt (construcción offline)
-    try:
-        with open(CONSULTAS_PATH, "r", encoding="utf-8") as f:
-            for linea in f:
-                consulta = linea.strip()
-                if consulta:
-                    trie.insert(consulta)
+    # 1. Cargar el último snapshot + WAL; sin snapshot, construir desde consultas.txt
+    #    (claves normalizadas: "qué"/"que" y "fútbol"/"futbol" comparten frecuencia)
+    store = TrieStore(SNAPSHOT_PATH, WAL_PATH, trie_factory=NormalizedTrie)
+    if os.path.exists(SNAPSHOT_PATH):
+        trie = store.load()
+        print(f"✔ Snapshot cargado desde {SNAPSHOT_PATH}")
+    elif os.path.exists(CONSULTAS_PATH):
+        trie = store.load(CONSULTAS_PATH)
         print(f"✔ Consultas cargadas desde {CONSULTAS_PATH}")
-    except FileNotFoundError:
+    else:
+        trie = store.load()
         print(f"⚠ No se encontró 'consultas.txt' en {BASE_DIR}. Se usará un diccionario vacío.")
 
+    token_index = TokenIndex(normalize=trie.normalize)
+    for consulta, frecuencia in trie.items():
+        token_index.add(consulta, frecuencia)
+
     # 2. Iniciar la app
     app = tb.Window(themename="flatly")  # prueba otros: "cyborg", "superhero", "darkly"
-    AutocompleteApp(app, trie)
+    AutocompleteApp(app, trie, token_index, store)
     app.mainloop()
@@ -0,0 +1,329 @@
+"""
+Servidor de autocompletado particionado en varios procesos.
+
+El Trie se reparte entre N procesos trabajadores según el primer carácter de
+cada consulta, de modo que una consulta por prefijo solo se envía al shard que
+la contiene (un prefijo vacío se reparte a todos y se mezclan los top-k).
+El frontal es un servidor asyncio sobre TCP o un socket Unix con un protocolo
+de una línea JSON por petición:
+
+    {"op": "suggest", "prefix": "qué", "k": 10}  -> {"results": [["qué es python", 2], ...]}
+    {"op": "insert", "query": "qué es rust"}     -> {"ok": true}
+
+Uso:
+    python servidor.py serve --workers 4 --port 8765
+    python servidor.py bench --workers 1 2 4 --clients 8 --requests 2000
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import multiprocessing as mp
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import zlib
+
+from punto1 import Trie
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONSULTAS_PATH = os.path.join(BASE_DIR, "consultas.txt")
+MAX_PENDIENTES = 64  # peticiones en vuelo por shard (evita llenar el pipe)
+
+
+def shard_de(texto: str, num_shards: int) -> int:
+    """Shard responsable de un texto según su primer carácter (estable entre procesos)"""
+    return zlib.crc32(texto[0].encode("utf-8")) % num_shards
+
+
+def cargar_consultas(path=CONSULTAS_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return [linea.strip() for linea in f if linea.strip()]
+
+
+# ====================
+# Proceso trabajador
+# ====================
+def _trabajador(conn, consultas):
+    """Mantiene el Trie de un shard y atiende peticiones por el pipe"""
+    trie = Trie()
+    for consulta in consultas:
+        trie.insert(consulta)
+
+    while True:
+        try:
+            mensaje = conn.recv()
+        except EOFError:  # el frontal terminó
+            break
+        if mensaje is None:
+            break
+        req_id, op, texto, k = mensaje
+        # Un error en una petición se devuelve al frontal; el shard sigue vivo
+        try:
+            if op == "suggest":
+                respuesta = (req_id, trie.top_k(texto, k), None)
+            elif op == "insert":
+                trie.insert(texto)
+                respuesta = (req_id, True, None)
+            else:
+                respuesta = (req_id, None, f"operación desconocida: {op!r}")
+        except Exception as e:
+            respuesta = (req_id, None, f"{type(e).__name__}: {e}")
+        conn.send(respuesta)
+    conn.close()
+
+
+# ====================
+# Frontal asyncio
+# ====================
+class ShardedAutocompleteServer:
+    def __init__(self, consultas, num_workers: int):
+        self.num_workers = num_workers
+        particiones = [[] for _ in range(num_workers)]
+        for consulta in consultas:
+            particiones[shard_de(consulta, num_workers)].append(consulta)
+        self._particiones = particiones
+        self._conns = []
+        self._procesos = []
+        self._pendientes = []  # por shard: req_id -> future
+        self._limites = []
+        self._siguiente_id = 0
+
+    def start(self):
+        """Lanza los procesos trabajadores y registra sus pipes en el event loop"""
+        loop = asyncio.get_running_loop()
+        for i, particion in enumerate(self._particiones):
+            conn_padre, conn_hijo = mp.Pipe()
+            proceso = mp.Process(target=_trabajador, args=(conn_hijo, particion), daemon=True)
+            proceso.start()
+            conn_hijo.close()
+            loop.add_reader(conn_padre.fileno(), self._recibir, i)
+            self._conns.append(conn_padre)
+            self._procesos.append(proceso)
+            self._pendientes.append({})
+            self._limites.append(asyncio.Semaphore(MAX_PENDIENTES))
+        self._particiones = None  # los datos ya viven en los trabajadores
+
+    def stop(self):
+        loop = asyncio.get_running_loop()
+        for conn, proceso in zip(self._conns, self._procesos):
+            if conn is not None:  # None: el shard ya había terminado
+                loop.remove_reader(conn.fileno())
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+                conn.close()
+            proceso.join(timeout=5)
+
+    def _recibir(self, shard):
+        conn = self._conns[shard]
+        pendientes = self._pendientes[shard]
+        try:
+            while conn.poll():
+                req_id, resultado, error = conn.recv()
+                futuro = pendientes.pop(req_id, None)
+                if futuro is None or futuro.done():
+                    continue
+                if error is None:
+                    futuro.set_result(resultado)
+                else:
+                    futuro.set_exception(RuntimeError(error))
+        except (EOFError, OSError):
+            self._shard_caido(shard)
+
+    def _shard_caido(self, shard):
+        """Retira el pipe de un trabajador muerto y falla sus peticiones en vuelo"""
+        conn = self._conns[shard]
+        asyncio.get_running_loop().remove_reader(conn.fileno())
+        conn.close()
+        self._conns[shard] = None
+        pendientes = self._pendientes[shard]
+        for futuro in pendientes.values():
+            if not futuro.done():
+                futuro.set_exception(ConnectionError(f"el shard {shard} terminó"))
+        pendientes.clear()
+
+    async def _pedir(self, shard, op, texto, k=0):
+        async with self._limites[shard]:
+            if self._conns[shard] is None:
+                raise ConnectionError(f"el shard {shard} terminó")
+            req_id = self._siguiente_id
+            self._siguiente_id += 1
+            futuro = asyncio.get_running_loop().create_future()
+            self._pendientes[shard][req_id] = futuro
+            try:
+                self._conns[shard].send((req_id, op, texto, k))
+            except OSError:
+                self._shard_caido(shard)
+            return await futuro
+
+    async def suggest(self, prefix: str, k: int = 10):
+        """Top-k del prefijo: un solo shard si hay primer carácter, todos si está vacío"""
+        if prefix:
+            return await self._pedir(shard_de(prefix, self.num_workers), "suggest", prefix, k)
+        parciales = await asyncio.gather(*(self._pedir(i, "suggest", "", k)
+                                           for i in range(self.num_workers)))
+        return list(heapq.merge(*parciales, key=lambda par: -par[1]))[:k]
+
+    async def insert(self, query: str):
+        if query:
+            await self._pedir(shard_de(query, self.num_workers), "insert", query)
+
+    async def _atender_cliente(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    peticion = json.loads(linea)
+                    if not isinstance(peticion, dict):
+                        raise ValueError("la petición debe ser un objeto JSON")
+                    if peticion.get("op") == "insert":
+                        query = peticion["query"]
+                        if not isinstance(query, str):
+                            raise ValueError("'query' debe ser una cadena")
+                        await self.insert(query)
+                        respuesta = {"ok": True}
+                    else:
+                        prefix = peticion.get("prefix", "")
+                        if not isinstance(prefix, str):
+                            raise ValueError("'prefix' debe ser una cadena")
+                        resultados = await self.suggest(prefix, int(peticion.get("k", 10)))
+                        respuesta = {"results": resultados}
+                except (ValueError, KeyError, TypeError, AttributeError,
+                        RuntimeError, ConnectionError) as e:
+                    respuesta = {"error": str(e)}
+                writer.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        self.start()
+        # SIGTERM cancela el servidor para que los trabajadores se cierren ordenadamente
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        if unix_path:
+            server = await asyncio.start_unix_server(self._atender_cliente, path=unix_path)
+            print(f"✔ Servidor en {unix_path} con {self.num_workers} trabajadores", flush=True)
+        else:
+            server = await asyncio.start_server(self._atender_cliente, host, port)
+            print(f"✔ Servidor en {host}:{port} con {self.num_workers} trabajadores", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.stop()
+
+
+# ====================
+# Generador de carga
+# ====================
+async def _cliente(host, port, prefijos, num_peticiones, latencias):
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(num_peticiones):
+        peticion = {"op": "suggest", "prefix": random.choice(prefijos), "k": 10}
+        inicio = time.perf_counter()
+        writer.write(json.dumps(peticion).encode("utf-8") + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencias.append(time.perf_counter() - inicio)
+    writer.close()
+
+
+def _proceso_carga(args):
+    """Un proceso generador con varias conexiones concurrentes; devuelve sus latencias"""
+    host, port, prefijos, conexiones, num_peticiones, semilla = args
+    random.seed(semilla)
+    latencias = []
+
+    async def lanzar():
+        await asyncio.gather(*(_cliente(host, port, prefijos, num_peticiones, latencias)
+                               for _ in range(conexiones)))
+
+    asyncio.run(lanzar())
+    return latencias
+
+
+def _percentil(valores_ordenados, p):
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+def _esperar_puerto(host, port, timeout=30):
+    limite = time.time() + timeout
+    while time.time() < limite:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"El servidor no respondió en {host}:{port}")
+
+
+def benchmark(args):
+    """Mide QPS y latencias de cola para cada número de trabajadores"""
+    consultas = cargar_consultas(args.consultas)
+    prefijos = [c[:random.randint(1, len(c))] for c in consultas for _ in range(3)]
+
+    print(f"{'workers':>8} {'QPS':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for num_workers in args.workers:
+        servidor = subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve",
+                                     "--workers", str(num_workers), "--port", str(args.port),
+                                     "--consultas", args.consultas],
+                                    stdout=subprocess.DEVNULL)
+        try:
+            _esperar_puerto("127.0.0.1", args.port)
+            tareas = [("127.0.0.1", args.port, prefijos, args.conexiones,
+                       args.requests, semilla) for semilla in range(args.clients)]
+            inicio = time.perf_counter()
+            with mp.Pool(args.clients) as pool:
+                latencias = [l for parcial in pool.map(_proceso_carga, tareas) for l in parcial]
+            duracion = time.perf_counter() - inicio
+        finally:
+            servidor.terminate()
+            servidor.wait()
+
+        latencias.sort()
+        print(f"{num_workers:>8} {len(latencias) / duracion:>10.0f} "
+              f"{_percentil(latencias, 50) * 1000:>8.2f} "
+              f"{_percentil(latencias, 95) * 1000:>8.2f} "
+              f"{_percentil(latencias, 99) * 1000:>8.2f}")
+
+
+# ====================
+# Main
+# ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de autocompletado particionado")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    serve = sub.add_parser("serve", help="inicia el servidor")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--unix", help="ruta de un socket Unix en lugar de TCP")
+    serve.add_argument("--consultas", default=CONSULTAS_PATH)
+
+    bench = sub.add_parser("bench", help="generador de carga: QPS y latencia según trabajadores")
+    bench.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    bench.add_argument("--clients", type=int, default=4, help="procesos generadores de carga")
+    bench.add_argument("--conexiones", type=int, default=8, help="conexiones por proceso")
+    bench.add_argument("--requests", type=int, default=500, help="peticiones por conexión")
+    bench.add_argument("--port", type=int, default=8765)
+    bench.add_argument("--consultas", default=CONSULTAS_PATH)
+
+    args = parser.parse_args()
+    if args.comando == "serve":
+        servidor = ShardedAutocompleteServer(cargar_consultas(args.consultas), args.workers)
+        try:
+            asyncio.run(servidor.serve(args.host, args.port, args.unix))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+    else:
+        benchmark(args)
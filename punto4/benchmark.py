@@ -0,0 +1,626 @@
+"""
+Benchmarks del enrutador (punto4) sobre tablas sintéticas del tamaño de una
+tabla BGP completa.
+
+Uso:
+    python benchmark.py busqueda --rutas 900000 --busquedas 200000 --pasos 24-8 16-8-8
+    python benchmark.py lote --rutas 900000 --direcciones 20000000
+    python benchmark.py ipv6 --rutas 200000
+    python benchmark.py carga --rutas 1000000
+    python benchmark.py churn --rutas 900000 --operaciones 500000 --actualizaciones 0.1
+    python benchmark.py concurrencia --rutas 900000 --hilos 1 2 4 8 --ritmo 1000
+    python benchmark.py cache --rutas 900000 --capacidades 1024 16384 131072 --zipf 1.0
+    python benchmark.py agregacion --rutas 900000 --interfaces 4 --por-defecto
+    python benchmark.py volcado --rutas 900000
+    python benchmark.py carga --archivo - < tabla.txt
+"""
+import argparse
+import ipaddress
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from punto4 import (IPTrie, IPTrieEntero, TablaMultibit, PatriciaTrie, CacheRutas,
+                    cargar_tabla, parsear_ruta, ip_a_binario, entero_a_ip, rutas_agregadas)
+
+# distribución aproximada de longitudes de prefijo en una tabla BGP pública
+DISTRIBUCION_LONGITUDES = {
+    8: 0.0005, 12: 0.001, 13: 0.002, 14: 0.004, 15: 0.006, 16: 0.015, 17: 0.01,
+    18: 0.02, 19: 0.035, 20: 0.05, 21: 0.05, 22: 0.12, 23: 0.1, 24: 0.57, 32: 0.01,
+}
+LONGITUDES_IPV6 = {29: 0.03, 32: 0.2, 36: 0.03, 40: 0.05, 44: 0.1, 48: 0.59}
+NUM_INTERFACES = 32
+
+
+# ====================
+# Datos sintéticos
+# ====================
+def generar_tabla(num_rutas, rng, num_interfaces=NUM_INTERFACES):
+    """Lista de (prefijo, longitud, interfaz) con longitudes al estilo BGP, sin duplicados"""
+    longitudes = list(DISTRIBUCION_LONGITUDES)
+    pesos = list(DISTRIBUCION_LONGITUDES.values())
+    vistas = set()
+    rutas = []
+    while len(rutas) < num_rutas:
+        for longitud in rng.choices(longitudes, pesos, k=num_rutas - len(rutas)):
+            # espacio unicast 1.0.0.0 - 223.255.255.255
+            prefijo = rng.randrange(1 << 24, 224 << 24) & ~((1 << (32 - longitud)) - 1)
+            if (prefijo, longitud) not in vistas:
+                vistas.add((prefijo, longitud))
+                rutas.append((prefijo, longitud, f"Interfaz {rng.randrange(num_interfaces)}"))
+    return rutas
+
+
+def generar_destinos(rutas, num_busquedas, rng):
+    """Destinos: 90% dentro de alguna ruta de la tabla y 10% aleatorios"""
+    destinos = []
+    for _ in range(num_busquedas):
+        if rng.random() < 0.9:
+            prefijo, longitud, _ = rng.choice(rutas)
+            destinos.append(prefijo | rng.getrandbits(32 - longitud) if longitud < 32 else prefijo)
+        else:
+            destinos.append(rng.getrandbits(32))
+    return destinos
+
+
+def generar_tabla_ipv6(num_rutas, rng):
+    """Prefijos IPv6 globales (2000::/3) con longitudes típicas de la tabla pública"""
+    longitudes = list(LONGITUDES_IPV6)
+    pesos = list(LONGITUDES_IPV6.values())
+    rutas = {}
+    while len(rutas) < num_rutas:
+        longitud = rng.choices(longitudes, pesos)[0]
+        prefijo = ((0b001 << 125) | rng.getrandbits(125)) & (((1 << longitud) - 1) << (128 - longitud))
+        rutas[(prefijo, longitud)] = f"Interfaz {rng.randrange(NUM_INTERFACES)}"
+    return [(prefijo, longitud, interfaz) for (prefijo, longitud), interfaz in rutas.items()]
+
+
+def contar_nodos(trie):
+    total = 0
+    pila = [trie.root]
+    while pila:
+        node = pila.pop()
+        total += 1
+        pila.extend(node.children.values())
+    return total
+
+
+def construir_iptrie(rutas):
+    trie = IPTrie()
+    for prefijo, longitud, interfaz in rutas:
+        trie.insertar_prefijo(format(prefijo, "032b"), longitud, interfaz)
+    return trie
+
+
+def construir_entero(rutas):
+    tabla = IPTrieEntero()
+    for prefijo, longitud, interfaz in rutas:
+        tabla.insertar_prefijo(prefijo, longitud, interfaz)
+    return tabla
+
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def percentil_ms(ordenados, q):
+    return ordenados[min(len(ordenados) - 1, int(round(q / 100 * (len(ordenados) - 1))))] * 1000
+
+
+def reportar(nombre, num_busquedas, segundos, referencia=None):
+    linea = f"  {nombre:<32} {num_busquedas / segundos:>12,.0f} búsquedas/s"
+    if referencia:
+        linea += f"   x{referencia / segundos:.2f}"
+    print(linea)
+
+
+# ====================
+# Benchmarks
+# ====================
+def bench_busqueda(args):
+    """IPTrie con cadenas '0'/'1' frente a IPTrieEntero y las tablas multibit compiladas"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng)
+    destinos = generar_destinos(rutas, args.busquedas, rng)
+    destinos_bin = [format(ip, "032b") for ip in destinos]
+
+    trie, t_trie = cronometrar(construir_iptrie, rutas)
+    tabla, t_tabla = cronometrar(construir_entero, rutas)
+    print(f"Tabla de {len(rutas):,} rutas: IPTrie {t_trie:.1f} s, IPTrieEntero {t_tabla:.1f} s "
+          f"({len(tabla):,} nodos)")
+
+    esperado, t_base = cronometrar(lambda: [trie.buscar_ruta(format(ip, "032b")) for ip in destinos])
+    _, t_sin_conversion = cronometrar(lambda: [trie.buscar_ruta(ip) for ip in destinos_bin])
+    obtenido, t_entero = cronometrar(lambda: [tabla.buscar_ruta(ip) for ip in destinos])
+    assert esperado == obtenido, "IPTrieEntero no coincide con IPTrie"
+
+    print(f"{len(destinos):,} búsquedas:")
+    reportar("IPTrie (entero -> cadena)", len(destinos), t_base)
+    reportar("IPTrie (cadena ya convertida)", len(destinos), t_sin_conversion, t_base)
+    reportar("IPTrieEntero (enteros)", len(destinos), t_entero, t_base)
+
+    for pasos in args.pasos:
+        multibit, t_compilar = cronometrar(TablaMultibit, tabla, pasos)
+        obtenido, t_multibit = cronometrar(lambda: [multibit.buscar_ruta(ip) for ip in destinos])
+        assert esperado == obtenido, f"TablaMultibit {pasos} no coincide con IPTrie"
+        nombre = "Multibit " + "-".join(map(str, pasos))
+        reportar(nombre, len(destinos), t_multibit, t_base)
+        print(f"  {'':<32} compilada en {t_compilar:.1f} s, "
+              f"{multibit.num_entradas() * 4 / 2 ** 20:.0f} MB de entradas")
+
+        ids, t_lote = cronometrar(multibit.buscar_lote, np.array(destinos, dtype=np.uint32))
+        assert [multibit.interfaces[i] if i >= 0 else None for i in ids] == esperado
+        reportar(nombre + " (lote NumPy)", len(destinos), t_lote, t_base)
+
+
+def bench_lote(args):
+    """Resolución masiva de direcciones con TablaMultibit.buscar_lote"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng)
+    tabla = construir_entero(rutas)
+    multibit, t_compilar = cronometrar(TablaMultibit, tabla, args.pasos)
+    print(f"Tabla de {len(rutas):,} rutas compilada ({'-'.join(map(str, args.pasos))}) "
+          f"en {t_compilar:.1f} s")
+
+    ips = np.random.default_rng(args.semilla).integers(0, 2 ** 32, args.direcciones, dtype=np.uint32)
+    ids, segundos = cronometrar(multibit.buscar_lote, ips)
+    muestra = range(0, len(ips), max(1, len(ips) // 10_000))
+    assert all(ids[i] == multibit.buscar_ruta_id(int(ips[i])) for i in muestra)
+    print(f"{len(ips):,} direcciones en {segundos:.2f} s -> "
+          f"{len(ips) / segundos:,.0f} direcciones/s ({np.count_nonzero(ids >= 0):,} con ruta)")
+
+
+def bench_churn(args):
+    """Mezcla de altas, bajas y reemplazos de rutas con búsquedas sobre la tabla compilada"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas + args.operaciones, rng)
+    activas, reserva = rutas[:args.rutas], rutas[args.rutas:]
+
+    for pasos in args.pasos:
+        fuente = IPTrieEntero()
+        fuente.cargar_ordenadas(sorted(activas))
+        multibit, t_compilar = cronometrar(TablaMultibit, fuente, pasos)
+        vigentes = [(prefijo, longitud) for prefijo, longitud, _ in activas]
+        nuevas = iter(reserva)
+        rng_ops = random.Random(args.semilla)
+        latencias = []
+        busquedas = 0
+        t_busquedas = 0.0
+        reloj = time.perf_counter
+        for _ in range(args.operaciones):
+            if rng_ops.random() >= args.actualizaciones:
+                ip = rng_ops.getrandbits(32)
+                inicio = reloj()
+                multibit.buscar_ruta_id(ip)
+                t_busquedas += reloj() - inicio
+                busquedas += 1
+                continue
+
+            tipo = rng_ops.random()
+            if tipo < 1 / 3:  # baja de una ruta existente
+                indice = rng_ops.randrange(len(vigentes))
+                vigentes[indice], vigentes[-1] = vigentes[-1], vigentes[indice]
+                prefijo, longitud = vigentes.pop()
+                inicio = reloj()
+                fuente.eliminar_prefijo(prefijo, longitud)
+            elif tipo < 2 / 3:  # alta de una ruta nueva
+                prefijo, longitud, interfaz = next(nuevas)
+                vigentes.append((prefijo, longitud))
+                inicio = reloj()
+                fuente.insertar_prefijo(prefijo, longitud, interfaz)
+            else:  # cambio de siguiente salto
+                prefijo, longitud = rng_ops.choice(vigentes)
+                interfaz = f"Interfaz {rng_ops.randrange(NUM_INTERFACES)}"
+                inicio = reloj()
+                fuente.insertar_prefijo(prefijo, longitud, interfaz)
+            multibit.actualizar(prefijo, longitud)
+            latencias.append(reloj() - inicio)
+
+        compilada = TablaMultibit(fuente, pasos)
+        muestra = [rng.getrandbits(32) for _ in range(100_000)] + \
+                  [prefijo for prefijo, _ in rng.sample(vigentes, min(100_000, len(vigentes)))]
+        assert all(multibit.buscar_ruta(ip) == compilada.buscar_ruta(ip) for ip in muestra), \
+            "la tabla actualizada no coincide con una compilación desde cero"
+
+        latencias.sort()
+        print(f"Multibit {'-'.join(map(str, pasos))} sobre {args.rutas:,} rutas "
+              f"(recompilación completa: {t_compilar:.2f} s)")
+        print(f"  {len(latencias):,} actualizaciones incrementales: p50 {percentil_ms(latencias, 50):.3f} ms  "
+              f"p99 {percentil_ms(latencias, 99):.3f} ms  máx {latencias[-1] * 1000:.3f} ms")
+        reportar("búsquedas intercaladas", busquedas, t_busquedas)
+
+
+def bench_concurrencia(args):
+    """
+    Varios hilos lectores buscando mientras un hilo de control retira y vuelve
+    a anunciar rutas: IPTrie en el sitio con un cerrojo global frente al modo
+    copia en escritura, donde los lectores no toman ningún cerrojo.
+    """
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng)
+    destinos = [format(ip, "032b") for ip in generar_destinos(rutas, 200_000, rng)]
+    cambios = [(format(prefijo, "032b"), longitud, interfaz)
+               for prefijo, longitud, interfaz in rng.sample(rutas, min(len(rutas), 10_000))]
+    print(f"Tabla de {len(rutas):,} rutas, {args.duracion:.1f} s por medición, "
+          f"escritor a {args.ritmo:,} actualizaciones/s")
+    print(f"  {'modo':<20} {'hilos':>5} {'búsquedas/s':>14} {'act. aplicadas':>15} "
+          f"{'act. p50 ms':>12} {'act. p99 ms':>12}")
+
+    for modo in ("cerrojo global", "copia en escritura"):
+        for hilos in args.hilos:
+            trie = IPTrie(copia_en_escritura=modo == "copia en escritura")
+            trie.cargar_ordenadas(sorted(rutas))
+            cerrojo = threading.Lock()
+            if trie.copia_en_escritura:
+                buscar = trie.buscar_ruta
+            else:
+                def buscar(ip_binaria):
+                    with cerrojo:
+                        return trie.buscar_ruta(ip_binaria)
+
+            parar = threading.Event()
+            contadores = []
+            latencias = []
+
+            def lector(desplazamiento):
+                total = 0
+                while not parar.is_set():
+                    for ip_binaria in destinos[desplazamiento:desplazamiento + 1000]:
+                        buscar(ip_binaria)
+                    total += 1000
+                    desplazamiento = (desplazamiento + 1000) % (len(destinos) - 1000)
+                contadores.append(total)
+
+            def escritor():
+                reloj = time.perf_counter
+                i = 0
+                while not parar.is_set():
+                    prefijo, longitud, interfaz = cambios[i % len(cambios)]
+                    inicio = reloj()
+                    if trie.copia_en_escritura:
+                        trie.eliminar_prefijo(prefijo, longitud)
+                        trie.insertar_prefijo(prefijo, longitud, interfaz)
+                    else:
+                        with cerrojo:
+                            trie.eliminar_prefijo(prefijo, longitud)
+                        with cerrojo:
+                            trie.insertar_prefijo(prefijo, longitud, interfaz)
+                    latencias.append((reloj() - inicio) / 2)
+                    i += 1
+                    time.sleep(2 / args.ritmo)  # una baja y un alta por iteración
+
+            hilos_activos = [threading.Thread(target=lector, args=(i * 7919 % len(destinos),))
+                             for i in range(hilos)] + [threading.Thread(target=escritor)]
+            for hilo in hilos_activos:
+                hilo.start()
+            time.sleep(args.duracion)
+            parar.set()
+            for hilo in hilos_activos:
+                hilo.join()
+
+            latencias.sort()
+            print(f"  {modo:<20} {hilos:>5} {sum(contadores) / args.duracion:>14,.0f} "
+                  f"{2 * len(latencias):>15,} {percentil_ms(latencias, 50):>12.3f} "
+                  f"{percentil_ms(latencias, 99):>12.3f}")
+
+            referencia = IPTrie()
+            referencia.cargar_ordenadas(sorted(rutas))
+            assert all(trie.buscar_ruta(d) == referencia.buscar_ruta(d) for d in destinos[:20_000])
+
+
+def bench_cache(args):
+    """CacheRutas delante de IPTrie con tráfico Zipf y cambios de rutas intercalados"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng)
+    distintos = generar_destinos(rutas, args.destinos, rng)
+    pesos = list(itertools.accumulate(1 / rango ** args.zipf for rango in range(1, len(distintos) + 1)))
+    trafico = rng.choices(distintos, cum_weights=pesos, k=args.busquedas)
+
+    # cambios de ruta intercalados en el tráfico: bajas y realtas de las rutas retiradas
+    posiciones = sorted(rng.sample(range(len(trafico)), int(len(trafico) * args.actualizaciones)))
+    candidatas = rng.sample(rutas, len(posiciones))
+    retiradas = []
+    cambios = {}
+    for posicion in posiciones:
+        if retiradas and rng.random() < 0.5:
+            cambios[posicion] = (True,) + retiradas.pop()
+        else:
+            retiradas.append(candidatas.pop())
+            cambios[posicion] = (False,) + retiradas[-1]
+
+    def reproducir(buscar, al_cambiar=None):
+        trie = construir_iptrie(rutas)
+        resultados = []
+        inicio = time.perf_counter()
+        for posicion, ip in enumerate(trafico):
+            cambio = cambios.get(posicion)
+            if cambio is not None:
+                alta, prefijo, longitud, interfaz = cambio
+                if alta:
+                    trie.insertar_prefijo(format(prefijo, "032b"), longitud, interfaz)
+                else:
+                    trie.eliminar_prefijo(format(prefijo, "032b"), longitud)
+                if al_cambiar:
+                    al_cambiar(prefijo, longitud)
+            resultados.append(buscar(trie, ip))
+        return resultados, time.perf_counter() - inicio
+
+    esperado, t_base = reproducir(lambda trie, ip: trie.buscar_ruta(format(ip, "032b")))
+    print(f"Tabla de {len(rutas):,} rutas, {len(trafico):,} búsquedas sobre {len(distintos):,} destinos "
+          f"(Zipf {args.zipf}), {len(cambios):,} cambios de ruta intercalados")
+    reportar("IPTrie sin caché", len(trafico), t_base)
+
+    for capacidad in args.capacidades:
+        actual = {}  # el trie de la reproducción en curso, para la función de fallo
+
+        def buscar(trie, ip):
+            actual["trie"] = trie
+            return cache.buscar_ruta(ip)
+
+        cache = CacheRutas(lambda ip: actual["trie"].buscar_ruta(format(ip, "032b")), capacidad)
+        obtenido, segundos = reproducir(buscar, cache.invalidar)
+        assert obtenido == esperado, "la caché devolvió una ruta distinta a la del trie"
+        reportar(f"CacheRutas({capacidad:,})", len(trafico), segundos, t_base)
+        print(f"  {'':<32} aciertos {cache.tasa_aciertos:6.1%}, expulsiones {cache.expulsiones:,}, "
+              f"invalidaciones {cache.invalidaciones:,}")
+
+
+def bench_agregacion(args):
+    """Tabla original frente a la agregada con ORTC: rutas, nodos y búsquedas/s"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng, args.interfaces)
+    if args.por_defecto:
+        rutas.append((0, 0, "Gateway por Defecto"))
+    # ambas tablas con la misma carga ordenada, para comparar solo su tamaño
+    trie = IPTrie()
+    trie.cargar_ordenadas(sorted(rutas))
+    agregado, segundos = cronometrar(trie.compactar)
+    num_agregadas = sum(1 for _ in rutas_agregadas(agregado))
+    print(f"Agregación ORTC en {segundos:.1f} s ({args.interfaces} interfaces"
+          f"{', con ruta por defecto' if args.por_defecto else ''}):")
+    print(f"  {'':<10} {'rutas':>12} {'nodos':>12}")
+    print(f"  {'original':<10} {len(rutas):>12,} {contar_nodos(trie):>12,}")
+    print(f"  {'agregada':<10} {num_agregadas:>12,} {contar_nodos(agregado):>12,}")
+
+    destinos = generar_destinos(rutas, args.busquedas, rng)
+    destinos += [prefijo for prefijo, longitud, _ in rutas if longitud == 32]  # rutas de host
+    destinos = [format(ip, "032b") for ip in destinos]
+    esperado, t_original = cronometrar(lambda: [trie.buscar_ruta(d) for d in destinos])
+    obtenido, t_agregado = cronometrar(lambda: [agregado.buscar_ruta(d) for d in destinos])
+    assert esperado == obtenido, "la tabla agregada no da el mismo prefijo más largo"
+    print(f"{len(destinos):,} búsquedas:")
+    reportar("IPTrie original", len(destinos), t_original)
+    reportar("IPTrie agregado", len(destinos), t_agregado, t_original)
+
+
+def bench_volcado(args):
+    """Listado de la tabla con cadenas binarias frente a iter_rutas, y consultas por rango"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla(args.rutas, rng)
+    trie = IPTrie()
+    trie.cargar_ordenadas(sorted(rutas))
+
+    def listado_binario():
+        # el camino anterior de mostrar_rutas: prefijo + bit, ljust, int(..., 2) e IPv4Address
+        lineas = []
+        for binario, interfaz in trie.obtener_todas_rutas():
+            ip_str = str(ipaddress.IPv4Address(int(binario.ljust(32, "0"), 2)))
+            lineas.append(f"{ip_str}/{len(binario)} -> {interfaz}")
+        return lineas
+
+    def listado_entero():
+        return [f"{entero_a_ip(prefijo)}/{longitud} -> {interfaz}"
+                for prefijo, longitud, interfaz in trie.iter_rutas()]
+
+    anterior, t_anterior = cronometrar(listado_binario)
+    nuevo, t_nuevo = cronometrar(listado_entero)
+    assert sorted(anterior) == sorted(nuevo)
+    _, t_recorrido = cronometrar(lambda: sum(1 for _ in trie.iter_rutas()))
+    print(f"Listado de {len(rutas):,} rutas:")
+    print(f"  {'obtener_todas_rutas + IPv4Address':<36} {t_anterior:6.2f} s")
+    print(f"  {'iter_rutas + entero_a_ip':<36} {t_nuevo:6.2f} s   x{t_anterior / t_nuevo:.2f}")
+    print(f"  {'iter_rutas (solo recorrido)':<36} {t_recorrido:6.2f} s")
+
+    # consultas perezosas: solo se recorre lo que se consume
+    prefijos = [prefijo for prefijo, longitud, _ in rng.sample(rutas, args.consultas)]
+    _, t_cubiertas = cronometrar(lambda: [sum(1 for _ in trie.rutas_cubiertas_por(p, 16)) for p in prefijos])
+    _, t_primera = cronometrar(lambda: [next(trie.rutas_cubiertas_por(p, 8), None) for p in prefijos])
+    _, t_cubren = cronometrar(lambda: [list(trie.rutas_que_cubren(p)) for p in prefijos])
+    print(f"{args.consultas:,} consultas:")
+    reportar("rutas_cubiertas_por(/16) completas", args.consultas, t_cubiertas)
+    reportar("rutas_cubiertas_por(/8) primera", args.consultas, t_primera)
+    reportar("rutas_que_cubren(dirección)", args.consultas, t_cubren)
+
+
+def escribir_volcado(rutas, archivo):
+    for prefijo, longitud, interfaz in rutas:
+        archivo.write(f"{ipaddress.IPv4Address(prefijo)}/{longitud} {interfaz}\n")
+
+
+def cargar_una_a_una(archivo, trie):
+    """Referencia: el camino de agregar_prefijo (IPv4Network + inserción desde la raíz)"""
+    for linea in archivo:
+        if not linea.strip() or linea.startswith("#"):
+            continue
+        red, interfaz = linea.split(None, 1)
+        red = ipaddress.IPv4Network(red, strict=False)
+        trie.insertar_prefijo(ip_a_binario(str(red.network_address)), red.prefixlen, interfaz.strip())
+
+
+def comprobar_parseo():
+    """parsear_ruta acepta la notación canónica y rechaza octetos o longitudes mal escritos"""
+    assert parsear_ruta("10.1.2.3/8 eth0\n") == (10 << 24, 8, "eth0")
+    assert parsear_ruta("0.0.0.0/0 eth1") == (0, 0, "eth1")
+    assert parsear_ruta("192.168.1.1 eth2") == (0xC0A80101, 32, "eth2")
+    for prefijo in ("1_0.0.0.0/8", "+1.2.3.4/8", "010.0.0.0/8", "1.2.3.\u0664/32", "1.2.3.256/32",
+                    "1.2.3/24", "1.2.3.4.5/32", "1..3.4/32", "1.2.3.4/", "1.2.3.4/+8", "1.2.3.4/33"):
+        try:
+            parsear_ruta(f"{prefijo} eth0")
+        except ValueError:
+            continue
+        raise AssertionError(f"parsear_ruta aceptó {prefijo!r}")
+
+
+def bench_carga(args):
+    """Carga masiva de un volcado de texto: rutas/s y pico de memoria"""
+    comprobar_parseo()
+    if args.archivo == "-":
+        # stdin solo se puede leer una vez: se copia a un temporal para repetir la carga
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(sys.stdin.read())
+        ruta_volcado = f.name
+    elif args.archivo:
+        ruta_volcado = args.archivo
+    else:
+        rutas = generar_tabla(args.rutas, random.Random(args.semilla))
+        random.Random(args.semilla).shuffle(rutas)  # un volcado real no viene ordenado
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            escribir_volcado(rutas, f)
+        ruta_volcado = f.name
+
+    def medir(nombre, cargar, clase):
+        def ejecutar():
+            with open(ruta_volcado, "r", encoding="utf-8") as f:
+                cargar(f, clase())
+
+        _, segundos = cronometrar(ejecutar)
+        linea = f"  {nombre:<36} {segundos:6.2f} s {num_rutas / segundos:>12,.0f} rutas/s"
+        if not args.sin_memoria:
+            tracemalloc.start()
+            ejecutar()
+            linea += f"   pico {tracemalloc.get_traced_memory()[1] / 2 ** 20:7.1f} MB"
+            tracemalloc.stop()
+        print(linea)
+
+    try:
+        with open(ruta_volcado, "r", encoding="utf-8") as f:
+            num_rutas = sum(1 for linea in f if linea.strip() and not linea.startswith("#"))
+        print(f"Volcado de {num_rutas:,} rutas ({os.path.getsize(ruta_volcado) / 2 ** 20:.1f} MB)")
+        if not args.sin_referencia:
+            medir("IPTrie, una a una (agregar_prefijo)", cargar_una_a_una, IPTrie)
+        medir("IPTrie, carga ordenada", cargar_tabla, IPTrie)
+        medir("IPTrieEntero, carga ordenada", cargar_tabla, IPTrieEntero)
+    finally:
+        if args.archivo != ruta_volcado:
+            os.remove(ruta_volcado)
+
+
+def bench_ipv6(args):
+    """Trie por bits con cadenas de 128 caracteres frente al PatriciaTrie comprimido"""
+    rng = random.Random(args.semilla)
+    rutas = generar_tabla_ipv6(args.rutas, rng)
+    destinos = []
+    for _ in range(args.busquedas):
+        prefijo, longitud, _ = rng.choice(rutas)
+        destinos.append(prefijo | rng.getrandbits(128 - longitud))
+
+    def construir_por_bits():
+        trie = IPTrie()
+        for prefijo, longitud, interfaz in rutas:
+            trie.insertar_prefijo(format(prefijo, "0128b"), longitud, interfaz)
+        return trie
+
+    def construir_patricia():
+        trie = PatriciaTrie(bits=128)
+        for prefijo, longitud, interfaz in rutas:
+            trie.insertar(prefijo, longitud, interfaz)
+        return trie
+
+    por_bits, t_bits = cronometrar(construir_por_bits)
+    patricia, t_patricia = cronometrar(construir_patricia)
+    print(f"Tabla IPv6 de {len(rutas):,} rutas:")
+    print(f"  IPTrie por bits   {contar_nodos(por_bits):>12,} nodos, construido en {t_bits:.1f} s")
+    print(f"  PatriciaTrie      {patricia.num_nodos:>12,} nodos, construido en {t_patricia:.1f} s")
+
+    esperado, t_base = cronometrar(lambda: [por_bits.buscar_ruta(format(ip, "0128b")) for ip in destinos])
+    obtenido, t_comp = cronometrar(lambda: [patricia.buscar_ruta(ip) for ip in destinos])
+    assert esperado == obtenido, "PatriciaTrie no coincide con el trie por bits"
+    print(f"{len(destinos):,} búsquedas:")
+    reportar("IPTrie por bits (128 saltos)", len(destinos), t_base)
+    reportar("PatriciaTrie", len(destinos), t_comp, t_base)
+
+
+# ====================
+# Main
+# ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del enrutador con Trie")
+    parser.add_argument("--semilla", type=int, default=42)
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    busqueda = sub.add_parser("busqueda", help="búsquedas por segundo de cada implementación")
+    busqueda.add_argument("--rutas", type=int, default=900_000)
+    busqueda.add_argument("--busquedas", type=int, default=200_000)
+    busqueda.add_argument("--pasos", nargs="*", default=[(24, 8), (16, 8, 8)],
+                          type=lambda texto: tuple(int(p) for p in texto.split("-")),
+                          help="configuraciones de pasos de las tablas multibit")
+    busqueda.set_defaults(funcion=bench_busqueda)
+
+    lote = sub.add_parser("lote", help="búsqueda vectorizada de millones de direcciones")
+    lote.add_argument("--rutas", type=int, default=900_000)
+    lote.add_argument("--direcciones", type=int, default=20_000_000)
+    lote.add_argument("--pasos", default=(24, 8),
+                      type=lambda texto: tuple(int(p) for p in texto.split("-")))
+    lote.set_defaults(funcion=bench_lote)
+
+    ipv6 = sub.add_parser("ipv6", help="memoria y búsquedas IPv6: trie por bits vs Patricia")
+    ipv6.add_argument("--rutas", type=int, default=200_000)
+    ipv6.add_argument("--busquedas", type=int, default=100_000)
+    ipv6.set_defaults(funcion=bench_ipv6)
+
+    churn = sub.add_parser("churn", help="latencia de actualización incremental con búsquedas intercaladas")
+    churn.add_argument("--rutas", type=int, default=900_000)
+    churn.add_argument("--operaciones", type=int, default=500_000)
+    churn.add_argument("--actualizaciones", type=float, default=0.1,
+                       help="fracción de operaciones que son altas, bajas o reemplazos")
+    churn.add_argument("--pasos", nargs="*", default=[(24, 8), (16, 8, 8)],
+                       type=lambda texto: tuple(int(p) for p in texto.split("-")))
+    churn.set_defaults(funcion=bench_churn)
+
+    concurrencia = sub.add_parser("concurrencia", help="búsquedas multihilo con un escritor concurrente")
+    concurrencia.add_argument("--rutas", type=int, default=900_000)
+    concurrencia.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8])
+    concurrencia.add_argument("--ritmo", type=int, default=1000, help="actualizaciones por segundo")
+    concurrencia.add_argument("--duracion", type=float, default=3.0, help="segundos por medición")
+    concurrencia.set_defaults(funcion=bench_concurrencia)
+
+    cache = sub.add_parser("cache", help="caché LRU de destinos con tráfico Zipf y cambios de rutas")
+    cache.add_argument("--rutas", type=int, default=900_000)
+    cache.add_argument("--destinos", type=int, default=1_000_000, help="destinos distintos")
+    cache.add_argument("--busquedas", type=int, default=1_000_000)
+    cache.add_argument("--zipf", type=float, default=1.0, help="exponente de la distribución Zipf")
+    cache.add_argument("--capacidades", type=int, nargs="+", default=[1024, 16384, 131072])
+    cache.add_argument("--actualizaciones", type=float, default=0.001,
+                       help="cambios de ruta por búsqueda")
+    cache.set_defaults(funcion=bench_cache)
+
+    agregacion = sub.add_parser("agregacion", help="tabla mínima equivalente (ORTC)")
+    agregacion.add_argument("--rutas", type=int, default=900_000)
+    agregacion.add_argument("--interfaces", type=int, default=4, help="siguientes saltos distintos")
+    agregacion.add_argument("--por-defecto", action="store_true", help="añadir 0.0.0.0/0")
+    agregacion.add_argument("--busquedas", type=int, default=200_000)
+    agregacion.set_defaults(funcion=bench_agregacion)
+
+    volcado = sub.add_parser("volcado", help="listado de la tabla y consultas por rango")
+    volcado.add_argument("--rutas", type=int, default=900_000)
+    volcado.add_argument("--consultas", type=int, default=10_000)
+    volcado.set_defaults(funcion=bench_volcado)
+
+    carga = sub.add_parser("carga", help="carga masiva de un volcado de rutas (archivo o stdin)")
+    carga.add_argument("--rutas", type=int, default=1_000_000, help="tamaño del volcado sintético")
+    carga.add_argument("--archivo", help="volcado 'prefijo/n interfaz' por línea; '-' para stdin")
+    carga.add_argument("--sin-referencia", action="store_true", help="omitir la inserción una a una")
+    carga.add_argument("--sin-memoria", action="store_true", help="omitir la medición con tracemalloc")
+    carga.set_defaults(funcion=bench_carga)
+
+    args = parser.parse_args()
+    args.funcion(args)
@@ -1,7 +1,15 @@
 import tkinter as tk
+from tkinter import filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
+import gc
 import ipaddress
+import itertools
+import threading
+import time
+from array import array
+from collections import OrderedDict
+import numpy as np
 
 # ====================
 # Clases para el Trie de IP
@@ -13,20 +21,82 @@ class TrieNode:
 
 
 class IPTrie:
-    def __init__(self):
+    """Trie binario de prefijos IPv4; con copia_en_escritura=True las búsquedas no toman cerrojos"""
+    def __init__(self, copia_en_escritura: bool = False):
         self.root = TrieNode()
+        self.copia_en_escritura = copia_en_escritura
+        self._escritura = threading.Lock()
 
     def insertar_prefijo(self, ip_binaria: str, longitud: int, interfaz: str):
+        """Inserta o reemplaza una ruta; devuelve la interfaz anterior o None"""
+        if self.copia_en_escritura:
+            return self._copiar_camino(ip_binaria[:longitud], interfaz)
         node = self.root
         for bit in ip_binaria[:longitud]:
             if bit not in node.children:
                 node.children[bit] = TrieNode()
             node = node.children[bit]
+        anterior = node.route_info
         node.route_info = interfaz
+        return anterior
+
+    def eliminar_prefijo(self, ip_binaria: str, longitud: int):
+        """Retira una ruta podando los nodos vacíos; devuelve la interfaz retirada o None"""
+        if self.copia_en_escritura:
+            return self._copiar_camino(ip_binaria[:longitud], None)
+        camino = [self.root]
+        for bit in ip_binaria[:longitud]:
+            node = camino[-1].children.get(bit)
+            if node is None:
+                return None
+            camino.append(node)
+        anterior = camino[-1].route_info
+        camino[-1].route_info = None
+        for profundidad in range(longitud, 0, -1):
+            node = camino[profundidad]
+            if node.children or node.route_info is not None:
+                break
+            del camino[profundidad - 1].children[ip_binaria[profundidad - 1]]
+        return anterior
+
+    def _copiar_camino(self, bits: str, interfaz):
+        """Copia el camino de la raíz al prefijo con la ruta cambiada (None = retirarla) y publica la raíz nueva"""
+        with self._escritura:
+            camino = [self.root]
+            for bit in bits:
+                node = camino[-1].children.get(bit)
+                if node is None:
+                    break
+                camino.append(node)
+            encontrado = len(camino) == len(bits) + 1
+            anterior = camino[-1].route_info if encontrado else None
+            if interfaz is None and anterior is None:
+                return None  # nada que retirar: no se publica otra versión
+
+            # el nodo del prefijo y los ancestros que falten, de abajo arriba
+            nuevo = TrieNode()
+            if encontrado:
+                nuevo.children = camino[-1].children
+            nuevo.route_info = interfaz
+            for profundidad in range(len(bits) - 1, -1, -1):
+                if nuevo is not None and nuevo.route_info is None and not nuevo.children:
+                    nuevo = None  # rama vacía tras una baja
+                copia = TrieNode()
+                if profundidad < len(camino):
+                    original = camino[profundidad]
+                    copia.children = dict(original.children)
+                    copia.route_info = original.route_info
+                if nuevo is None:
+                    del copia.children[bits[profundidad]]
+                else:
+                    copia.children[bits[profundidad]] = nuevo
+                nuevo = copia
+            self.root = nuevo
+            return anterior
 
     def buscar_ruta(self, ip_binaria: str) -> str:
         node = self.root
-        mejor_coincidencia = None
+        mejor_coincidencia = node.route_info  # ruta por defecto (0.0.0.0/0)
         for bit in ip_binaria:
             if bit in node.children:
                 node = node.children[bit]
@@ -49,6 +119,720 @@ class IPTrie:
         for bit, child in node.children.items():
             self._obtener_rutas_recursivo(child, prefijo + bit, rutas)
 
+    def iter_rutas(self):
+        """Recorre las rutas en orden como (prefijo entero, longitud, interfaz), sin crear cadenas"""
+        return self._recorrer(self.root, 0, 0)
+
+    def _recorrer(self, node, prefijo, longitud):
+        pila = [(node, prefijo, longitud)]
+        while pila:
+            node, prefijo, longitud = pila.pop()
+            if node.route_info is not None:
+                yield prefijo, longitud, node.route_info
+            hijos = node.children
+            # el hijo "1" se apila primero para visitar antes el "0"
+            if "1" in hijos:
+                pila.append((hijos["1"], prefijo | (1 << (31 - longitud)), longitud + 1))
+            if "0" in hijos:
+                pila.append((hijos["0"], prefijo, longitud + 1))
+
+    def rutas_cubiertas_por(self, prefijo: int, longitud: int):
+        """Genera, en orden, las rutas dentro de prefijo/longitud (incluida ella misma)"""
+        prefijo &= ~((1 << (32 - longitud)) - 1) & 0xFFFFFFFF
+        node = self.root
+        for desplazamiento in range(31, 31 - longitud, -1):
+            node = node.children.get("1" if (prefijo >> desplazamiento) & 1 else "0")
+            if node is None:
+                return iter(())
+        return self._recorrer(node, prefijo, longitud)
+
+    def rutas_que_cubren(self, ip: int):
+        """Genera las rutas que contienen la dirección, de la más corta a la más larga"""
+        node = self.root
+        longitud = 0
+        while node is not None:
+            if node.route_info is not None:
+                yield ip & ~((1 << (32 - longitud)) - 1) & 0xFFFFFFFF, longitud, node.route_info
+            if longitud == 32:
+                return
+            node = node.children.get("1" if (ip >> (31 - longitud)) & 1 else "0")
+            longitud += 1
+
+    def compactar(self):
+        """Devuelve un IPTrie nuevo con la tabla mínima equivalente (ver rutas_agregadas)"""
+        trie = IPTrie(self.copia_en_escritura)
+        trie.cargar_ordenadas(rutas_agregadas(self))
+        return trie
+
+    def cargar_ordenadas(self, rutas):
+        """Inserta rutas (prefijo, longitud, interfaz) ordenadas en una pasada, continuando desde la bifurcación con la anterior"""
+        if self.copia_en_escritura:
+            with self._escritura:
+                if not self.root.children and self.root.route_info is None:
+                    privado = IPTrie()
+                    privado.cargar_ordenadas(rutas)
+                    self.root = privado.root
+                    return
+            for prefijo, longitud, interfaz in rutas:
+                self._copiar_camino(format(prefijo, "032b")[:longitud], interfaz)
+            return
+
+        # el recolector cíclico recorrería todos los nodos ya creados una y otra vez
+        # mientras se crean millones de objetos que nunca forman ciclos
+        gc_activo = gc.isenabled()
+        gc.disable()
+        try:
+            self._cargar_camino(rutas)
+        finally:
+            if gc_activo:
+                gc.enable()
+
+    def _cargar_camino(self, rutas):
+        camino = [self.root]  # camino[i] = nodo a i bits del prefijo anterior
+        anterior = 0
+        for prefijo, longitud, interfaz in rutas:
+            comun = min(longitud, len(camino) - 1, 32 - (prefijo ^ anterior).bit_length())
+            del camino[comun + 1:]
+            node = camino[comun]
+            for desplazamiento in range(31 - comun, 31 - longitud, -1):
+                bit = "1" if (prefijo >> desplazamiento) & 1 else "0"
+                child = node.children.get(bit)
+                if child is None:
+                    child = node.children[bit] = TrieNode()
+                node = child
+                camino.append(node)
+            node.route_info = interfaz
+            anterior = prefijo
+
+    # --- recorrido genérico usado por las tablas compiladas ---
+    def nodo_raiz(self):
+        return self.root
+
+    def hijo(self, node, bit: int):
+        return node.children.get("1" if bit else "0")
+
+    def ruta(self, node):
+        return node.route_info
+
+
+# ====================
+# Trie binario indexado por enteros
+# ====================
+class IPTrieEntero:
+    """Trie binario sobre la dirección entera con nodos en arrays planos (hijos[2*n + bit], rutas[n]; -1 = ninguno)"""
+    def __init__(self):
+        self.hijos = array("i", [-1, -1])
+        self.rutas = array("i", [-1])
+        self.interfaces = []  # id -> nombre de la interfaz
+        self._id_interfaz = {}
+        self._libres = []  # nodos podados, reutilizables
+
+    def _id(self, interfaz):
+        id_interfaz = self._id_interfaz.get(interfaz)
+        if id_interfaz is None:
+            id_interfaz = len(self.interfaces)
+            self._id_interfaz[interfaz] = id_interfaz
+            self.interfaces.append(interfaz)
+        return id_interfaz
+
+    def _nuevo_nodo(self):
+        if self._libres:
+            return self._libres.pop()
+        self.hijos.append(-1)
+        self.hijos.append(-1)
+        self.rutas.append(-1)
+        return len(self.rutas) - 1
+
+    def __len__(self):
+        return len(self.rutas) - len(self._libres)
+
+    def insertar_prefijo(self, prefijo: int, longitud: int, interfaz: str):
+        hijos = self.hijos
+        nodo = 0
+        for desplazamiento in range(31, 31 - longitud, -1):
+            indice = (nodo << 1) | ((prefijo >> desplazamiento) & 1)
+            siguiente = hijos[indice]
+            if siguiente < 0:
+                siguiente = self._nuevo_nodo()
+                hijos[indice] = siguiente
+            nodo = siguiente
+        anterior = self.rutas[nodo]
+        self.rutas[nodo] = self._id(interfaz)
+        return self.interfaces[anterior] if anterior >= 0 else None
+
+    def eliminar_prefijo(self, prefijo: int, longitud: int):
+        """Retira una ruta podando las ramas vacías; devuelve la interfaz retirada o None"""
+        hijos = self.hijos
+        indices = []  # posición en hijos de cada arista del camino
+        nodo = 0
+        for desplazamiento in range(31, 31 - longitud, -1):
+            indice = (nodo << 1) | ((prefijo >> desplazamiento) & 1)
+            nodo = hijos[indice]
+            if nodo < 0:
+                return None
+            indices.append(indice)
+        anterior = self.rutas[nodo]
+        self.rutas[nodo] = -1
+        for indice in reversed(indices):
+            nodo = hijos[indice]
+            if self.rutas[nodo] >= 0 or hijos[nodo << 1] >= 0 or hijos[(nodo << 1) | 1] >= 0:
+                break
+            hijos[indice] = -1
+            self._libres.append(nodo)
+        return self.interfaces[anterior] if anterior >= 0 else None
+
+    def cargar_ordenadas(self, rutas_ordenadas):
+        """Igual que IPTrie.cargar_ordenadas: una pasada reutilizando el camino de la ruta anterior"""
+        hijos = self.hijos
+        camino = [0]
+        anterior = 0
+        for prefijo, longitud, interfaz in rutas_ordenadas:
+            comun = min(longitud, len(camino) - 1, 32 - (prefijo ^ anterior).bit_length())
+            del camino[comun + 1:]
+            nodo = camino[comun]
+            for desplazamiento in range(31 - comun, 31 - longitud, -1):
+                indice = (nodo << 1) | ((prefijo >> desplazamiento) & 1)
+                siguiente = hijos[indice]
+                if siguiente < 0:
+                    siguiente = self._nuevo_nodo()
+                    hijos[indice] = siguiente
+                nodo = siguiente
+                camino.append(nodo)
+            self.rutas[nodo] = self._id(interfaz)
+            anterior = prefijo
+
+    def buscar_ruta_id(self, ip: int) -> int:
+        """Coincidencia de prefijo más largo; devuelve el id de la interfaz o -1"""
+        hijos = self.hijos
+        rutas = self.rutas
+        mejor = rutas[0]
+        nodo = 0
+        desplazamiento = 31
+        while desplazamiento >= 0:
+            nodo = hijos[(nodo << 1) | ((ip >> desplazamiento) & 1)]
+            if nodo < 0:
+                break
+            if rutas[nodo] >= 0:
+                mejor = rutas[nodo]
+            desplazamiento -= 1
+        return mejor
+
+    def buscar_ruta(self, ip: int):
+        mejor = self.buscar_ruta_id(ip)
+        return self.interfaces[mejor] if mejor >= 0 else None
+
+    # --- recorrido genérico usado por las tablas compiladas ---
+    def nodo_raiz(self):
+        return 0
+
+    def hijo(self, nodo: int, bit: int):
+        siguiente = self.hijos[(nodo << 1) | bit]
+        return siguiente if siguiente >= 0 else None
+
+    def ruta(self, nodo: int):
+        id_interfaz = self.rutas[nodo]
+        return self.interfaces[id_interfaz] if id_interfaz >= 0 else None
+
+    @classmethod
+    def desde_iptrie(cls, trie):
+        """Convierte un IPTrie de cadenas '0'/'1' a la representación con arrays"""
+        tabla = cls()
+        pila = [(trie.root, 0)]
+        while pila:
+            node, nodo = pila.pop()
+            if node.route_info is not None:
+                tabla.rutas[nodo] = tabla._id(node.route_info)
+            for bit, child in node.children.items():
+                hijo = tabla._nuevo_nodo()
+                tabla.hijos[(nodo << 1) | int(bit)] = hijo
+                pila.append((child, hijo))
+        return tabla
+
+
+# ====================
+# Tabla de reenvío multibit (LC-trie / DIR-24-8)
+# ====================
+class TablaMultibit:
+    """Tabla de reenvío compilada con pasos multibit, p. ej. DIR-24-8 = (24, 8): un acceso por nivel"""
+    def __init__(self, fuente, pasos=(24, 8)):
+        if sum(pasos) != 32 or any(p <= 0 for p in pasos):
+            raise ValueError(f"Los pasos deben ser positivos y sumar 32: {pasos}")
+        self.fuente = fuente  # IPTrie o IPTrieEntero
+        self.pasos = tuple(pasos)
+        self.desplazamientos = []  # bits a desplazar la IP para obtener el índice de cada nivel
+        restante = 32
+        for paso in self.pasos:
+            restante -= paso
+            self.desplazamientos.append(restante)
+        self.niveles = [array("I") for _ in self.pasos]
+        self.libres = [[] for _ in self.pasos]  # bloques liberados, reutilizables
+        self.interfaces = []
+        self._id_interfaz = {}
+
+        self._nuevo_bloque(0)
+        self._expandir(0, 0, fuente.nodo_raiz(), 0, 0, 0)
+
+    # --- construcción ---
+    # entrada uint32: hoja = (id_interfaz + 1) << 1 (0 = sin ruta), puntero = (bloque << 1) | 1
+    def _hoja(self, interfaz):
+        id_interfaz = self._id_interfaz.get(interfaz)
+        if id_interfaz is None:
+            id_interfaz = len(self.interfaces)
+            self._id_interfaz[interfaz] = id_interfaz
+            self.interfaces.append(interfaz)
+        return (id_interfaz + 1) << 1
+
+    def _nuevo_bloque(self, nivel):
+        tamano = 1 << self.pasos[nivel]
+        if self.libres[nivel]:
+            bloque = self.libres[nivel].pop()
+            inicio = bloque << self.pasos[nivel]
+            self.niveles[nivel][inicio:inicio + tamano] = array("I", bytes(4 * tamano))
+            return bloque
+        self.niveles[nivel].frombytes(bytes(4 * tamano))
+        return (len(self.niveles[nivel]) >> self.pasos[nivel]) - 1
+
+    def _liberar_bloque(self, nivel, bloque):
+        """Libera un bloque y, recursivamente, los bloques a los que apunta"""
+        entradas = self.niveles[nivel]
+        inicio = bloque << self.pasos[nivel]
+        if nivel + 1 < len(self.pasos):
+            for slot in range(inicio, inicio + (1 << self.pasos[nivel])):
+                if entradas[slot] & 1:
+                    self._liberar_bloque(nivel + 1, entradas[slot] >> 1)
+        self.libres[nivel].append(bloque)
+
+    def _poner_hojas(self, nivel, inicio, cantidad, valor):
+        """Escribe una hoja en un rango de entradas liberando los bloques que quedan sin uso"""
+        entradas = self.niveles[nivel]
+        for slot in range(inicio, inicio + cantidad):
+            if entradas[slot] & 1:
+                self._liberar_bloque(nivel + 1, entradas[slot] >> 1)
+        entradas[inicio:inicio + cantidad] = array("I", [valor]) * cantidad
+
+    def _expandir(self, nivel, bloque, nodo, bits, profundidad, mejor):
+        """Rellena las entradas del bloque que cuelgan de `nodo`, con `mejor` como hoja heredada"""
+        fuente = self.fuente
+        ruta = fuente.ruta(nodo)
+        if ruta is not None:
+            mejor = self._hoja(ruta)
+        paso = self.pasos[nivel]
+
+        if profundidad == paso:
+            slot = (bloque << paso) | bits
+            hijos = [fuente.hijo(nodo, 0), fuente.hijo(nodo, 1)]
+            if nivel + 1 == len(self.pasos) or hijos == [None, None]:
+                self._poner_hojas(nivel, slot, 1, mejor)
+                return
+            entrada = self.niveles[nivel][slot]
+            if entrada & 1:
+                siguiente = entrada >> 1  # reutilizar el bloque existente
+            else:
+                siguiente = self._nuevo_bloque(nivel + 1)
+                self.niveles[nivel][slot] = (siguiente << 1) | 1
+            self._expandir(nivel + 1, siguiente, nodo, 0, 0, mejor)
+            return
+
+        for bit in (0, 1):
+            hijo = fuente.hijo(nodo, bit)
+            sub = (bits << 1) | bit
+            if hijo is None:
+                # expansión: todo el rango bajo el hijo ausente hereda la mejor ruta
+                resto = paso - profundidad - 1
+                self._poner_hojas(nivel, (bloque << paso) | (sub << resto), 1 << resto, mejor)
+            else:
+                self._expandir(nivel, bloque, hijo, sub, profundidad + 1, mejor)
+
+    def actualizar(self, prefijo: int, longitud: int):
+        """Reescribe en el sitio solo las entradas que cubre el prefijo cambiado en la fuente, sin recompilar"""
+        fuente = self.fuente
+        if longitud == 0:
+            self._expandir(0, 0, fuente.nodo_raiz(), 0, 0, 0)
+            return
+
+        # camino en la fuente y mejor hoja heredada antes de cada profundidad
+        nodos = [fuente.nodo_raiz()]
+        heredadas = [0]
+        for profundidad in range(longitud):
+            nodo = nodos[-1]
+            ruta = fuente.ruta(nodo)
+            heredadas.append(self._hoja(ruta) if ruta is not None else heredadas[-1])
+            nodo = fuente.hijo(nodo, (prefijo >> (31 - profundidad)) & 1)
+            if nodo is None:
+                break
+            nodos.append(nodo)
+
+        # bajar por los niveles hasta el que contiene el último bit del prefijo
+        nivel, bloque, inicio = 0, 0, 0
+        slots = []  # entrada que apunta al bloque de cada nivel > 0
+        while longitud > inicio + self.pasos[nivel]:
+            paso = self.pasos[nivel]
+            slot = (bloque << paso) | ((prefijo >> self.desplazamientos[nivel]) & ((1 << paso) - 1))
+            entrada = self.niveles[nivel][slot]
+            inicio += paso
+            if not entrada & 1:
+                # aún no hay bloque para este prefijo: expandir la entrada completa
+                if inicio < len(nodos):
+                    self._expandir(nivel, bloque, nodos[inicio], slot & ((1 << paso) - 1), paso,
+                                   heredadas[inicio])
+                else:
+                    self._poner_hojas(nivel, slot, 1, heredadas[len(nodos)])
+                return
+            slots.append(slot)
+            nivel, bloque = nivel + 1, entrada >> 1
+
+        paso = self.pasos[nivel]
+        profundidad = longitud - inicio
+        bits = (prefijo >> (32 - longitud)) & ((1 << profundidad) - 1)
+        if longitud < len(nodos):
+            self._expandir(nivel, bloque, nodos[longitud], bits, profundidad, heredadas[longitud])
+        else:
+            # el prefijo ya no existe en la fuente: su rango hereda la mejor ruta de los ancestros
+            resto = paso - profundidad
+            self._poner_hojas(nivel, (bloque << paso) | (bits << resto), 1 << resto,
+                              heredadas[len(nodos)])
+
+        # plegar los bloques cuyo nodo de entrada se quedó sin descendientes
+        while nivel > 0:
+            inicio -= self.pasos[nivel - 1]
+            inicio_bloque = inicio + self.pasos[nivel - 1]
+            if inicio_bloque < len(nodos):
+                nodo = nodos[inicio_bloque]
+                if fuente.hijo(nodo, 0) is not None or fuente.hijo(nodo, 1) is not None:
+                    break
+                ruta = fuente.ruta(nodo)
+                hoja = self._hoja(ruta) if ruta is not None else heredadas[inicio_bloque]
+            else:
+                hoja = heredadas[len(nodos)]
+            nivel -= 1
+            self._poner_hojas(nivel, slots.pop(), 1, hoja)
+
+    # --- consulta ---
+    def buscar_ruta_id(self, ip: int) -> int:
+        niveles = self.niveles
+        pasos = self.pasos
+        desplazamientos = self.desplazamientos
+        entrada = niveles[0][ip >> desplazamientos[0]]
+        nivel = 1
+        while entrada & 1:
+            paso = pasos[nivel]
+            entrada = niveles[nivel][((entrada >> 1) << paso) |
+                                     ((ip >> desplazamientos[nivel]) & ((1 << paso) - 1))]
+            nivel += 1
+        return (entrada >> 1) - 1
+
+    def buscar_ruta(self, ip: int):
+        id_interfaz = self.buscar_ruta_id(ip)
+        return self.interfaces[id_interfaz] if id_interfaz >= 0 else None
+
+    def buscar_lote(self, ips):
+        """Búsqueda vectorizada: array uint32 de direcciones -> array int32 de ids de interfaz (-1 = sin ruta)"""
+        ips = np.asarray(ips, dtype=np.uint32)
+        # vistas sin copia sobre los arrays de cada nivel
+        niveles = [np.frombuffer(nivel, dtype=np.uint32) for nivel in self.niveles]
+        entradas = niveles[0][ips >> self.desplazamientos[0]]
+        pendientes = np.flatnonzero(entradas & 1)
+        for nivel in range(1, len(self.pasos)):
+            if pendientes.size == 0:
+                break
+            paso = self.pasos[nivel]
+            indices = (((entradas[pendientes] >> 1) << paso) |
+                       ((ips[pendientes] >> self.desplazamientos[nivel]) & ((1 << paso) - 1)))
+            entradas[pendientes] = niveles[nivel][indices]
+            pendientes = pendientes[(entradas[pendientes] & 1) == 1]
+        return (entradas >> 1).astype(np.int32) - 1
+
+    def num_entradas(self):
+        return sum(len(nivel) for nivel in self.niveles)
+
+
+class ReconstructorTabla:
+    """Mantiene una TablaMultibit al día recompilándola en un hilo de fondo cuando cambian las rutas"""
+    def __init__(self, fuente, pasos=(24, 8), retardo=0.2):
+        self.fuente = fuente
+        self.pasos = pasos
+        self.retardo = retardo  # agrupa ráfagas de cambios en una sola recompilación
+        self.tabla = TablaMultibit(fuente, pasos)
+        self._version_fuente = 0
+        self._version_tabla = 0
+        self._cambio = threading.Event()
+        self._activo = True
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    @property
+    def al_dia(self):
+        """True si la tabla publicada refleja todos los cambios notificados"""
+        return self._version_tabla == self._version_fuente
+
+    def notificar_cambio(self):
+        self._version_fuente += 1
+        self._cambio.set()
+
+    def actualizar(self, prefijo: int, longitud: int):
+        """Aplica el cambio de una ruta sobre la tabla publicada, salvo si hay una recompilación pendiente"""
+        if self.al_dia:
+            self.tabla.actualizar(prefijo, longitud)
+        else:
+            self.notificar_cambio()
+
+    def _bucle(self):
+        while True:
+            self._cambio.wait()
+            if not self._activo:
+                return
+            time.sleep(self.retardo)
+            self._cambio.clear()
+            version = self._version_fuente
+            tabla = TablaMultibit(self.fuente, self.pasos)
+            self.tabla = tabla
+            self._version_tabla = version
+
+    def detener(self):
+        self._activo = False
+        self._cambio.set()
+
+    def buscar_ruta(self, ip: int):
+        return self.tabla.buscar_ruta(ip)
+
+
+# ====================
+# Caché de rutas por dirección de destino
+# ====================
+class CacheRutas:
+    """Caché LRU acotada destino -> interfaz delante de una función buscar(ip_entera)"""
+    BITS_GRUPO = 16  # invalidar() solo mira los grupos de destinos que solapan con el prefijo
+
+    def __init__(self, buscar, capacidad: int = 65536):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la caché debe ser positiva")
+        self.buscar = buscar
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()  # ip -> interfaz, de la menos a la más reciente
+        self._grupos = {}  # ip >> (32 - BITS_GRUPO) -> set de ips en caché
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def buscar_ruta(self, ip: int):
+        entradas = self._entradas
+        if ip in entradas:
+            self.aciertos += 1
+            entradas.move_to_end(ip)
+            return entradas[ip]
+
+        self.fallos += 1
+        interfaz = self.buscar(ip)
+        if len(entradas) >= self.capacidad:
+            expulsada, _ = entradas.popitem(last=False)
+            self._quitar_de_grupo(expulsada)
+            self.expulsiones += 1
+        entradas[ip] = interfaz
+        self._grupos.setdefault(ip >> (32 - self.BITS_GRUPO), set()).add(ip)
+        return interfaz
+
+    def _quitar_de_grupo(self, ip):
+        grupo = ip >> (32 - self.BITS_GRUPO)
+        ips = self._grupos[grupo]
+        ips.discard(ip)
+        if not ips:
+            del self._grupos[grupo]
+
+    def invalidar(self, prefijo: int, longitud: int):
+        """Olvida los destinos cubiertos por prefijo/longitud tras darlo de alta, de baja o cambiarlo"""
+        desplazamiento = 32 - self.BITS_GRUPO
+        if longitud >= self.BITS_GRUPO:
+            ips = self._grupos.get(prefijo >> desplazamiento, ())
+            afectadas = [ip for ip in ips if (ip ^ prefijo) >> (32 - longitud) == 0]
+        else:
+            # el prefijo abarca grupos completos
+            primero = prefijo >> desplazamiento
+            cantidad = 1 << (self.BITS_GRUPO - longitud)
+            if cantidad <= len(self._grupos):
+                grupos = [g for g in range(primero, primero + cantidad) if g in self._grupos]
+            else:
+                grupos = [g for g in self._grupos if primero <= g < primero + cantidad]
+            afectadas = [ip for g in grupos for ip in self._grupos[g]]
+
+        for ip in afectadas:
+            del self._entradas[ip]
+            self._quitar_de_grupo(ip)
+        self.invalidaciones += len(afectadas)
+
+    def vaciar(self):
+        """Invalida toda la caché (p. ej. tras una carga masiva)"""
+        self.invalidaciones += len(self._entradas)
+        self._entradas.clear()
+        self._grupos.clear()
+
+    @property
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def estadisticas(self):
+        return {
+            "entradas": len(self._entradas),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.tasa_aciertos,
+            "expulsiones": self.expulsiones,
+            "invalidaciones": self.invalidaciones,
+        }
+
+
+# ====================
+# Trie Patricia (comprimido) para IPv6 y tabla de doble pila
+# ====================
+class NodoPatricia:
+    def __init__(self, prefijo, longitud, interfaz=None):
+        self.prefijo = prefijo  # bits del prefijo alineados a la izquierda
+        self.longitud = longitud
+        self.interfaz = interfaz
+        self.hijos = [None, None]
+
+
+class PatriciaTrie:
+    """Trie con compresión de caminos para prefijos de `bits` bits (128 en IPv6)"""
+    def __init__(self, bits: int = 128):
+        self.bits = bits
+        self.raiz = NodoPatricia(0, 0)
+        self.num_nodos = 1
+
+    def _mascara(self, longitud):
+        return ((1 << longitud) - 1) << (self.bits - longitud)
+
+    def _bit(self, valor, posicion):
+        """Bit en la posición dada contando desde el más significativo"""
+        return (valor >> (self.bits - 1 - posicion)) & 1
+
+    def insertar(self, prefijo: int, longitud: int, interfaz: str):
+        """Inserta (o reemplaza) una ruta; devuelve la interfaz anterior o None"""
+        prefijo &= self._mascara(longitud)
+        nodo = self.raiz
+        while nodo.longitud < longitud:
+            bit = self._bit(prefijo, nodo.longitud)
+            hijo = nodo.hijos[bit]
+            if hijo is None:
+                nodo.hijos[bit] = NodoPatricia(prefijo, longitud, interfaz)
+                self.num_nodos += 1
+                return None
+
+            # longitud del prefijo común entre la ruta nueva y el hijo
+            diferencia = (prefijo ^ hijo.prefijo) >> (self.bits - min(longitud, hijo.longitud))
+            comun = min(longitud, hijo.longitud) - diferencia.bit_length()
+            if comun == hijo.longitud:
+                nodo = hijo
+                continue
+
+            # dividir la arista comprimida en el punto de bifurcación
+            if comun == longitud:
+                nuevo = NodoPatricia(prefijo, longitud, interfaz)
+                nuevo.hijos[self._bit(hijo.prefijo, comun)] = hijo
+                self.num_nodos += 1
+            else:
+                nuevo = NodoPatricia(prefijo & self._mascara(comun), comun)
+                nuevo.hijos[self._bit(hijo.prefijo, comun)] = hijo
+                nuevo.hijos[self._bit(prefijo, comun)] = NodoPatricia(prefijo, longitud, interfaz)
+                self.num_nodos += 2
+            nodo.hijos[bit] = nuevo
+            return None
+
+        anterior = nodo.interfaz
+        nodo.interfaz = interfaz
+        return anterior
+
+    def eliminar(self, prefijo: int, longitud: int):
+        """Retira una ruta fusionando los nodos que dejan de bifurcar; devuelve la interfaz retirada o None"""
+        prefijo &= self._mascara(longitud)
+        camino = [self.raiz]
+        while camino[-1].longitud < longitud:
+            nodo = camino[-1]
+            hijo = nodo.hijos[self._bit(prefijo, nodo.longitud)]
+            if hijo is None or hijo.longitud > longitud or \
+                    (prefijo ^ hijo.prefijo) >> (self.bits - hijo.longitud):
+                return None
+            camino.append(hijo)
+        if camino[-1].longitud != longitud or camino[-1].interfaz is None:
+            return None
+
+        anterior = camino[-1].interfaz
+        camino[-1].interfaz = None
+        while len(camino) > 1 and camino[-1].interfaz is None:
+            nodo = camino.pop()
+            restantes = [hijo for hijo in nodo.hijos if hijo is not None]
+            if len(restantes) == 2:
+                break
+            camino[-1].hijos[self._bit(nodo.prefijo, camino[-1].longitud)] = \
+                restantes[0] if restantes else None
+            self.num_nodos -= 1
+            if restantes:
+                break
+            # sin hijos: el padre pudo quedar como nodo de paso con un solo hijo
+        return anterior
+
+    def buscar_ruta(self, direccion: int):
+        """Coincidencia de prefijo más largo"""
+        nodo = self.raiz
+        mejor = nodo.interfaz
+        while nodo.longitud < self.bits:
+            hijo = nodo.hijos[self._bit(direccion, nodo.longitud)]
+            # el hijo solo sirve si la dirección coincide con todo su prefijo
+            if hijo is None or (direccion ^ hijo.prefijo) >> (self.bits - hijo.longitud):
+                break
+            nodo = hijo
+            if nodo.interfaz is not None:
+                mejor = nodo.interfaz
+        return mejor
+
+    def rutas(self):
+        """Recorre las rutas en orden como tuplas (prefijo, longitud, interfaz)"""
+        pila = [self.raiz]
+        while pila:
+            nodo = pila.pop()
+            if nodo.interfaz is not None:
+                yield nodo.prefijo, nodo.longitud, nodo.interfaz
+            for hijo in reversed(nodo.hijos):
+                if hijo is not None:
+                    pila.append(hijo)
+
+
+class IPTrieDual:
+    """Tabla de doble pila: IPv4 en el IPTrie por bits e IPv6 en un PatriciaTrie de 128 bits"""
+    def __init__(self):
+        self.v4 = IPTrie()
+        self.v6 = PatriciaTrie(bits=128)
+
+    def insertar_red(self, texto: str, interfaz: str):
+        """Inserta un prefijo IPv4 o IPv6 en notación CIDR; devuelve (red, interfaz anterior o None)"""
+        red = ipaddress.ip_network(texto, strict=False)
+        if red.version == 4:
+            anterior = self.v4.insertar_prefijo(ip_a_binario(str(red.network_address)),
+                                                red.prefixlen, interfaz)
+        else:
+            anterior = self.v6.insertar(int(red.network_address), red.prefixlen, interfaz)
+        return red, anterior
+
+    def eliminar_red(self, texto: str):
+        """Retira un prefijo IPv4 o IPv6; devuelve (red, interfaz retirada o None)"""
+        red = ipaddress.ip_network(texto, strict=False)
+        if red.version == 4:
+            anterior = self.v4.eliminar_prefijo(ip_a_binario(str(red.network_address)), red.prefixlen)
+        else:
+            anterior = self.v6.eliminar(int(red.network_address), red.prefixlen)
+        return red, anterior
+
+    def buscar(self, texto: str):
+        direccion = ipaddress.ip_address(texto)
+        if direccion.version == 4:
+            return self.v4.buscar_ruta(ip_a_binario(texto))
+        return self.v6.buscar_ruta(int(direccion))
+
 
 # ====================
 # Funciones auxiliares
@@ -57,24 +841,170 @@ def ip_a_binario(ip: str) -> str:
     return bin(int(ipaddress.IPv4Address(ip)))[2:].zfill(32)
 
 
+def ip_a_entero(ip: str) -> int:
+    return int(ipaddress.IPv4Address(ip))
+
+
+def entero_a_ip(ip: int) -> str:
+    """Notación decimal con puntos sin pasar por ipaddress"""
+    return f"{ip >> 24}.{(ip >> 16) & 255}.{(ip >> 8) & 255}.{ip & 255}"
+
+
+# ====================
+# Agregación de rutas (ORTC)
+# ====================
+def rutas_agregadas(fuente):
+    """Tabla mínima equivalente por prefijo más largo (ORTC), ordenada por prefijo y longitud"""
+    interfaces = [None]
+    bit_de = {}
+    conjuntos = {}
+
+    def salto(interfaz):
+        indice = bit_de.get(interfaz)
+        if indice is None:
+            indice = bit_de[interfaz] = len(interfaces)
+            interfaces.append(interfaz)
+        return indice
+
+    def candidatos(nodo, heredado):
+        ruta = fuente.ruta(nodo)
+        if ruta is not None:
+            heredado = salto(ruta)
+        hijos = [fuente.hijo(nodo, 0), fuente.hijo(nodo, 1)]
+        if hijos == [None, None]:
+            mascara = 1 << heredado
+        else:
+            izquierda, derecha = (candidatos(hijo, heredado) if hijo is not None else 1 << heredado
+                                  for hijo in hijos)
+            mascara = (izquierda & derecha) or (izquierda | derecha)
+            if mascara & 1:
+                mascara = 1  # hay direcciones sin ruta debajo: ningún ancestro puede emitir
+        conjuntos[nodo] = mascara
+        return mascara
+
+    rutas = []
+
+    def elegir(nodo, prefijo, longitud, heredado, original):
+        ruta = fuente.ruta(nodo)
+        if ruta is not None:
+            original = salto(ruta)
+        mascara = conjuntos[nodo]
+        if not mascara >> heredado & 1:
+            heredado = (mascara & -mascara).bit_length() - 1  # cualquier salto del conjunto
+            rutas.append((prefijo, longitud, interfaces[heredado]))
+        if longitud == 32:
+            return  # un /32 siempre es hoja
+        for bit in (0, 1):
+            hijo = fuente.hijo(nodo, bit)
+            prefijo_hijo = prefijo | (bit << (31 - longitud))
+            if hijo is not None:
+                elegir(hijo, prefijo_hijo, longitud + 1, heredado, original)
+            elif original != heredado:
+                # hoja implícita del árbol completo con la ruta original
+                rutas.append((prefijo_hijo, longitud + 1, interfaces[original]))
+
+    raiz = fuente.nodo_raiz()
+    candidatos(raiz, 0)
+    elegir(raiz, 0, 0, 0, 0)
+    return rutas
+
+
+# ====================
+# Carga masiva de tablas de rutas
+# ====================
+def parsear_ruta(linea: str):
+    """Interpreta "A.B.C.D[/n] siguiente-salto" como (prefijo, longitud, interfaz), o None si es vacía o comentario"""
+    campos = linea.split(None, 1)
+    if not campos or campos[0][0] == "#":
+        return None
+    if len(campos) < 2:
+        raise ValueError("falta la interfaz de salida")
+    red, barra, longitud = campos[0].strip().partition("/")
+    if not barra:
+        longitud = "32"
+    try:
+        octetos = bytes(map(int, red.split(".")))  # ValueError si algún octeto > 255
+    except ValueError:
+        octetos = b""
+    # solo la forma canónica: int() también acepta "1_0", "+1", "010" o dígitos no ASCII
+    if ".".join(map(str, octetos)) != red:
+        octetos = b""
+    # con "/" la longitud es obligatoria y decimal: "A.B.C.D/" o "A.B.C.D/+8" no valen
+    if (len(octetos) != 4 or not (longitud.isascii() and longitud.isdigit())
+            or not 0 <= int(longitud) <= 32):
+        raise ValueError(f"prefijo IPv4 inválido: {campos[0]}")
+    longitud = int(longitud)
+    prefijo = int.from_bytes(octetos, "big") & ~((1 << (32 - longitud)) - 1)
+    return prefijo, longitud, campos[1].strip()
+
+
+def cargar_tabla(archivo, tabla, tam_bloque: int = 65536) -> int:
+    """Carga un volcado de rutas en bloques, las ordena con NumPy y construye el trie con cargar_ordenadas"""
+    claves = array("Q")
+    ids = array("i")
+    nombres = []
+    id_de = {}
+    numero = 0
+    while True:
+        bloque = archivo.readlines(tam_bloque)
+        if not bloque:
+            break
+        for linea in bloque:
+            numero += 1
+            try:
+                ruta = parsear_ruta(linea)
+            except ValueError as e:
+                raise ValueError(f"línea {numero}: {e}") from None
+            if ruta is None:
+                continue
+            prefijo, longitud, interfaz = ruta
+            id_interfaz = id_de.get(interfaz)
+            if id_interfaz is None:
+                id_interfaz = id_de[interfaz] = len(nombres)
+                nombres.append(interfaz)
+            claves.append((prefijo << 6) | longitud)
+            ids.append(id_interfaz)
+
+    # orden estable: entre claves repetidas se aplica la última en último lugar
+    orden = np.argsort(np.frombuffer(claves, dtype=np.uint64), kind="stable")
+    ordenadas = np.frombuffer(claves, dtype=np.uint64)[orden].tolist()
+    ids_ordenados = np.frombuffer(ids, dtype=np.int32)[orden].tolist()
+    tabla.cargar_ordenadas((clave >> 6, clave & 63, nombres[id_interfaz])
+                           for clave, id_interfaz in zip(ordenadas, ids_ordenados))
+    return len(claves)
+
+
 # ====================
 # Tkinter App
 # ====================
 class RouterApp:
+    MAX_RUTAS_MOSTRADAS = 5000
+
     def __init__(self, root):
         self.root = root
         self.root.title("Enrutador con Trie de Prefijos IP")
         self.root.geometry("700x550")
 
-        self.trie = IPTrie()
+        self.tablas = IPTrieDual()
+        self.trie = self.tablas.v4
+        # tabla compilada (16-8-8) que se recompila en segundo plano al cambiar las rutas
+        self.reconstructor = ReconstructorTabla(self.trie, pasos=(16, 8, 8))
+        # caché de destinos IPv4 recientes delante de la tabla compilada o del trie
+        self.cache = CacheRutas(self._resolver_v4, capacidad=4096)
         self._crear_widgets()
 
+    def _resolver_v4(self, ip: int):
+        if self.reconstructor.al_dia:
+            return self.reconstructor.buscar_ruta(ip)
+        # la tabla compilada aún se está reconstruyendo
+        return self.trie.buscar_ruta(format(ip, "032b"))
+
     def _crear_widgets(self):
         frame = tb.Frame(self.root, padding=10)
         frame.pack(fill=BOTH, expand=YES)
 
         # --- Insertar prefijos ---
-        tb.Label(frame, text="Agregar Prefijo (ej: 192.168.1.0/24):").pack(anchor=W, pady=(0,5))
+        tb.Label(frame, text="Agregar Prefijo (ej: 192.168.1.0/24 o 2001:db8::/32):").pack(anchor=W, pady=(0,5))
         self.prefijo_entry = tb.Entry(frame, width=30)
         self.prefijo_entry.pack(anchor=W, pady=(0,10))
 
@@ -85,10 +1015,17 @@ class RouterApp:
         self.insertar_btn = tb.Button(frame, text="Agregar Prefijo", bootstyle="success-outline", command=self.agregar_prefijo)
         self.insertar_btn.pack(anchor=W, pady=(0,10))
 
+        self.eliminar_btn = tb.Button(frame, text="Eliminar Prefijo", bootstyle="danger-outline", command=self.eliminar_prefijo)
+        self.eliminar_btn.pack(anchor=W, pady=(0,10))
+
         # --- Botón cargar ejemplo (CORREGIDO) ---
         self.ejemplo_btn = tb.Button(frame, text="Cargar Ejemplo", bootstyle="secondary-outline", command=self.cargar_ejemplo)
         self.ejemplo_btn.pack(anchor=W, pady=(0,10))
 
+        # --- Carga masiva desde un volcado de rutas ---
+        self.archivo_btn = tb.Button(frame, text="Cargar Tabla desde Archivo", bootstyle="secondary-outline", command=self.cargar_archivo)
+        self.archivo_btn.pack(anchor=W, pady=(0,10))
+
         # --- Botón mostrar rutas ---
         self.mostrar_btn = tb.Button(frame, text="Mostrar Todas las Rutas", bootstyle="info-outline", command=self.mostrar_rutas)
         self.mostrar_btn.pack(anchor=W, pady=(0,20))
@@ -118,10 +1055,14 @@ class RouterApp:
             return
             
         try:
-            red = ipaddress.IPv4Network(texto, strict=False)
-            ip_bin = ip_a_binario(str(red.network_address))
-            self.trie.insertar_prefijo(ip_bin, red.prefixlen, interfaz)
-            self.resultado_label.config(text=f"ÉXITO: Prefijo {texto} agregado a {interfaz}")
+            red, anterior = self.tablas.insertar_red(texto, interfaz)
+            if red.version == 4:
+                self.reconstructor.actualizar(int(red.network_address), red.prefixlen)
+                self.cache.invalidar(int(red.network_address), red.prefixlen)
+            if anterior is None:
+                self.resultado_label.config(text=f"ÉXITO: Prefijo {texto} agregado a {interfaz}")
+            else:
+                self.resultado_label.config(text=f"ÉXITO: Prefijo {texto} cambiado de {anterior} a {interfaz}")
             
             # Limpiar los campos de entrada
             self.prefijo_entry.delete(0, tk.END)
@@ -130,6 +1071,26 @@ class RouterApp:
         except Exception as e:
             self.resultado_label.config(text=f"ERROR: {e}")
 
+    def eliminar_prefijo(self):
+        texto = self.prefijo_entry.get().strip()
+        if not texto:
+            self.resultado_label.config(text="ERROR: Prefijo vacío")
+            return
+
+        try:
+            red, anterior = self.tablas.eliminar_red(texto)
+            if anterior is None:
+                self.resultado_label.config(text=f"SIN CAMBIOS: El prefijo {red} no estaba en la tabla")
+                return
+            if red.version == 4:
+                self.reconstructor.actualizar(int(red.network_address), red.prefixlen)
+                self.cache.invalidar(int(red.network_address), red.prefixlen)
+            self.resultado_label.config(text=f"ÉXITO: Prefijo {red} ({anterior}) eliminado")
+            self.prefijo_entry.delete(0, tk.END)
+
+        except Exception as e:
+            self.resultado_label.config(text=f"ERROR: {e}")
+
     def cargar_ejemplo(self):
         """Carga rutas de ejemplo en el Trie"""
         ejemplos = [
@@ -139,43 +1100,65 @@ class RouterApp:
             ("10.0.0.0/8", "Interfaz Interna"),
             ("172.16.0.0/12", "Interfaz Privada"),
             ("0.0.0.0/0", "Gateway por Defecto"),
+            ("2001:db8::/32", "Interfaz IPv6 Documentación"),
+            ("2001:db8:1::/48", "Interfaz IPv6 LAN"),
+            ("::/0", "Gateway IPv6 por Defecto"),
         ]
         
         contador = 0
         for prefijo, interfaz in ejemplos:
             try:
-                red = ipaddress.IPv4Network(prefijo, strict=False)
-                ip_bin = ip_a_binario(str(red.network_address))
-                self.trie.insertar_prefijo(ip_bin, red.prefixlen, interfaz)
+                self.tablas.insertar_red(prefijo, interfaz)
                 contador += 1
             except Exception as e:
                 print(f"Error cargando {prefijo}: {e}")
-                
+
+        self.reconstructor.notificar_cambio()
+        self.cache.vaciar()
         self.resultado_label.config(text=f"ÉXITO: {contador} rutas de ejemplo cargadas")
         self.mostrar_rutas()
 
+    def cargar_archivo(self):
+        """Carga un volcado de rutas IPv4 ("prefijo/n interfaz" por línea)"""
+        ruta_archivo = filedialog.askopenfilename(title="Tabla de rutas",
+                                                  filetypes=[("Texto", "*.txt"), ("Todos", "*")])
+        if not ruta_archivo:
+            return
+        try:
+            inicio = time.perf_counter()
+            with open(ruta_archivo, "r", encoding="utf-8") as f:
+                cantidad = cargar_tabla(f, self.trie)
+            segundos = time.perf_counter() - inicio
+            self.reconstructor.notificar_cambio()
+            self.cache.vaciar()
+            self.resultado_label.config(
+                text=f"ÉXITO: {cantidad} rutas cargadas en {segundos:.2f} s "
+                     f"({cantidad / max(segundos, 1e-9):,.0f} rutas/s)")
+        except (OSError, ValueError) as e:
+            self.resultado_label.config(text=f"ERROR: {e}")
+
     def mostrar_rutas(self):
-        """Muestra todas las rutas almacenadas en el trie"""
-        rutas = self.trie.obtener_todas_rutas()
+        """Muestra las primeras MAX_RUTAS_MOSTRADAS rutas y el total de la tabla"""
         self.rutas_text.delete(1.0, tk.END)
-        
-        if not rutas:
+        rutas = itertools.chain(((4,) + ruta for ruta in self.trie.iter_rutas()),
+                                ((6,) + ruta for ruta in self.tablas.v6.rutas()))
+        lineas = []
+        for i, (version, prefijo, longitud, interfaz) in enumerate(
+                itertools.islice(rutas, self.MAX_RUTAS_MOSTRADAS), 1):
+            ip_str = entero_a_ip(prefijo) if version == 4 else str(ipaddress.IPv6Address(prefijo))
+            lineas.append(f"{i:2d}. {ip_str}/{longitud} -> {interfaz}\n")
+
+        if not lineas:
             self.rutas_text.insert(tk.END, "No hay rutas almacenadas en el trie.\n")
             return
-            
-        self.rutas_text.insert(tk.END, "=== TABLA DE RUTAS ===\n\n")
-        for i, (binario, interfaz) in enumerate(rutas, 1):
-            # Convertir binario de vuelta a notación CIDR para mostrar
-            longitud = len(binario)
-            if longitud <= 32:
-                # Rellenar con ceros para completar 32 bits
-                ip_completa = binario.ljust(32, '0')
-                # Convertir a decimal
-                ip_decimal = int(ip_completa, 2)
-                ip_str = str(ipaddress.IPv4Address(ip_decimal))
-                self.rutas_text.insert(tk.END, f"{i:2d}. {ip_str}/{longitud} -> {interfaz}\n")
-        
-        self.rutas_text.insert(tk.END, f"\nTotal: {len(rutas)} rutas almacenadas")
+
+        # el resto solo se cuenta; un único insert evita redibujar el Text por línea
+        restantes = sum(1 for _ in rutas)
+        texto = "=== TABLA DE RUTAS ===\n\n" + "".join(lineas)
+        if restantes:
+            texto += f"... y {restantes} rutas más\n"
+        texto += f"\nTotal: {len(lineas) + restantes} rutas almacenadas"
+        self.rutas_text.insert(tk.END, texto)
 
     def buscar_ruta(self):
         destino = self.destino_entry.get().strip()
@@ -185,10 +1168,12 @@ class RouterApp:
             
         try:
             # Validar que sea una IP válida
-            ipaddress.IPv4Address(destino)
-            
-            ip_bin = ip_a_binario(destino)
-            interfaz = self.trie.buscar_ruta(ip_bin)
+            direccion = ipaddress.ip_address(destino)
+
+            if direccion.version == 6:
+                interfaz = self.tablas.buscar(destino)
+            else:
+                interfaz = self.cache.buscar_ruta(ip_a_entero(destino))
             
             if interfaz:
                 self.resultado_label.config(text=f"RUTA ENCONTRADA: {destino} -> {interfaz}")
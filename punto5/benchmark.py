@@ -0,0 +1,479 @@
+"""
+Benchmark reproducible del índice de ADN de punto5.
+
+Genera genomas aleatorios (ACGT uniforme, semilla fija) y mide tiempo de
+construcción, memoria y latencia de consulta de cada estructura.
+
+Uso:
+    python benchmark.py indice --longitud 100000000 --k 12
+    python benchmark.py indice --longitud 1000000 --k 6 --longitud-trie 200000
+    python benchmark.py fm --longitud 10000000 --longitudes-patron 8 32 128 512
+    python benchmark.py fasta --longitud 100000000 --registros 24
+    python benchmark.py paralelo --longitud 100000000 --workers 1 2 4 8
+    python benchmark.py hebras --longitud 20000000 --k 12
+    python benchmark.py aproximada --longitud 10000000 --desajustes 0 1 2
+    python benchmark.py motivos --longitud 100000000 --paneles 10 1000 10000
+    python benchmark.py disco --longitud 100000000 --k 12
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from punto5 import (BASES, DNATrie, FMIndex, KmerIndex, MotifScanner, open_sequence_file, read_records,
+                    reverse_complement, scan_file)
+
+
+# ====================
+# Utilidades
+# ====================
+def generar_genoma(longitud, rng):
+    """Genoma aleatorio como str (ACGT uniforme)"""
+    indices = np.random.default_rng(rng.randrange(2 ** 32)).integers(0, 4, longitud, dtype=np.uint8)
+    return np.frombuffer(BASES.encode("ascii"), dtype=np.uint8)[indices].tobytes().decode("ascii")
+
+
+def cronometrar(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir_memoria(funcion, *args, **kwargs):
+    """Pico de memoria (MB) de una llamada según tracemalloc (incluye los arrays de NumPy)"""
+    tracemalloc.start()
+    try:
+        resultado = funcion(*args, **kwargs)
+        pico = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    return resultado, pico
+
+
+def percentil_ms(muestras, p):
+    ordenadas = sorted(muestras)
+    return ordenadas[min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))] * 1000
+
+
+def insertar_kmers_trie(genoma, k):
+    """Indexado anterior: un nodo del trie por base y una inserción por posición"""
+    trie = DNATrie()
+    for i in range(len(genoma) - k + 1):
+        trie.insert_sequence(genoma[i:i + k], i, f"k-mer en posición {i}")
+    return trie
+
+
+def reportar(nombre, segundos, bases, pico_mb):
+    print(f"  {nombre:<32} {segundos:8.2f} s  {bases / segundos / 1e6:8.2f} Mbp/s  "
+          f"pico {pico_mb:9.1f} MB")
+
+
+# ====================
+# Índice de k-mers
+# ====================
+def benchmark_indice(args):
+    """Construcción del KmerIndex (2 bits, CSR) frente al trie de nodos"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    print(f"Genoma de {args.longitud:,} bases, k={args.k}")
+
+    _, segundos = cronometrar(KmerIndex.build, genoma, args.k)
+    indice, pico = medir_memoria(KmerIndex.build, genoma, args.k)
+    reportar("KmerIndex.build", segundos, args.longitud, pico)
+    print(f"  {'':<32} índice {indice.nbytes / 2 ** 20:.1f} MB "
+          f"({indice.nbytes / max(1, args.longitud):.2f} bytes/base)")
+
+    patrones = [genoma[i:i + args.k] for i in (rng.randrange(args.longitud - args.k + 1)
+                                               for _ in range(args.consultas))]
+    latencias = []
+    for patron in patrones:
+        _, segundos = cronometrar(indice.positions_of, patron)
+        latencias.append(segundos)
+    print(f"  {'consulta positions_of':<32} p50 {percentil_ms(latencias, 50):.4f} ms  "
+          f"p99 {percentil_ms(latencias, 99):.4f} ms")
+
+    if args.longitud_trie:
+        pequeno = genoma[:args.longitud_trie]
+        k = min(args.k, 6)
+        _, segundos = cronometrar(insertar_kmers_trie, pequeno, k)
+        _, pico = medir_memoria(insertar_kmers_trie, pequeno, k)
+        print(f"\nComparación con el trie de nodos ({args.longitud_trie:,} bases, k={k})")
+        reportar("trie (insert_sequence por posición)", segundos, args.longitud_trie, pico)
+        _, segundos = cronometrar(KmerIndex.build, pequeno, k)
+        _, pico = medir_memoria(KmerIndex.build, pequeno, k)
+        reportar("KmerIndex.build", segundos, args.longitud_trie, pico)
+
+
+# ====================
+# Índice FM
+# ====================
+def buscar_con_find(genoma, patron):
+    """Referencia: todas las apariciones con str.find (recorre el genoma entero)"""
+    posiciones = []
+    i = genoma.find(patron)
+    while i >= 0:
+        posiciones.append(i)
+        i = genoma.find(patron, i + 1)
+    return posiciones
+
+
+def benchmark_fm(args):
+    """Construcción del arreglo de sufijos + FM y latencia de count/locate por longitud de patrón"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    if args.repeticion:
+        # genoma muy repetitivo: el peor caso de la duplicación de prefijos
+        genoma = (genoma[:args.repeticion] * (args.longitud // args.repeticion + 1))[:args.longitud]
+    print(f"Genoma de {args.longitud:,} bases"
+          + (f" (unidad repetida de {args.repeticion:,})" if args.repeticion else ""))
+
+    _, segundos = cronometrar(FMIndex.build, genoma)
+    indice, pico = medir_memoria(FMIndex.build, genoma)
+    reportar("FMIndex.build", segundos, args.longitud, pico)
+    print(f"  {'':<32} índice {indice.nbytes / 2 ** 20:.1f} MB "
+          f"({indice.nbytes / max(1, args.longitud):.2f} bytes/base)")
+
+    for longitud in args.longitudes_patron:
+        patrones = [genoma[i:i + longitud] for i in (rng.randrange(args.longitud - longitud + 1)
+                                                     for _ in range(args.consultas))]
+        conteo, localizacion = [], []
+        for patron in patrones:
+            conteo.append(cronometrar(indice.count, patron)[1])
+            localizacion.append(cronometrar(indice.locate, patron)[1])
+        _, referencia = cronometrar(buscar_con_find, genoma, patrones[0])
+        print(f"  patrón de {longitud:>4}: count p50 {percentil_ms(conteo, 50):.3f} ms, "
+              f"locate p50 {percentil_ms(localizacion, 50):.3f} ms "
+              f"p99 {percentil_ms(localizacion, 99):.3f} ms  (str.find {referencia * 1000:.1f} ms)")
+
+
+# ====================
+# Lectura de FASTA en streaming
+# ====================
+def escribir_fasta(ruta, longitud, registros, rng, ancho=60, huecos=0):
+    """FASTA sintético de `registros` cromosomas con líneas de `ancho` bases y `huecos` tramos de N por trozo"""
+    por_registro = longitud // registros
+    trozo = ancho * 100_000
+    with open(ruta, "w", encoding="utf-8") as f:
+        for i in range(registros):
+            f.write(f">chr{i + 1} sintético\n")
+            restantes = por_registro + (longitud % registros if i == registros - 1 else 0)
+            while restantes:
+                bases = generar_genoma(min(trozo, restantes), rng)
+                for _ in range(huecos):
+                    inicio, largo = rng.randrange(len(bases)), rng.randint(1, 100)
+                    bases = bases[:inicio] + "N" * min(largo, len(bases) - inicio) + bases[inicio + largo:]
+                restantes -= len(bases)
+                f.write("\n".join(bases[j:j + ancho] for j in range(0, len(bases), ancho)) + "\n")
+
+
+def benchmark_fasta(args):
+    """Pasada de composición/k-mers y construcción del índice desde archivo: tiempo y pico de memoria"""
+    rng = random.Random(args.semilla)
+    ruta = args.archivo
+    temporal = None
+    if ruta is None:
+        temporal = tempfile.NamedTemporaryFile(suffix=".fa", delete=False)
+        temporal.close()
+        ruta = temporal.name
+        escribir_fasta(ruta, args.longitud, args.registros, rng, huecos=args.huecos)
+    try:
+        print(f"{ruta}: {os.path.getsize(ruta) / 2 ** 20:.1f} MB, k={args.k}, trozos de {args.trozo:,} bases")
+        _, segundos = cronometrar(scan_file, ruta, args.k, args.trozo)
+        perfil, pico = medir_memoria(scan_file, ruta, args.k, args.trozo)
+        reportar("scan_file (composición + k-mers)", segundos, perfil.length, pico)
+        print(f"  {'':<32} {perfil.records} registros, {perfil.length:,} bases, GC {perfil.gc_content:.2f}%")
+
+        if not args.sin_indice:
+            _, segundos = cronometrar(KmerIndex.from_file, ruta, args.k, args.trozo)
+            indice, pico = medir_memoria(KmerIndex.from_file, ruta, args.k, args.trozo)
+            reportar("KmerIndex.from_file", segundos, perfil.length, pico)
+            print(f"  {'':<32} índice {indice.nbytes / 2 ** 20:.1f} MB; "
+                  f"pico sin el índice {pico - indice.nbytes / 2 ** 20:.1f} MB")
+            comprobar_cortos(indice, ruta, args.k, rng)
+    finally:
+        if temporal is not None:
+            os.remove(ruta)
+
+
+def comprobar_cortos(indice, ruta, k, rng, patrones=20):
+    """Patrones de k-1 bases justo antes de una N (o del fin de un registro) frente a bytes.find"""
+    registros = []
+    with open_sequence_file(ruta) as stream:
+        for _, trozo, nuevo in read_records(stream):
+            if nuevo:
+                registros.append([])
+            registros[-1].append(trozo.upper())
+    registros = [b"".join(partes) for partes in registros]
+    candidatos = {registro[max(0, fin - k + 1):fin] for registro in registros
+                  for fin in [len(registro)] + [i for i in range(1, len(registro))
+                                                if registro[i] == ord("N") != registro[i - 1]][:patrones]}
+    candidatos = sorted(p for p in candidatos if len(p) == k - 1 and b"N" not in p)
+    for patron in rng.sample(candidatos, min(patrones, len(candidatos))):
+        esperado, inicio = [], 0
+        for registro in registros:
+            i = registro.find(patron)
+            while i >= 0:
+                esperado.append(inicio + i)
+                i = registro.find(patron, i + 1)
+            inicio += len(registro)
+        assert indice.positions_of(patron.decode("ascii")).tolist() == esperado, patron
+    print(f"  {'':<32} {min(patrones, len(candidatos))} patrones de {k - 1} bases junto a una N "
+          f"o al final de un registro coinciden con bytes.find")
+
+
+# ====================
+# Conteo en paralelo
+# ====================
+def benchmark_paralelo(args):
+    """Escalado de KmerIndex.build y scan_file según el número de procesos"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    temporal = tempfile.NamedTemporaryFile(suffix=".fa", delete=False)
+    temporal.close()
+    try:
+        escribir_fasta(temporal.name, args.longitud, args.registros, rng)
+        print(f"Genoma de {args.longitud:,} bases, k={args.k}, {os.cpu_count()} CPUs")
+        print(f"  {'workers':>8} {'build s':>9} {'x':>6} {'scan s':>9} {'x':>6}")
+        base = None
+        for workers in args.workers:
+            _, construccion = cronometrar(KmerIndex.build, genoma, args.k, workers=workers)
+            _, lectura = cronometrar(scan_file, temporal.name, args.k, 1 << 20, workers)
+            base = base or (construccion, lectura)
+            print(f"  {workers:>8} {construccion:>9.2f} {base[0] / construccion:>6.2f} "
+                  f"{lectura:>9.2f} {base[1] / lectura:>6.2f}")
+    finally:
+        os.remove(temporal.name)
+
+
+# ====================
+# K-mers canónicos (ambas hebras)
+# ====================
+def benchmark_hebras(args):
+    """Búsqueda en las dos hebras: índice canónico frente a genoma + reverso complementario y dos búsquedas"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    print(f"Genoma de {args.longitud:,} bases, k={args.k}")
+
+    variantes = [
+        ("una hebra (dos búsquedas)", lambda: KmerIndex.build(genoma, args.k)),
+        ("genoma + reverso complementario", lambda: KmerIndex.build(genoma + "N" + reverse_complement(genoma),
+                                                                    args.k)),
+        ("canónico (una búsqueda)", lambda: KmerIndex.build(genoma, args.k, canonical=True)),
+    ]
+    indices = []
+    for nombre, construir in variantes:
+        _, segundos = cronometrar(construir)
+        indice, pico = medir_memoria(construir)
+        reportar(nombre, segundos, args.longitud, pico)
+        print(f"  {'':<32} índice {indice.nbytes / 2 ** 20:.1f} MB")
+        indices.append((nombre, indice))
+
+    for longitud in sorted({max(1, args.k - 2), args.k}):
+        patrones = [genoma[i:i + longitud] for i in (rng.randrange(args.longitud - longitud + 1)
+                                                     for _ in range(args.consultas))]
+        for nombre, indice in indices[::2]:
+            latencias = [cronometrar(indice.strand_positions, patron)[1] for patron in patrones]
+            print(f"  strand_positions {longitud:>2} bases, {nombre:<26} p50 {percentil_ms(latencias, 50):.4f} ms  "
+                  f"p99 {percentil_ms(latencias, 99):.4f} ms")
+
+
+# ====================
+# Búsqueda aproximada
+# ====================
+def mutar(patron, rng, cambios):
+    """Copia del patrón con `cambios` bases sustituidas por otra base o por un código IUPAC"""
+    bases = list(patron)
+    for i in rng.sample(range(len(bases)), min(cambios, len(bases))):
+        bases[i] = rng.choice([b for b in "ACGTNRY" if b != bases[i]])
+    return "".join(bases)
+
+
+def benchmark_aproximada(args):
+    """Latencia de la búsqueda con desajustes (Hamming <= d) en el índice de k-mers y en el FM"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    print(f"Genoma de {args.longitud:,} bases, k={args.k}")
+    _, segundos = cronometrar(KmerIndex.build, genoma, args.k)
+    kmers = KmerIndex.build(genoma, args.k)
+    print(f"  KmerIndex.build {segundos:.2f} s")
+    fm, segundos = cronometrar(FMIndex.build, genoma)
+    print(f"  FMIndex.build   {segundos:.2f} s")
+
+    estructuras = [("KmerIndex", kmers.approximate_positions), ("FMIndex", fm.approximate_locate)]
+    for longitud in args.longitudes_patron:
+        # patrones del genoma con una sustitución: hay al menos una aparición con d >= 1
+        patrones = [mutar(genoma[i:i + longitud], rng, 1)
+                    for i in (rng.randrange(args.longitud - longitud + 1) for _ in range(args.consultas))]
+        for d in args.desajustes:
+            for nombre, buscar in estructuras:
+                latencias, encontradas = [], 0
+                for patron in patrones:
+                    (posiciones, _), segundos = cronometrar(buscar, patron, d)
+                    latencias.append(segundos)
+                    encontradas += len(posiciones)
+                print(f"  {longitud:>3} bases, d={d}, {nombre:<10} p50 {percentil_ms(latencias, 50):9.3f} ms  "
+                      f"p99 {percentil_ms(latencias, 99):9.3f} ms  {encontradas / len(patrones):10.1f} apariciones")
+
+
+# ====================
+# Paneles de motivos (Aho-Corasick)
+# ====================
+def benchmark_motivos(args):
+    """Una pasada de MotifScanner por panel frente a una búsqueda lineal (str.find) por motivo"""
+    rng = random.Random(args.semilla)
+    genoma = generar_genoma(args.longitud, rng)
+    print(f"Genoma de {args.longitud:,} bases")
+    for tamano in args.paneles:
+        # cebadores de 18-25 bases: la mitad sacados del genoma, el resto al azar
+        motivos = []
+        for i in range(tamano):
+            longitud = rng.randint(18, 25)
+            if i % 2:
+                motivos.append(generar_genoma(longitud, rng))
+            else:
+                inicio = rng.randrange(args.longitud - longitud + 1)
+                motivos.append(genoma[inicio:inicio + longitud])
+
+        escaner, construccion = cronometrar(MotifScanner, motivos)
+        _, pasada = cronometrar(escaner.count, genoma)
+        conteos, pico = medir_memoria(escaner.count, genoma)
+        print(f"\n▶ Panel de {tamano:,} motivos ({escaner.states:,} estados, construcción {construccion:.2f} s)")
+        reportar("MotifScanner (una pasada)", pasada, args.longitud, pico)
+
+        muestra = motivos[:args.referencia]
+        referencia, segundos = cronometrar(lambda: [len(buscar_con_find(genoma, m)) for m in muestra])
+        assert referencia == conteos[:len(muestra)].tolist()
+        estimado = segundos / len(muestra) * tamano
+        print(f"  {'str.find por motivo (estimado)':<32} {estimado:8.2f} s  "
+              f"({len(muestra)} motivos medidos; x{estimado / pasada:.1f} frente a una pasada)")
+
+
+# ====================
+# Índice en disco
+# ====================
+def benchmark_disco(args):
+    """Guardar, reabrir con np.memmap y construir directamente en disco frente a reindexar"""
+    rng = random.Random(args.semilla)
+    directorio = tempfile.mkdtemp()
+    fasta = os.path.join(directorio, "genoma.fa")
+    ruta = os.path.join(directorio, "genoma.p5idx")
+    try:
+        escribir_fasta(fasta, args.longitud, args.registros, rng)
+        print(f"Genoma de {args.longitud:,} bases en {args.registros} registros, k={args.k}")
+
+        _, segundos = cronometrar(KmerIndex.from_file, fasta, args.k)
+        indice, pico = medir_memoria(KmerIndex.from_file, fasta, args.k)
+        reportar("from_file (en memoria)", segundos, args.longitud, pico)
+        _, segundos = cronometrar(indice.save, ruta)
+        print(f"  {'save':<32} {segundos:8.2f} s  archivo {os.path.getsize(ruta) / 2 ** 20:.1f} MB")
+        os.remove(ruta)
+        _, segundos = cronometrar(KmerIndex.from_file, fasta, args.k, index_path=ruta)
+        os.remove(ruta)
+        _, pico = medir_memoria(KmerIndex.from_file, fasta, args.k, index_path=ruta)
+        reportar("from_file (posiciones en disco)", segundos, args.longitud, pico)
+
+        abierto, segundos = cronometrar(KmerIndex.load, ruta)
+        print(f"  {'load (np.memmap)':<32} {segundos * 1000:8.2f} ms")
+        _, segundos = cronometrar(KmerIndex.load, ruta, True)
+        print(f"  {'load con verificación del CRC32':<32} {segundos:8.2f} s")
+
+        patrones = [generar_genoma(args.k, rng) for _ in range(args.consultas)]
+        for nombre, estructura in (("en memoria", indice), ("np.memmap", abierto)):
+            latencias = [cronometrar(estructura.positions_of, patron)[1] for patron in patrones]
+            print(f"  positions_of {nombre:<19} p50 {percentil_ms(latencias, 50):.4f} ms  "
+                  f"p99 {percentil_ms(latencias, 99):.4f} ms")
+    finally:
+        for nombre in os.listdir(directorio):
+            os.remove(os.path.join(directorio, nombre))
+        os.rmdir(directorio)
+
+
+# ====================
+# Main
+# ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del índice de ADN")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    indice = sub.add_parser("indice", help="construcción del índice de k-mers empaquetado")
+    indice.add_argument("--longitud", type=int, default=10_000_000, help="bases del genoma")
+    indice.add_argument("--k", type=int, default=12)
+    indice.add_argument("--consultas", type=int, default=2000)
+    indice.add_argument("--longitud-trie", type=int, default=200_000,
+                        help="bases para comparar con el trie de nodos (0 para omitir)")
+    indice.add_argument("--semilla", type=int, default=42)
+
+    fm = sub.add_parser("fm", help="arreglo de sufijos e índice FM para patrones de cualquier longitud")
+    fm.add_argument("--longitud", type=int, default=10_000_000, help="bases del genoma")
+    fm.add_argument("--longitudes-patron", type=int, nargs="+", default=[8, 32, 128, 512])
+    fm.add_argument("--consultas", type=int, default=500)
+    fm.add_argument("--repeticion", type=int, default=0,
+                    help="construir el genoma repitiendo sus primeras N bases")
+    fm.add_argument("--semilla", type=int, default=42)
+
+    fasta = sub.add_parser("fasta", help="lectura en streaming de FASTA/FASTQ")
+    fasta.add_argument("--archivo", help="FASTA/FASTQ a leer (por defecto uno sintético temporal)")
+    fasta.add_argument("--longitud", type=int, default=20_000_000, help="bases del FASTA sintético")
+    fasta.add_argument("--registros", type=int, default=8, help="registros del FASTA sintético")
+    fasta.add_argument("--k", type=int, default=6)
+    fasta.add_argument("--trozo", type=int, default=1 << 20, help="bases por trozo")
+    fasta.add_argument("--sin-indice", action="store_true", help="medir solo la pasada de composición")
+    fasta.add_argument("--huecos", type=int, default=4, help="tramos de N por trozo del FASTA sintético")
+    fasta.add_argument("--semilla", type=int, default=42)
+
+    paralelo = sub.add_parser("paralelo", help="escalado del conteo de k-mers con varios procesos")
+    paralelo.add_argument("--longitud", type=int, default=20_000_000, help="bases del genoma")
+    paralelo.add_argument("--registros", type=int, default=8, help="registros del FASTA sintético")
+    paralelo.add_argument("--k", type=int, default=10)
+    paralelo.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    paralelo.add_argument("--semilla", type=int, default=42)
+
+    hebras = sub.add_parser("hebras", help="k-mers canónicos y búsqueda en las dos hebras")
+    hebras.add_argument("--longitud", type=int, default=10_000_000, help="bases del genoma")
+    hebras.add_argument("--k", type=int, default=12)
+    hebras.add_argument("--consultas", type=int, default=2000)
+    hebras.add_argument("--semilla", type=int, default=42)
+
+    aproximada = sub.add_parser("aproximada", help="búsqueda con desajustes y códigos IUPAC")
+    aproximada.add_argument("--longitud", type=int, default=10_000_000, help="bases del genoma")
+    aproximada.add_argument("--k", type=int, default=12)
+    aproximada.add_argument("--longitudes-patron", type=int, nargs="+", default=[8, 12, 20, 32])
+    aproximada.add_argument("--desajustes", type=int, nargs="+", default=[0, 1, 2])
+    aproximada.add_argument("--consultas", type=int, default=100)
+    aproximada.add_argument("--semilla", type=int, default=42)
+
+    motivos = sub.add_parser("motivos", help="paneles de motivos con Aho-Corasick")
+    motivos.add_argument("--longitud", type=int, default=20_000_000, help="bases del genoma")
+    motivos.add_argument("--paneles", type=int, nargs="+", default=[10, 100, 1000])
+    motivos.add_argument("--referencia", type=int, default=10,
+                         help="motivos buscados con str.find para estimar el coste por motivo")
+    motivos.add_argument("--semilla", type=int, default=42)
+
+    disco = sub.add_parser("disco", help="índice guardado y reabierto con np.memmap")
+    disco.add_argument("--longitud", type=int, default=20_000_000, help="bases del genoma")
+    disco.add_argument("--registros", type=int, default=8, help="registros del FASTA sintético")
+    disco.add_argument("--k", type=int, default=12)
+    disco.add_argument("--consultas", type=int, default=2000)
+    disco.add_argument("--semilla", type=int, default=42)
+
+    args = parser.parse_args()
+    if args.comando == "indice":
+        benchmark_indice(args)
+    elif args.comando == "fm":
+        benchmark_fm(args)
+    elif args.comando == "fasta":
+        benchmark_fasta(args)
+    elif args.comando == "paralelo":
+        benchmark_paralelo(args)
+    elif args.comando == "hebras":
+        benchmark_hebras(args)
+    elif args.comando == "aproximada":
+        benchmark_aproximada(args)
+    elif args.comando == "motivos":
+        benchmark_motivos(args)
+    elif args.comando == "disco":
+        benchmark_disco(args)
@@ -1,7 +1,1283 @@
 import tkinter as tk
+from tkinter import filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
+import gzip
+import itertools
+import multiprocessing as mp
+import os
+import queue
 import random
+import struct
+import time
+import zlib
+from array import array
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# ====================
+# Codificación de nucleótidos en 2 bits
+# ====================
+BASES = "ACGT"
+INVALID_CODE = 255
+_BASE_CODES = np.full(256, INVALID_CODE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _BASE_CODES[ord(_base)] = _code
+    _BASE_CODES[ord(_base.lower())] = _code
+_CODE_BASES = np.full(256, ord("N"), dtype=np.uint8)
+_CODE_BASES[:len(BASES)] = np.frombuffer(BASES.encode("ascii"), dtype=np.uint8)
+
+
+def encode_sequence(sequence) -> np.ndarray:
+    """Codifica una secuencia (str o bytes) como uint8: A=0, C=1, G=2, T=3 y 255 si no es ACGT"""
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", errors="replace")
+    return _BASE_CODES[np.frombuffer(sequence, dtype=np.uint8)]
+
+
+def encode_kmer(kmer: str):
+    """Código entero de 2 bits por base de un k-mer, o None si tiene bases fuera de ACGT"""
+    code = 0
+    for base in kmer.upper():
+        value = BASES.find(base)
+        if value < 0:
+            return None
+        code = (code << 2) | value
+    return code
+
+
+def decode_kmer(code: int, k: int) -> str:
+    return "".join(BASES[(code >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def decode_sequence(codes) -> str:
+    """Inversa de encode_sequence; los códigos inválidos salen como N"""
+    return _CODE_BASES[codes].tobytes().decode("ascii")
+
+
+def kmer_codes(codes, k):
+    """Código de 2k bits de cada ventana de k bases y máscara de las ventanas válidas (solo ACGT)"""
+    windows = len(codes) - k + 1
+    if windows <= 0:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=bool)
+    block = (codes & 3).astype(np.uint32)  # códigos de ancho 1
+    kmers, length, width = None, 0, 1
+    while True:
+        if k & width:  # añade a la derecha las `width` bases siguientes
+            piece = block[length:length + windows]
+            kmers = piece.copy() if kmers is None else (kmers << (2 * width)) | piece
+            length += width
+        if length == k:
+            break
+        block = (block[:-width] << (2 * width)) | block[width:]
+        width <<= 1
+
+    invalid = codes == INVALID_CODE
+    if not invalid.any():
+        return kmers, np.ones(windows, dtype=bool)
+    seen = np.concatenate(([0], np.cumsum(invalid, dtype=np.int64)))  # bases inválidas hasta i
+    return kmers, seen[k:] == seen[:windows]
+
+
+_COMPLEMENT = str.maketrans("ACGTacgt", "TGCAtgca")
+
+
+def reverse_complement(sequence: str) -> str:
+    """Reverso complementario; lo que no es ACGT se deja igual"""
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def reverse_complement_kmers(kmers, k):
+    """Códigos de los reversos complementarios de un array de k-mers"""
+    x = kmers.astype(np.uint32) ^ np.uint32((1 << 2 * k) - 1)
+    x = ((x >> 2) & np.uint32(0x33333333)) | ((x & np.uint32(0x33333333)) << 2)
+    x = ((x >> 4) & np.uint32(0x0F0F0F0F)) | ((x & np.uint32(0x0F0F0F0F)) << 4)
+    return x.byteswap() >> np.uint32(32 - 2 * k)
+
+
+def canonical_kmers(kmers, k):
+    """K-mer canónico de cada ventana (el menor entre él y su reverso complementario) y su hebra (0 o 1)"""
+    reverse = reverse_complement_kmers(kmers, k)
+    return np.minimum(kmers, reverse), (reverse < kmers).astype(np.uint8)
+
+
+IUPAC_CODES = {"A": "A", "C": "C", "G": "G", "T": "T", "R": "AG", "Y": "CT", "S": "CG", "W": "AT",
+               "K": "GT", "M": "AC", "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT"}
+_IUPAC_MASKS = np.zeros(256, dtype=np.uint8)  # bit c: la base c coincide; 0 si no es un código IUPAC
+for _letter, _bases in IUPAC_CODES.items():
+    _IUPAC_MASKS[ord(_letter)] = _IUPAC_MASKS[ord(_letter.lower())] = sum(1 << BASES.index(b) for b in _bases)
+
+
+def iupac_masks(pattern: str):
+    """Máscara de bases ACGT aceptadas en cada posición del patrón, o None si tiene letras fuera de IUPAC"""
+    masks = _IUPAC_MASKS[np.frombuffer(pattern.encode("ascii", errors="replace"), dtype=np.uint8)]
+    return None if (masks == 0).any() else masks
+
+
+def _window_kmers(codes, k, canonical=False):
+    """kmer_codes con las ventanas válidas como índices y, si canonical, los canónicos y sus hebras"""
+    kmers, valid = kmer_codes(codes, k)
+    where = None if valid.all() else np.flatnonzero(valid)
+    strands = None
+    if canonical:
+        kmers, strands = canonical_kmers(kmers, k)
+    return kmers, where, strands
+
+
+# ====================
+# Índice de k-mers empaquetado (CSR)
+# ====================
+class KmerIndex:
+    """Posiciones de todos los k-mers de un genoma en formato CSR, indexado por el código del k-mer"""
+    MAX_K = 12  # 4^12 entradas por tabla = 64 MB
+
+    def __init__(self, k, counts, offsets, positions, genome_length,
+                 record_starts, record_lengths, tails, tail_starts, canonical=False):
+        self.k = k
+        self.canonical = canonical
+        self.counts = counts
+        self.offsets = offsets
+        self.positions = positions
+        self.genome_length = genome_length
+        # registros concatenados (uno solo si viene de build); ningún k-mer cruza de uno a otro
+        self.record_starts = record_starts
+        self.record_lengths = record_lengths
+        # k-1 bases antes de cada corte (base inválida o fin de registro), desde tail_starts:
+        # ninguna empieza un k-mer completo, así que los patrones más cortos se buscan también aquí
+        self.tails = tails
+        self.tail_starts = tail_starts
+        self.profile = None     # SequenceProfile de la pasada de conteo, si viene de from_file
+
+    @classmethod
+    def build(cls, sequence, k: int = 6, chunk_size: int = 1 << 22, workers: int = 1,
+              canonical: bool = False):
+        """Construye el índice en dos pasadas (conteo y reparto) por bloques de `chunk_size` ventanas"""
+        cls._check_k(k)
+        cls._check_length(len(sequence), canonical)
+        windows = max(0, len(sequence) - k + 1)
+        tail = sequence[windows:]
+        records = RecordTable(k)
+        for start in range(0, len(sequence), chunk_size):
+            first = min(start, k - 1)  # cada fila mira k-1 bases atrás
+            piece = sequence[start - first:start + chunk_size]
+            records.add_breaks(start - first, piece if isinstance(piece, np.ndarray) else encode_sequence(piece),
+                               first)
+        records.add(0, len(sequence), tail if isinstance(tail, np.ndarray) else encode_sequence(tail))
+        if workers > 1 and windows > chunk_size:
+            counts, offsets, positions = _build_parallel(sequence, k, workers, chunk_size, canonical)
+            return cls(k, counts.astype(np.uint32), offsets, positions, len(sequence), *records.arrays(),
+                       canonical)
+
+        def chunks(size):
+            """(inicio, códigos, posiciones relativas válidas o None, hebras o None) de cada bloque"""
+            for start in range(0, windows, size):
+                piece = sequence[start:start + size + k - 1]
+                if not isinstance(piece, np.ndarray):
+                    piece = encode_sequence(piece)
+                yield (start, *_window_kmers(piece, k, canonical))
+
+        counts = np.zeros(4 ** k, dtype=np.int64)
+        for _, kmers, where, _ in chunks(max(chunk_size, 4 ** k)):
+            counts += np.bincount(kmers if where is None else kmers[where], minlength=4 ** k)
+        return cls._assemble(k, counts, chunks(chunk_size), len(sequence), records, canonical)
+
+    @classmethod
+    def from_file(cls, path, k: int = 6, chunk_size: int = 1 << 20, workers: int = 1,
+                  canonical: bool = False, index_path=None):
+        """Indexa un FASTA/FASTQ en dos pasadas por trozos; con `index_path`, directamente en disco"""
+        cls._check_k(k)
+        records = RecordTable(k)
+        profile = scan_file(path, k, max(chunk_size, 4 ** k), workers, records, canonical)
+        cls._check_length(profile.length, canonical)
+
+        positions = tmp_path = None
+        try:
+            if index_path is not None:
+                tmp_path = index_path + ".tmp"
+                layout, size = _index_layout(k, len(records.starts), int(profile.kmer_counts.sum()),
+                                             len(records.tail_starts), *map(len, _profile_blobs(profile)))
+                with open(tmp_path, "wb") as f:
+                    f.truncate(size)
+                _, dtype, shape, offset = layout["positions"]
+                positions = _map_section(tmp_path, dtype, shape, offset, "r+")
+            with open_sequence_file(path) as stream:
+                chunks = stream_kmers(read_records(stream, chunk_size), k, canonical=canonical)
+                index = cls._assemble(k, profile.kmer_counts, chunks, profile.length, records,
+                                      canonical, positions)
+            index.profile = profile
+            if index_path is None:
+                return index
+
+            if isinstance(positions, np.memmap):  # sin ventanas no hay sección que mapear
+                positions.flush()
+            index._write_file(tmp_path, in_place={"positions"})
+            del index, positions
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return cls.load(index_path)
+
+    @classmethod
+    def _check_k(cls, k):
+        if not 1 <= k <= cls.MAX_K:
+            raise ValueError(f"k debe estar entre 1 y {cls.MAX_K}")
+
+    @staticmethod
+    def _check_length(length, canonical):
+        # el índice canónico guarda posición * 2 + hebra en el mismo uint32
+        if length >= 1 << (31 if canonical else 32):
+            raise ValueError("El genoma no cabe en posiciones uint32")
+
+    @classmethod
+    def _assemble(cls, k, counts, chunks, genome_length, records, canonical=False, positions=None):
+        """Segunda pasada: reparte en su tramo las posiciones de cada bloque, en `positions` si se pasa"""
+        offsets = np.zeros(4 ** k + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum(counts)
+        if positions is None:
+            positions = np.empty(int(offsets[-1]), dtype=np.uint32)
+
+        fill = offsets[:-1].copy()  # siguiente hueco libre de cada k-mer
+        for start, kmers, where, strands in chunks:
+            _scatter_positions(positions, fill, start, kmers, where, strands)
+        return cls(k, counts.astype(np.uint32), offsets, positions, genome_length, *records.arrays(),
+                   canonical)
+
+    def count(self, kmer: str) -> int:
+        return len(self.positions_of(kmer))
+
+    def positions_of(self, pattern: str) -> np.ndarray:
+        """Posiciones ordenadas de un patrón (en un índice canónico, las de la hebra +)"""
+        m = len(pattern)
+        if m > self.k:
+            return self._positions_of_long(pattern)
+        if self.canonical:
+            return self._canonical_positions(pattern)[0]
+        code = encode_kmer(pattern)
+        if code is None:
+            return np.zeros(0, dtype=np.uint32)
+        shift = 2 * (self.k - m)
+        found = self.positions[self.offsets[code << shift]:self.offsets[(code + 1) << shift]]
+        if m == self.k:
+            return found
+        return np.sort(np.concatenate([found] + self._tail_positions(pattern)).astype(np.uint32))
+
+    def strand_positions(self, pattern: str):
+        """Apariciones de un patrón en las dos hebras como (posiciones, hebras) ordenadas por posición"""
+        reverse = reverse_complement(pattern.upper())
+        if self.canonical and len(pattern) <= self.k:
+            plus, minus = self._canonical_positions(pattern)
+        else:
+            plus, minus = self.positions_of(pattern), self.positions_of(reverse)
+        if reverse == pattern.upper():
+            minus = minus[:0]
+        positions = np.concatenate((plus, minus)).astype(np.uint32)
+        strands = np.repeat(np.array([0, 1], dtype=np.uint8), [len(plus), len(minus)])
+        order = np.argsort(positions, kind="stable")
+        return positions[order], strands[order]
+
+    def _tail_positions(self, pattern):
+        """Apariciones de un patrón más corto que k en las k-1 bases anteriores a cada corte"""
+        m = len(pattern)
+        width = self.tails.shape[1]
+        pattern_codes = encode_sequence(pattern)
+        return [self.tail_starts[(self.tails[:, j:j + m] == pattern_codes).all(axis=1)] + j
+                for j in range(width - m + 1)]
+
+    def _canonical_slots(self, code, m):
+        """K-mers canónicos en cuyo tramo puede estar una ventana que empieza por `code` (m bases)"""
+        shift = 2 * (self.k - m)
+        free = np.arange(1 << shift, dtype=np.int64)
+        reverse = int(reverse_complement_kmers(np.array([code]), m)[0])
+        return np.concatenate(((code << shift) | free, (free << 2 * m) | reverse))
+
+    def _windows(self, slots):
+        """K-mer en la hebra + y posición de cada ventana guardada en los tramos de `slots` (índice canónico)"""
+        starts = self.offsets[slots].astype(np.int64)
+        lengths = self.offsets[slots + 1].astype(np.int64) - starts
+        stored = self.positions[_concat_ranges(starts, lengths)]
+        kmers = np.repeat(slots.astype(np.uint32), lengths)
+        reverse = (stored & 1).astype(bool)
+        kmers[reverse] = reverse_complement_kmers(kmers[reverse], self.k)
+        return kmers, stored >> 1
+
+    def _canonical_positions(self, pattern):
+        """(posiciones en +, posiciones en -) de un patrón de hasta k bases en un índice canónico"""
+        m = len(pattern)
+        code = encode_kmer(pattern)
+        if code is None:
+            empty = np.zeros(0, dtype=np.uint32)
+            return empty, empty
+        reverse = reverse_complement(pattern)
+        reverse_code = encode_kmer(reverse)
+        if m == self.k:
+            # un solo tramo: el del canónico, con la hebra de cada ventana en el bit bajo
+            stored = self.positions[self.offsets[min(code, reverse_code)]:
+                                    self.offsets[min(code, reverse_code) + 1]]
+            plus = (stored & 1) == (code > reverse_code)
+            return stored[plus] >> 1, stored[~plus] >> 1
+        slots = np.unique(np.concatenate((self._canonical_slots(code, m),
+                                          self._canonical_slots(reverse_code, m))))
+        kmers, positions = self._windows(slots)
+        prefixes = kmers >> np.uint32(2 * (self.k - m))
+        plus = [positions[prefixes == code]] + self._tail_positions(pattern)
+        minus = [positions[prefixes == reverse_code]] + self._tail_positions(reverse)
+        return (np.sort(np.concatenate(plus).astype(np.uint32)),
+                np.sort(np.concatenate(minus).astype(np.uint32)))
+
+    def _positions_of_long(self, pattern):
+        k, m = self.k, len(pattern)
+        offsets = list(range(0, m - k + 1, k))
+        if offsets[-1] != m - k:
+            offsets.append(m - k)
+        pieces = sorted(((self.positions_of(pattern[o:o + k]), o) for o in offsets),
+                        key=lambda piece: len(piece[0]))
+        found = pieces[0][0].astype(np.int64) - pieces[0][1]
+        for positions, offset in pieces[1:]:
+            if not len(found):
+                break
+            found = np.intersect1d(found, positions.astype(np.int64) - offset, assume_unique=True)
+        return found[self._within_records(found, m)].astype(np.uint32)
+
+    def _within_records(self, starts, m):
+        """Máscara de las apariciones de m bases que no cruzan de un registro al siguiente"""
+        if len(self.record_starts) < 2:
+            return np.ones(len(starts), dtype=bool)
+        first = np.searchsorted(self.record_starts, starts, side="right")
+        return first == np.searchsorted(self.record_starts, starts + m - 1, side="right")
+
+    def approximate_positions(self, pattern: str, max_mismatches: int = 1):
+        """(posiciones, desajustes) de las apariciones a distancia de Hamming <= max_mismatches"""
+        masks = iupac_masks(pattern)
+        if masks is None or not len(masks):
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+        m = len(masks)
+        if m <= self.k:
+            return self._approximate_short(masks, max_mismatches)
+
+        pieces = -(-m // self.k)
+        bounds = [m * i // pieces for i in range(pieces + 1)]
+        starts, mismatches = [], []
+        for lo, hi in zip(bounds, bounds[1:]):
+            # la ventana de k bases que empieza en el trozo debe quedar dentro del patrón (si no,
+            # una base fuera de ACGT detrás de la aparición la esconde): los trozos finales se
+            # buscan como las últimas k bases con N, que no gasta desajustes, en lo ya cubierto
+            start = min(lo, m - self.k)
+            piece = masks[start:hi].copy()
+            piece[:lo - start] = _IUPAC_MASKS[ord("N")]
+            positions, cost = self._approximate_short(piece, max_mismatches)
+            starts.append(positions.astype(np.int64) - start)
+            mismatches.append(cost)
+        starts, mismatches = np.concatenate(starts), np.concatenate(mismatches)
+        order = np.argsort(starts, kind="stable")
+        starts, mismatches = starts[order], mismatches[order]
+        found, first, seen = np.unique(starts, return_index=True, return_counts=True)
+        if not len(found):
+            return found.astype(np.uint32), found.astype(np.uint8)
+        total = np.add.reduceat(mismatches.astype(np.int64), first)
+        keep = (seen == pieces) & (total <= max_mismatches) & (found >= 0)
+        keep[keep] &= self._within_records(found[keep], m)
+        return found[keep].astype(np.uint32), total[keep].astype(np.uint8)
+
+    def _approximate_short(self, masks, max_mismatches):
+        """Patrón de m <= k bases: recorre los prefijos de código como un trie de 4 hijos con poda"""
+        k, m = self.k, len(masks)
+        codes = np.zeros(1, dtype=np.int64)
+        cost = np.zeros(1, dtype=np.int64)
+        for depth, mask in enumerate(masks):
+            misses = ((int(mask) >> np.arange(4)) & 1) == 0
+            codes = (codes[:, None] * 4 + np.arange(4)).ravel()
+            cost = (cost[:, None] + misses).ravel()
+            keep = cost <= max_mismatches
+            if not self.canonical:
+                shift = 2 * (k - depth - 1)
+                keep &= self.offsets[(codes + 1) << shift] > self.offsets[codes << shift]
+            codes, cost = codes[keep], cost[keep]
+
+        shift = 2 * (k - m)
+        if self.canonical:
+            reverse = reverse_complement_kmers(codes, m).astype(np.int64)
+            free = np.arange(1 << shift, dtype=np.int64)
+            slots = np.unique(np.concatenate((((codes << shift)[:, None] | free).ravel(),
+                                              ((free << 2 * m)[:, None] | reverse).ravel())))
+            kmers, positions = self._windows(slots)
+            prefixes = (kmers >> np.uint32(shift)).astype(np.int64)
+            found = np.searchsorted(codes, prefixes)  # codes queda ordenado al bajar por el trie
+            hit = found < len(codes)
+            hit[hit] = codes[found[hit]] == prefixes[hit]
+            positions, mismatches = positions[hit], cost[found[hit]]
+        else:
+            starts = self.offsets[codes << shift].astype(np.int64)
+            lengths = self.offsets[(codes + 1) << shift].astype(np.int64) - starts
+            positions = self.positions[_concat_ranges(starts, lengths)]
+            mismatches = np.repeat(cost, lengths)
+
+        width = self.tails.shape[1]
+        if m <= width:
+            accepted = np.zeros((m, 256), dtype=bool)  # accepted[i, c]: la base c vale en la posición i
+            accepted[:, :len(BASES)] = ((masks[:, None] >> np.arange(len(BASES))) & 1).astype(bool)
+            extra, extra_cost = [positions], [mismatches]
+            for j in range(width - m + 1):
+                window = self.tails[:, j:j + m]
+                misses = (~accepted[np.arange(m), window]).sum(axis=1)
+                valid = (window != INVALID_CODE).all(axis=1) & (misses <= max_mismatches)
+                extra.append(self.tail_starts[valid] + j)
+                extra_cost.append(misses[valid])
+            positions, mismatches = np.concatenate(extra), np.concatenate(extra_cost)
+        order = np.argsort(positions, kind="stable")
+        return positions[order].astype(np.uint32), mismatches[order].astype(np.uint8)
+
+    def record_of(self, position: int):
+        """(registro, desplazamiento dentro del registro) de una posición global"""
+        record = int(np.searchsorted(self.record_starts, position, side="right")) - 1
+        return record, position - int(self.record_starts[record])
+
+    def kmers_with_prefix(self, prefix: str):
+        """Genera (k-mer, posiciones) de los k-mers presentes que empiezan por el prefijo"""
+        code = encode_kmer(prefix)
+        if code is None or len(prefix) > self.k:
+            return
+        shift = 2 * (self.k - len(prefix))
+        if self.canonical:
+            kmers, positions = self._windows(np.unique(self._canonical_slots(code, len(prefix))))
+            keep = (kmers >> np.uint32(shift)) == code
+            kmers, positions = kmers[keep], positions[keep]
+            order = np.lexsort((positions, kmers))
+            kmers, positions = kmers[order], positions[order]
+            bounds = np.flatnonzero(np.diff(kmers)) + 1
+            for group, found in zip(np.split(kmers, bounds), np.split(positions, bounds)):
+                if len(group):
+                    yield decode_kmer(int(group[0]), self.k), found
+            return
+        low = code << shift
+        for kmer_code in np.flatnonzero(self.counts[low:(code + 1) << shift]) + low:
+            yield (decode_kmer(int(kmer_code), self.k),
+                   self.positions[self.offsets[kmer_code]:self.offsets[kmer_code + 1]])
+
+    @property
+    def nbytes(self):
+        return (self.counts.nbytes + self.offsets.nbytes + self.positions.nbytes + self.tails.nbytes
+                + self.tail_starts.nbytes + self.record_starts.nbytes + self.record_lengths.nbytes)
+
+    def save(self, path):
+        """Guarda el índice (y el perfil, si lo hay) en un archivo que load abre con np.memmap"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.truncate(self._layout()[1])
+        self._write_file(tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, verify: bool = False):
+        """Abre un índice guardado con save como np.memmap; con verify=True comprueba el CRC32"""
+        with open(path, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size:
+            raise ValueError(f"{path} no es un índice de k-mers válido")
+        (magic, version, k, canonical, genome_length, records, total, tails,
+         names_size, preview_size, checksum) = INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or not 1 <= k <= cls.MAX_K:
+            raise ValueError(f"{path} no es un índice de k-mers válido")
+        layout, size = _index_layout(k, records, total, tails, names_size, preview_size)
+        if os.path.getsize(path) != size:
+            raise ValueError(f"{path} está truncado o no corresponde a su cabecera")
+
+        arrays = {name: _map_section(path, dtype, shape, offset) for name, dtype, shape, offset in layout.values()}
+        if verify and _index_checksum(arrays, layout) != checksum:
+            raise ValueError(f"{path} está dañado: el CRC32 no coincide")
+
+        index = cls(k, arrays["counts"], arrays["offsets"], arrays["positions"], genome_length,
+                    arrays["record_starts"], arrays["record_lengths"], arrays["tails"], arrays["tail_starts"],
+                    bool(canonical))
+        profile = SequenceProfile(k)
+        profile.records = records
+        names = arrays["names"].tobytes().decode("utf-8")
+        profile.names = names.split("\n") if names else []
+        profile.length = genome_length
+        profile.composition = np.array(arrays["composition"], dtype=np.int64)
+        profile.kmer_counts = arrays["counts"]
+        profile.preview = arrays["preview"].tobytes().decode("ascii")
+        index.profile = profile
+        return index
+
+    def _layout(self):
+        return _index_layout(self.k, len(self.record_starts), len(self.positions), len(self.tail_starts),
+                             *map(len, _profile_blobs(self.profile)))
+
+    def _write_file(self, path, in_place=()):
+        """Escribe secciones y cabecera en un archivo ya creado; las de `in_place` ya están escritas"""
+        layout, _ = self._layout()
+        names, preview = _profile_blobs(self.profile)
+        composition = (self.profile.composition if self.profile is not None
+                       else np.zeros(len(BASES) + 1, dtype=np.int64))
+        arrays = {"counts": self.counts, "offsets": self.offsets, "positions": self.positions,
+                  "record_starts": self.record_starts, "record_lengths": self.record_lengths,
+                  "tails": self.tails, "tail_starts": self.tail_starts, "composition": composition,
+                  "names": np.frombuffer(names, dtype=np.uint8),
+                  "preview": np.frombuffer(preview, dtype=np.uint8)}
+        with open(path, "r+b") as f:
+            for name, (_, dtype, shape, offset) in layout.items():
+                if name in in_place:
+                    continue
+                f.seek(offset)
+                for block in _section_blocks(np.ascontiguousarray(arrays[name], dtype=dtype)):
+                    f.write(block)
+            f.flush()
+            in_file = {name: _map_section(path, dtype, shape, offset)
+                       for name, (_, dtype, shape, offset) in layout.items() if name in in_place}
+            checksum = _index_checksum({**arrays, **in_file}, layout)
+            f.seek(0)
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.k, int(self.canonical),
+                                      self.genome_length, len(self.record_starts), len(self.positions),
+                                      len(self.tail_starts), len(names), len(preview), checksum))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _concat_ranges(starts, lengths):
+    """Índices de los tramos [start, start + length) uno detrás de otro"""
+    first = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum())) + np.repeat(starts - first, lengths)
+
+
+def _scatter_positions(positions, fill, start, kmers, where, strands=None):
+    """Copia las posiciones de un bloque en el siguiente hueco (fill) del tramo de su k-mer"""
+    # (k-mer << 32 | posición): una sola ordenación agrupa por k-mer con posiciones crecientes
+    if where is None:
+        packed = kmers.astype(np.uint64)
+        values = np.arange(start, start + len(kmers), dtype=np.uint64)
+    else:
+        packed = kmers[where].astype(np.uint64)
+        values = (where + start).astype(np.uint64)
+    if strands is not None:
+        values <<= np.uint64(1)
+        values |= strands if where is None else strands[where]
+    packed <<= np.uint64(32)
+    packed |= values
+    if not len(packed):
+        return
+    packed.sort()
+    high = packed >> np.uint64(32)
+    run_starts = np.flatnonzero(np.concatenate(([True], high[1:] != high[:-1])))
+    run_lengths = np.diff(run_starts, append=len(packed))
+    run_kmers = high[run_starts].astype(np.int64)
+    # el i-ésimo elemento de una racha va a fill[k-mer] + (i - inicio de la racha)
+    shift = fill[run_kmers].astype(np.int64) - run_starts
+    positions[np.arange(len(packed)) + np.repeat(shift, run_lengths)] = packed.astype(np.uint32)
+    fill[run_kmers] += run_lengths.astype(np.uint32)
+
+
+def _tail_rows(codes, ends, width):
+    """Las `width` bases anteriores a cada fin de `ends`, con INVALID_CODE hasta la última base inválida"""
+    padded = np.concatenate((np.full(width, INVALID_CODE, dtype=np.uint8), codes))
+    rows = padded[ends[:, None] + np.arange(width)]
+    # lo anterior a una base inválida ya queda en la fila del corte de esa base
+    rows[np.logical_or.accumulate(rows[:, ::-1] == INVALID_CODE, axis=1)[:, ::-1]] = INVALID_CODE
+    return rows
+
+
+class RecordTable:
+    """Inicio y longitud de cada registro y las k-1 bases anteriores a cada corte, en arrays compactos"""
+    def __init__(self, k):
+        self.width = k - 1
+        self.starts = array("q")
+        self.lengths = array("q")
+        self.tail_starts = array("q")
+        self.tails = bytearray()
+
+    def add(self, start, length, tail):
+        """Añade un registro; `tail` son sus últimas bases codificadas (hasta k-1)"""
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.add_tails(start + length - len(tail), tail, np.array([len(tail)]))
+
+    def add_breaks(self, offset, codes, first=0):
+        """Añade una fila por cada base inválida de codes[first:] precedida de una válida"""
+        invalid = codes == INVALID_CODE
+        ends = np.flatnonzero(invalid[1:] & ~invalid[:-1]) + 1
+        self.add_tails(offset, codes, ends[ends >= first])
+
+    def add_tails(self, offset, codes, ends):
+        if not self.width or not len(ends):
+            return
+        rows = _tail_rows(codes, ends, self.width)
+        keep = (rows != INVALID_CODE).any(axis=1)
+        self.tail_starts.extend((ends[keep] + (offset - self.width)).tolist())
+        self.tails += rows[keep].tobytes()
+
+    def extend(self, other):
+        """Añade las filas de cortes de otra tabla (la de un trabajador)"""
+        self.tail_starts.extend(other.tail_starts)
+        self.tails += other.tails
+
+    def arrays(self):
+        tail_starts = np.array(self.tail_starts, dtype=np.int64)
+        tails = np.frombuffer(bytes(self.tails), dtype=np.uint8).reshape(len(tail_starts), self.width)
+        order = np.argsort(tail_starts, kind="stable")
+        return (np.array(self.starts, dtype=np.int64), np.array(self.lengths, dtype=np.int64),
+                tails[order], tail_starts[order])
+
+
+# ====================
+# Índice en disco (np.memmap)
+# ====================
+INDEX_MAGIC = b"P5KI"
+INDEX_VERSION = 2
+# magic, versión, k, canónico, longitud del genoma, registros, posiciones, filas de cortes,
+# bytes de nombres, bytes de la vista previa, CRC32 de las secciones
+INDEX_HEADER = struct.Struct("<4sIBB2xQQQQQQI4x")
+INDEX_ALIGNMENT = 4096
+_CHECKSUM_BLOCK = 1 << 24
+
+
+def _index_layout(k, records, positions, tails, names_size, preview_size):
+    """{sección: (nombre, dtype, forma, desplazamiento)} en el orden del archivo y su tamaño total"""
+    sections = [("counts", "<u4", (4 ** k,)), ("offsets", "<u4", (4 ** k + 1,)),
+                ("positions", "<u4", (positions,)), ("record_starts", "<i8", (records,)),
+                ("record_lengths", "<i8", (records,)), ("tails", "u1", (tails, k - 1)),
+                ("tail_starts", "<i8", (tails,)),
+                ("composition", "<i8", (len(BASES) + 1,)), ("names", "u1", (names_size,)),
+                ("preview", "u1", (preview_size,))]
+    layout, offset = {}, INDEX_HEADER.size
+    for name, dtype, shape in sections:
+        offset = -(-offset // INDEX_ALIGNMENT) * INDEX_ALIGNMENT
+        layout[name] = (name, np.dtype(dtype), shape, offset)
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return layout, offset
+
+
+def _profile_blobs(profile):
+    """Nombres (utf-8, uno por línea) y vista previa del perfil tal como se guardan"""
+    if profile is None:
+        return b"", b""
+    return "\n".join(profile.names).encode("utf-8"), profile.preview.encode("ascii")
+
+
+def _map_section(path, dtype, shape, offset, mode="r"):
+    """Sección del archivo como np.memmap (np.memmap no admite secciones vacías)"""
+    if not int(np.prod(shape)):
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+
+def _section_blocks(values):
+    """Bytes de un array por bloques de _CHECKSUM_BLOCK, sin copiarlo entero"""
+    flat = values.reshape(-1).view(np.uint8)
+    for start in range(0, len(flat), _CHECKSUM_BLOCK):
+        yield memoryview(flat[start:start + _CHECKSUM_BLOCK])
+
+
+def _index_checksum(arrays, layout):
+    checksum = 0
+    for name, (_, dtype, _, _) in layout.items():
+        for block in _section_blocks(np.ascontiguousarray(arrays[name], dtype=dtype)):
+            checksum = zlib.crc32(block, checksum)
+    return checksum
+
+
+# ====================
+# Lectura de FASTA/FASTQ en streaming
+# ====================
+def open_sequence_file(path):
+    """Abre un FASTA/FASTQ en binario, descomprimiendo al vuelo si termina en .gz"""
+    return gzip.open(path, "rb") if str(path).endswith(".gz") else open(path, "rb")
+
+
+def _sequence_lines(stream):
+    """Genera (nombre, None) al empezar cada registro y (None, línea) por cada línea de secuencia"""
+    lines = (line.rstrip(b"\r\n") for line in stream)
+    fastq = None
+    number = 0
+    for line in lines:
+        number += 1
+        if not line:
+            continue
+        if fastq is None:
+            fastq = line.startswith(b"@")
+            if not fastq and not line.startswith(b">"):
+                yield "", None
+        if fastq:
+            sequence, separator, quality = next(lines, None), next(lines, None), next(lines, None)
+            if not line.startswith(b"@"):
+                raise ValueError(f"línea {number}: se esperaba una cabecera FASTQ '@'")
+            if quality is None or not separator.startswith(b"+") or len(quality) != len(sequence):
+                raise ValueError(f"línea {number}: registro FASTQ incompleto o con calidad de otra longitud")
+            number += 3
+            yield None, None
+            yield None, sequence
+        elif line.startswith(b">"):
+            yield line[1:].decode("utf-8", errors="replace").strip(), None
+        else:
+            yield None, line
+
+
+def read_records(stream, chunk_size: int = 1 << 20):
+    """Genera (nombre, trozo, nuevo_registro) de un FASTA/FASTQ en trozos de unas chunk_size bases"""
+    name, parts, size, new_record, started = None, [], 0, False, False
+    for header, line in _sequence_lines(stream):
+        if line is None:  # empieza un registro: se entrega lo pendiente del anterior
+            if parts or new_record:
+                yield name, b"".join(parts), new_record
+            name, parts, size, new_record, started = header, [], 0, True, True
+            continue
+        if not started:
+            raise ValueError("Secuencia antes de la primera cabecera")
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield name, b"".join(parts), new_record
+            parts, size, new_record = [], 0, False
+    if parts or new_record:
+        yield name, b"".join(parts), new_record
+
+
+class SequenceProfile:
+    """Registros, bases, composición, conteo de k-mers y vista previa de una pasada por las secuencias"""
+    PREVIEW_LENGTH = 600
+
+    def __init__(self, k):
+        self.k = k
+        self.records = 0
+        self.names = []
+        self.length = 0
+        self.composition = np.zeros(len(BASES) + 1, dtype=np.int64)
+        self.kmer_counts = np.zeros(4 ** k, dtype=np.int64)
+        self.preview = ""
+
+    def add_record(self, name):
+        self.records += 1
+        if name is not None:
+            self.names.append(name)
+
+    def add_codes(self, codes):
+        self.add_histogram(np.bincount(codes, minlength=256))
+        self.add_preview(codes)
+
+    def add_histogram(self, histogram):
+        """Suma un histograma de los 256 códigos de encode_sequence a la composición y la longitud"""
+        acgt = histogram[:len(BASES)]
+        total = int(histogram.sum())
+        self.composition[:len(BASES)] += acgt
+        self.composition[len(BASES)] += total - int(acgt.sum())
+        self.length += total
+
+    def add_preview(self, codes):
+        if len(self.preview) < self.PREVIEW_LENGTH:
+            self.preview += decode_sequence(codes[:self.PREVIEW_LENGTH - len(self.preview)])
+
+    @property
+    def gc_content(self):
+        """Porcentaje de G + C sobre las bases ACGT"""
+        acgt = int(self.composition[:len(BASES)].sum())
+        return 100 * int(self.composition[1] + self.composition[2]) / acgt if acgt else 0.0
+
+    def top_kmers(self, n=5):
+        """Los n k-mers más frecuentes como (k-mer, ocurrencias)"""
+        n = min(n, len(self.kmer_counts))
+        best = np.argpartition(self.kmer_counts, -n)[-n:]
+        best = best[np.argsort(self.kmer_counts[best])[::-1]]
+        return [(decode_kmer(int(c), self.k), int(self.kmer_counts[c])) for c in best if self.kmer_counts[c]]
+
+
+def stream_kmers(records, k, profile=None, table=None, canonical=False):
+    """Genera (inicio, códigos, válidas, hebras) de los k-mers de un flujo como el de read_records"""
+    carry = np.zeros(0, dtype=np.uint8)
+    position = record_start = 0
+    started = False
+    for name, chunk, new_record in records:
+        codes = encode_sequence(chunk)
+        if new_record:
+            if started and table is not None:
+                table.add(record_start, position - record_start, carry)
+            carry, record_start, started = carry[:0], position, True
+            if profile is not None:
+                profile.add_record(name)
+        if profile is not None:
+            profile.add_codes(codes)
+
+        window = np.concatenate((carry, codes)) if len(carry) else codes
+        if table is not None:
+            table.add_breaks(position - len(carry), window, len(carry))
+        kmers, where, strands = _window_kmers(window, k, canonical)
+        if len(kmers):
+            if profile is not None:
+                profile.kmer_counts += np.bincount(kmers if where is None else kmers[where],
+                                                   minlength=4 ** k)
+            yield position - len(carry), kmers, where, strands
+        carry = window[len(window) - min(k - 1, len(window)):]
+        position += len(codes)
+    if started and table is not None:
+        table.add(record_start, position - record_start, carry)
+
+
+def scan_file(path, k: int = 6, chunk_size: int = 1 << 20, workers: int = 1, table=None,
+              canonical: bool = False) -> SequenceProfile:
+    """Composición, GC y conteo de k-mers de un archivo en una sola pasada en streaming"""
+    if workers > 1:
+        return _scan_parallel(path, k, chunk_size, workers, table, canonical)
+    profile = SequenceProfile(k)
+    with open_sequence_file(path) as stream:
+        for _ in stream_kmers(read_records(stream, chunk_size), k, profile, table, canonical):
+            pass
+    return profile
+
+
+# ====================
+# Conteo de k-mers en paralelo
+# ====================
+def _wait_for(operation, processes):
+    """Reintenta una operación de cola con timeout mientras ningún trabajador haya fallado"""
+    while True:
+        try:
+            return operation()
+        except (queue.Full, queue.Empty):
+            if any(process.exitcode not in (None, 0) for process in processes):
+                raise RuntimeError("Un proceso de conteo de k-mers terminó con error")
+
+
+def _stream_worker(k, canonical, tasks, results):
+    """Trabajador de _scan_parallel: cuenta los trozos (solape, bytes) que recibe hasta llegar el None"""
+    counts = np.zeros(4 ** k, dtype=np.int64)
+    histogram = np.zeros(256, dtype=np.int64)
+    breaks = RecordTable(k)
+    for start, overlap, chunk in iter(tasks.get, None):
+        codes = encode_sequence(chunk)
+        histogram += np.bincount(codes[overlap:], minlength=256)
+        breaks.add_breaks(start, codes, overlap)
+        kmers, where, _ = _window_kmers(codes, k, canonical)
+        counts += np.bincount(kmers if where is None else kmers[where], minlength=4 ** k)
+    results.put((counts, histogram, breaks))
+
+
+def _scan_parallel(path, k, chunk_size, workers, table=None, canonical=False):
+    """scan_file con `workers` procesos que cuentan los trozos que lee y corta el proceso principal"""
+    profile = SequenceProfile(k)
+    tasks, results = mp.Queue(maxsize=2 * workers), mp.Queue()
+    processes = [mp.Process(target=_stream_worker, args=(k, canonical, tasks, results), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        carry, position, record_start, started = b"", 0, 0, False
+        with open_sequence_file(path) as stream:
+            for name, chunk, new_record in read_records(stream, chunk_size):
+                if new_record:
+                    if started and table is not None:
+                        table.add(record_start, position - record_start, encode_sequence(carry))
+                    carry, record_start, started = b"", position, True
+                    profile.add_record(name)
+                if len(profile.preview) < profile.PREVIEW_LENGTH:
+                    profile.add_preview(encode_sequence(chunk[:profile.PREVIEW_LENGTH]))
+                window = carry + chunk
+                _wait_for(lambda: tasks.put((position - len(carry), len(carry), window), timeout=1),
+                          processes)
+                carry = window[len(window) - min(k - 1, len(window)):]
+                position += len(chunk)
+        if started and table is not None:
+            table.add(record_start, position - record_start, encode_sequence(carry))
+
+        for _ in processes:
+            _wait_for(lambda: tasks.put(None, timeout=1), processes)
+        for _ in processes:
+            counts, histogram, breaks = _wait_for(lambda: results.get(timeout=1), processes)
+            profile.kmer_counts += counts
+            profile.add_histogram(histogram)
+            if table is not None:
+                table.extend(breaks)
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    for process in processes:
+        process.join()
+    return profile
+
+
+def _attach(name, dtype, shape):
+    """Bloque de memoria compartida ya creado y una vista NumPy sobre él"""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _range_worker(task):
+    """Trabajador de _build_parallel: cuenta o reparte las ventanas [start, stop) del genoma compartido"""
+    phase, names, n, total, k, canonical, workers, row, start, stop, chunk_size = task
+    blocks = []
+    try:
+        block, codes = _attach(names[0], np.uint8, (n,))
+        blocks.append(block)
+        block, table = _attach(names[1], np.uint32, (workers, 4 ** k))
+        blocks.append(block)
+        positions = None
+        if phase == "scatter":
+            block, positions = _attach(names[2], np.uint32, (total,))
+            blocks.append(block)
+        for chunk_start in range(start, stop, chunk_size):
+            kmers, where, strands = _window_kmers(
+                codes[chunk_start:min(chunk_start + chunk_size, stop) + k - 1], k, canonical)
+            if phase == "count":
+                table[row] += np.bincount(kmers if where is None else kmers[where],
+                                          minlength=4 ** k).astype(np.uint32)
+            else:
+                _scatter_positions(positions, table[row], chunk_start, kmers, where, strands)
+    finally:
+        codes = table = positions = None  # sin vistas vivas para poder cerrar los bloques
+        for block in blocks:
+            block.close()
+
+
+def _build_parallel(sequence, k, workers, chunk_size, canonical=False):
+    """(counts, offsets, positions) de KmerIndex.build con `workers` procesos"""
+    n = len(sequence)
+    windows = n - k + 1
+    bounds = [windows * i // workers for i in range(workers + 1)]
+    blocks = [shared_memory.SharedMemory(create=True, size=n),
+              shared_memory.SharedMemory(create=True, size=workers * 4 ** k * 4)]
+    codes = table = None
+    try:
+        codes = np.ndarray((n,), dtype=np.uint8, buffer=blocks[0].buf)
+        for start in range(0, n, chunk_size):
+            piece = sequence[start:start + chunk_size]
+            codes[start:start + len(piece)] = piece if isinstance(piece, np.ndarray) else encode_sequence(piece)
+        table = np.ndarray((workers, 4 ** k), dtype=np.uint32, buffer=blocks[1].buf)
+        table[:] = 0
+        names = [blocks[0].name, blocks[1].name, None]
+
+        def tasks(phase, total, size):
+            return [(phase, names, n, total, k, canonical, workers, row, bounds[row], bounds[row + 1], size)
+                    for row in range(workers)]
+
+        with mp.Pool(workers) as pool:
+            pool.map(_range_worker, tasks("count", 0, max(chunk_size, 4 ** k)))
+            counts = table.sum(axis=0, dtype=np.int64)
+            offsets = np.zeros(4 ** k + 1, dtype=np.uint32)
+            offsets[1:] = np.cumsum(counts)
+            starts = np.cumsum(table, axis=0, dtype=np.int64)
+            starts -= table
+            starts += offsets[:-1]
+            table[:] = starts
+            del starts
+
+            total = int(offsets[-1])
+            blocks.append(shared_memory.SharedMemory(create=True, size=max(1, total * 4)))
+            names[2] = blocks[2].name
+            pool.map(_range_worker, tasks("scatter", total, chunk_size))
+        positions = np.ndarray((total,), dtype=np.uint32, buffer=blocks[2].buf).copy()
+        return counts, offsets, positions
+    finally:
+        codes = table = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# ====================
+# Arreglo de sufijos e índice FM
+# ====================
+_BASE_BYTES = [bytes([c]) for c in range(len(BASES))]
+SA_INITIAL_WIDTH = 12  # 6^12 < 2^32: la clave inicial cabe junto a la posición en un uint64
+
+
+def suffix_array(codes, batch_size: int = 1 << 22) -> np.ndarray:
+    """Arreglo de sufijos de una secuencia codificada por duplicación de prefijos (Larsson-Sadakane)"""
+    n = len(codes)
+    if n == 0:
+        return np.zeros(0, dtype=np.uint32)
+    if n >= 1 << 32:
+        raise ValueError("El genoma no cabe en posiciones uint32")
+
+    symbols = codes.astype(np.uint32) + np.uint32(1)
+    symbols[codes == INVALID_CODE] = 5
+
+    def shifted(values, offset):
+        return np.concatenate((values[offset:], np.zeros(min(offset, n), dtype=values.dtype)))
+
+    # clave de los primeros SA_INITIAL_WIDTH símbolos, duplicando el ancho como kmer_codes
+    key, length, width, block = None, 0, 1, symbols
+    while True:
+        if SA_INITIAL_WIDTH & width:
+            piece = shifted(block, length)
+            key = piece if key is None else key * np.uint32(6 ** width) + piece
+            length += width
+        if length == SA_INITIAL_WIDTH:
+            break
+        block = block * np.uint32(6 ** width) + shifted(block, width)
+        width <<= 1
+    del block, piece, symbols
+
+    packed = key.astype(np.uint64) << np.uint64(32)
+    del key
+    packed |= np.arange(n, dtype=np.uint64)
+    packed.sort()
+    order = packed.astype(np.uint32)  # casilla -> sufijo
+    packed >>= np.uint64(32)
+    boundary = np.ones(n + 1, dtype=bool)  # boundary[i]: la casilla i empieza grupo (n: centinela)
+    boundary[1:n] = packed[1:] != packed[:-1]
+    del packed
+
+    # rango de un sufijo = primera casilla de su grupo en order
+    rank = np.empty(n, dtype=np.uint32)
+    rank[order] = np.maximum.accumulate(np.where(boundary[:n], np.arange(n, dtype=np.uint32), 0))
+
+    h = SA_INITIAL_WIDTH
+    while not boundary.all():
+        start = 0
+        while start < n:
+            # el lote termina al empezar un grupo para no partir ninguno
+            stop = min(start + batch_size, n)
+            stop += int(np.argmax(boundary[stop:]))
+            pending = np.flatnonzero(~(boundary[start:stop] & boundary[start + 1:stop + 1])) + start
+            if len(pending):
+                members = order[pending].astype(np.int64)
+                second = np.zeros(len(members), dtype=np.uint64)  # 0: el sufijo termina antes de h
+                inside = members + h < n
+                second[inside] = rank[members[inside] + h].astype(np.uint64) + np.uint64(1)
+                pair = (rank[members].astype(np.uint64) << np.uint64(32)) | second
+                by_pair = np.argsort(pair)
+                members = members[by_pair]
+                pair = pair[by_pair]
+                order[pending] = members
+                starts = np.concatenate(([True], pair[1:] != pair[:-1]))
+                boundary[pending] = starts
+                rank[members] = np.maximum.accumulate(np.where(starts, pending, 0))
+            start = stop
+        h *= 2
+    return order
+
+
+class FMIndex:
+    """Índice FM: BWT, conteos acumulados de ACGT cada OCC_STEP filas y arreglo de sufijos para localizar"""
+    OCC_STEP = 64
+
+    def __init__(self, suffixes, bwt, occ, first):
+        self.suffixes = suffixes  # fila 0: sufijo vacío (centinela)
+        self.bwt = bwt
+        self.occ = occ            # occ[b, c]: apariciones de c en bwt[:b * OCC_STEP]
+        self.first = first        # first[c]: filas cuyo sufijo empieza por un símbolo menor que c
+
+    @classmethod
+    def build(cls, sequence):
+        codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+        n = len(codes)
+        suffixes = np.concatenate((np.array([n], dtype=np.uint32), suffix_array(codes)))
+        # base anterior a cada sufijo; la del sufijo 0 es el centinela y no cuenta como ACGT
+        bwt = codes[suffixes.astype(np.int64) - 1] if n else np.zeros(1, dtype=np.uint8)
+        bwt[suffixes == 0] = INVALID_CODE
+
+        step = cls.OCC_STEP
+        blocks = np.full(-(-len(bwt) // step) * step, INVALID_CODE, dtype=np.uint8)
+        blocks[:len(bwt)] = bwt
+        blocks = blocks.reshape(-1, step)
+        occ = np.zeros((len(blocks) + 1, 4), dtype=np.uint32)
+        for c in range(4):
+            occ[1:, c] = np.cumsum(np.count_nonzero(blocks == c, axis=1))
+        first = 1 + np.concatenate(([0], np.cumsum(occ[-1].astype(np.int64))[:-1]))
+        return cls(suffixes, bwt.tobytes(), occ, first)
+
+    @property
+    def genome_length(self):
+        return len(self.suffixes) - 1
+
+    def _occ(self, c, i):
+        """Apariciones de la base c en bwt[:i]"""
+        block = i // self.OCC_STEP
+        return int(self.occ[block, c]) + self.bwt.count(_BASE_BYTES[c], block * self.OCC_STEP, i)
+
+    def interval(self, pattern: str):
+        """Filas [lo, hi) del arreglo de sufijos que empiezan por el patrón (búsqueda hacia atrás)"""
+        lo, hi = 0, len(self.suffixes)
+        for base in reversed(pattern.upper()):
+            c = BASES.find(base)
+            if c < 0:
+                return 0, 0
+            lo = int(self.first[c]) + self._occ(c, lo)
+            hi = int(self.first[c]) + self._occ(c, hi)
+            if lo >= hi:
+                return 0, 0
+        return lo, hi
+
+    def count(self, pattern: str) -> int:
+        lo, hi = self.interval(pattern)
+        return hi - lo
+
+    def locate(self, pattern: str) -> np.ndarray:
+        """Posiciones ordenadas de todas las apariciones del patrón"""
+        lo, hi = self.interval(pattern)
+        return np.sort(self.suffixes[lo:hi])
+
+    def approximate_locate(self, pattern: str, max_mismatches: int = 1):
+        """(posiciones, desajustes) de las apariciones a distancia de Hamming <= max_mismatches"""
+        masks = iupac_masks(pattern)
+        if masks is None or not len(masks):
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+        first = [int(f) for f in self.first]
+        intervals = []
+        stack = [(len(masks), 0, len(self.suffixes), 0)]
+        while stack:
+            i, lo, hi, cost = stack.pop()
+            if i == 0:
+                intervals.append((lo, hi, cost))
+                continue
+            mask = int(masks[i - 1])
+            for c in range(len(BASES)):
+                step = cost + (not (mask >> c) & 1)
+                if step > max_mismatches:
+                    continue
+                new_lo = first[c] + self._occ(c, lo)
+                new_hi = first[c] + self._occ(c, hi)
+                if new_lo < new_hi:
+                    stack.append((i - 1, new_lo, new_hi, step))
+
+        if not intervals:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+        starts, stops, costs = (np.array(column, dtype=np.int64) for column in zip(*intervals))
+        positions = self.suffixes[_concat_ranges(starts, stops - starts)]
+        mismatches = np.repeat(costs.astype(np.uint8), stops - starts)
+        order = np.argsort(positions)
+        return positions[order], mismatches[order]
+
+    @property
+    def nbytes(self):
+        return self.suffixes.nbytes + len(self.bwt) + self.occ.nbytes
+
+
+# ====================
+# Búsqueda de varios motivos a la vez (Aho-Corasick)
+# ====================
+class MotifScanner:
+    """Autómata de Aho-Corasick sobre ACGT para buscar un panel de motivos (IUPAC incluidos) en una pasada"""
+    LANE_LENGTH = 256
+    MAX_VARIANTS = 4096  # variantes ACGT por motivo al expandir los códigos IUPAC
+
+    def __init__(self, motifs):
+        self.motifs = list(motifs)
+        if not self.motifs:
+            raise ValueError("El panel no tiene motivos")
+        self.lengths = np.array([len(motif) for motif in self.motifs], dtype=np.int64)
+        self.max_length = int(self.lengths.max())
+
+        children = [[0] * len(BASES)]  # 0: sin hijo (la raíz nunca es hija)
+        own = [[]]
+        for motif_id, motif in enumerate(self.motifs):
+            for variant in self._variants(motif):
+                state = 0
+                for c in variant:
+                    if not children[state][c]:
+                        children[state][c] = len(children)
+                        children.append([0] * len(BASES))
+                        own.append([])
+                    state = children[state][c]
+                own[state].append(motif_id)
+
+        # en anchura: enlace de fallo de cada estado, transiciones que faltan y salidas acumuladas
+        table = np.zeros((len(children), len(BASES) + 1), dtype=np.int32)
+        fail = [0] * len(children)
+        outputs = [[] for _ in children]
+        level = [children[0][c] for c in range(len(BASES)) if children[0][c]]
+        table[0, :len(BASES)] = children[0]
+        for state in level:
+            outputs[state] = own[state]
+        while level:
+            following = []
+            for state in level:
+                row = table[fail[state]]
+                for c, child in enumerate(children[state]):
+                    if child:
+                        fail[child] = int(row[c])
+                        outputs[child] = own[child] + outputs[fail[child]]
+                        table[state, c] = child
+                        following.append(child)
+                    else:
+                        table[state, c] = row[c]
+            level = following
+
+        self.table = table.ravel()  # table[estado * 5 + símbolo]
+        self.output_offsets = np.zeros(len(children) + 1, dtype=np.int64)
+        self.output_offsets[1:] = np.cumsum([len(ids) for ids in outputs])
+        self.output_ids = np.array([i for ids in outputs for i in ids], dtype=np.int32)
+        self.has_output = np.diff(self.output_offsets) > 0
+
+    @classmethod
+    def _variants(cls, motif):
+        """Variantes ACGT (como códigos) de un motivo con códigos IUPAC"""
+        masks = iupac_masks(motif)
+        if masks is None or not len(masks):
+            raise ValueError(f"Motivo inválido: {motif!r}")
+        choices = [[c for c in range(len(BASES)) if (int(mask) >> c) & 1] for mask in masks]
+        if np.prod([len(options) for options in choices], dtype=np.float64) > cls.MAX_VARIANTS:
+            raise ValueError(f"El motivo {motif} tiene más de {cls.MAX_VARIANTS} variantes")
+        return itertools.product(*choices)
+
+    @property
+    def states(self):
+        return len(self.has_output)
+
+    def _run(self, codes):
+        """Estado del autómata tras leer cada base de `codes`, empezando desde la raíz"""
+        lane = max(self.LANE_LENGTH, 4 * self.max_length)
+        warmup = self.max_length
+        lanes = -(-len(codes) // lane)
+        symbols = np.full(warmup + lanes * lane, len(BASES), dtype=np.uint8)
+        symbols[warmup:warmup + len(codes)] = np.minimum(codes, len(BASES))
+        # columna j: la base j de cada carril, que empieza `warmup` bases antes de su tramo
+        columns = symbols[np.arange(warmup + lane)[:, None] + np.arange(lanes) * lane]
+
+        state = np.zeros(lanes, dtype=np.int64)
+        states = np.empty((lane, lanes), dtype=np.int32)
+        for j, column in enumerate(columns):
+            state = self.table[state * (len(BASES) + 1) + column]
+            if j >= warmup:
+                states[j - warmup] = state
+        return states.T.ravel()[:len(codes)]
+
+    def _matches(self, states, first_end=0):
+        """(inicios, motivos) de las apariciones que terminan en states[first_end:], relativos al texto"""
+        ends = np.flatnonzero(self.has_output[states[first_end:]]) + first_end
+        hit = states[ends]
+        lo = self.output_offsets[hit]
+        counts = self.output_offsets[hit + 1] - lo
+        motif_ids = self.output_ids[_concat_ranges(lo, counts)]
+        starts = np.repeat(ends, counts) - self.lengths[motif_ids] + 1
+        order = np.lexsort((motif_ids, starts))
+        return starts[order], motif_ids[order]
+
+    def scan(self, sequence, chunk_size: int = 1 << 22):
+        """(posiciones, índices de motivo) de todas las apariciones en una secuencia, ordenadas"""
+        found = list(self.scan_stream([(None, sequence[start:start + chunk_size], start == 0)
+                                       for start in range(0, len(sequence), chunk_size)]))
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+        starts, motif_ids = (np.concatenate(column) for column in zip(*found))
+        # una aparición larga que termina en un bloque puede empezar antes que las cortas del anterior
+        order = np.lexsort((motif_ids, starts))
+        return starts[order], motif_ids[order]
+
+    def scan_stream(self, records):
+        """Genera (posiciones, motivos) por trozo de un flujo como el de read_records"""
+        carry = np.zeros(0, dtype=np.uint8)
+        position = 0
+        for _, chunk, new_record in records:
+            codes = chunk if isinstance(chunk, np.ndarray) else encode_sequence(chunk)
+            if new_record:
+                carry = carry[:0]
+            window = np.concatenate((carry, codes)) if len(carry) else codes
+            if len(window):
+                starts, motif_ids = self._matches(self._run(window), len(carry))
+                if len(starts):
+                    yield starts + (position - len(carry)), motif_ids
+            carry = window[len(window) - min(self.max_length - 1, len(window)):]
+            position += len(codes)
+
+    def scan_file(self, path, chunk_size: int = 1 << 20):
+        """scan_stream sobre un FASTA/FASTQ leído por trozos, con memoria acotada"""
+        with open_sequence_file(path) as stream:
+            yield from self.scan_stream(read_records(stream, chunk_size))
+
+    def count(self, sequence) -> np.ndarray:
+        """Apariciones de cada motivo del panel"""
+        return np.bincount(self.scan(sequence)[1], minlength=len(self.motifs))
 
 
 # ====================
@@ -19,6 +1295,9 @@ class DNATrie:
     def __init__(self):
         self.root = DNATrieNode()
         self.genome_length = 0
+        self.kmer_index = None  # KmerIndex del último genoma indexado con insert_kmers
+        self.fm_index = None    # FMIndex del mismo genoma, para patrones más largos que k
+        self.profile = None     # SequenceProfile del genoma indexado (composición, GC, registros)
 
     def insert_sequence(self, sequence: str, position: int = 0, info: str = ""):
         """Inserta una secuencia de ADN en el Trie"""
@@ -40,22 +1319,65 @@ class DNATrie:
             node.sequence_info.append(info)
         return True
 
-    def insert_kmers(self, genome: str, k: int = 6):
-        """Indexa el genoma insertando todos los k-mers"""
-        genome = genome.upper().strip()
-        if not all(c in 'ACGT' for c in genome):
+    def insert_kmers(self, genome: str, k: int = 6, workers: int = 1, canonical: bool = False):
+        """Indexa los k-mers del genoma en un KmerIndex y el genoma completo en un FMIndex"""
+        codes = encode_sequence(genome.strip())
+        if (codes == INVALID_CODE).any():
             return False
-            
-        self.genome_length = len(genome)
-        
-        for i in range(len(genome) - k + 1):
-            kmer = genome[i:i+k]
-            self.insert_sequence(kmer, i, f"k-mer en posición {i}")
+
+        self.genome_length = len(codes)
+        self.kmer_index = KmerIndex.build(codes, k, workers=workers, canonical=canonical)
+        self.fm_index = FMIndex.build(codes)
+        self.profile = SequenceProfile(k)
+        self.profile.add_record(None)
+        self.profile.add_codes(codes)
+        self.profile.kmer_counts = self.kmer_index.counts
+        self.kmer_index.profile = self.profile
         return True
 
+    def index_file(self, path, k: int = 6, chunk_size: int = 1 << 20, workers: int = 1,
+                   canonical: bool = False):
+        """Indexa los k-mers de un FASTA/FASTQ leyéndolo por trozos (sin índice FM)"""
+        self.kmer_index = KmerIndex.from_file(path, k, chunk_size, workers, canonical)
+        self.fm_index = None
+        self.profile = self.kmer_index.profile
+        self.genome_length = self.profile.length
+        return self.profile
+
+    def save_index(self, path):
+        """Guarda el índice de k-mers (y el perfil del genoma) para reabrirlo con open_index"""
+        if self.kmer_index is None:
+            raise ValueError("No hay ningún genoma indexado")
+        self.kmer_index.save(path)
+
+    def open_index(self, path, verify: bool = False):
+        """Abre un índice guardado con save_index sin reconstruirlo (sin índice FM)"""
+        self.kmer_index = KmerIndex.load(path, verify)
+        self.fm_index = None
+        self.profile = self.kmer_index.profile
+        self.genome_length = self.profile.length
+        return self.profile
+
+    def record_label(self, position: int) -> str:
+        """Registro y desplazamiento de una posición si el genoma tiene varios registros"""
+        if self.kmer_index is None or len(self.kmer_index.record_starts) < 2:
+            return ""
+        record, offset = self.kmer_index.record_of(position)
+        names = self.profile.names if self.profile is not None else []
+        name = names[record] if record < len(names) else f"lectura {record + 1}"
+        return f" ({name}, +{offset})"
+
     def search_sequence(self, sequence: str):
         """Busca una secuencia específica y retorna sus posiciones"""
         sequence = sequence.upper().strip()
+        index = self.kmer_index
+        if index is not None and 0 < len(sequence) <= index.k:
+            return index.positions_of(sequence).tolist()
+        if self.fm_index is not None and sequence:
+            return self.fm_index.locate(sequence).tolist()
+        if index is not None and sequence:
+            return index.positions_of(sequence).tolist()
+
         node = self.root
         
         for nucleotide in sequence:
@@ -67,9 +1389,62 @@ class DNATrie:
             return node.positions
         return []
 
+    def search_both_strands(self, sequence: str):
+        """Busca una secuencia en las dos hebras y retorna (posición, '+' o '-') ordenadas por posición"""
+        sequence = sequence.upper().strip()
+        index = self.kmer_index
+        if index is not None and sequence and (len(sequence) <= index.k or self.fm_index is None):
+            positions, strands = index.strand_positions(sequence)
+            return [(int(p), "-" if s else "+") for p, s in zip(positions, strands)]
+
+        reverse = reverse_complement(sequence)
+        hits = [(p, "+") for p in self.search_sequence(sequence)]
+        if reverse != sequence:
+            hits += [(p, "-") for p in self.search_sequence(reverse)]
+        return sorted(hits)
+
+    def search_approximate(self, sequence: str, max_mismatches: int = 1):
+        """Busca una secuencia con hasta max_mismatches desajustes y retorna (posición, desajustes)"""
+        sequence = sequence.upper().strip()
+        index = self.kmer_index
+        if not sequence:
+            return []
+        # con desajustes, la poda por tramos vacíos del índice de k-mers gana a la vuelta atrás en el FM
+        if index is not None and (len(sequence) <= index.k or max_mismatches > 0 or self.fm_index is None):
+            positions, mismatches = index.approximate_positions(sequence, max_mismatches)
+        elif self.fm_index is not None:
+            positions, mismatches = self.fm_index.approximate_locate(sequence, max_mismatches)
+        else:
+            masks = iupac_masks(sequence)
+            hits = []
+            if masks is not None:
+                self._approximate_in_trie(self.root, masks, 0, 0, max_mismatches, hits)
+            return sorted(hits)
+        return list(zip(positions.tolist(), mismatches.tolist()))
+
+    def _approximate_in_trie(self, node, masks, depth, mismatches, max_mismatches, hits):
+        """Recorre el trie por todas las ramas y poda las que superan el límite de desajustes"""
+        if depth == len(masks):
+            if node.is_end_of_sequence:
+                hits.extend((position, mismatches) for position in node.positions)
+            return
+        for nucleotide, child_node in node.children.items():
+            cost = mismatches + (not (int(masks[depth]) >> BASES.index(nucleotide)) & 1)
+            if cost <= max_mismatches:
+                self._approximate_in_trie(child_node, masks, depth + 1, cost, max_mismatches, hits)
+
     def find_patterns(self, prefix: str):
         """Encuentra todos los patrones que empiecen con el prefijo dado"""
         prefix = prefix.upper().strip()
+        index = self.kmer_index
+        if index is not None and len(prefix) <= index.k:
+            return [{'sequence': kmer, 'positions': positions, 'count': len(positions)}
+                    for kmer, positions in index.kmers_with_prefix(prefix)]
+        if index is not None:
+            # más largo que k: todas sus apariciones forman un único patrón
+            positions = self.fm_index.locate(prefix) if self.fm_index is not None else index.positions_of(prefix)
+            return [{'sequence': prefix, 'positions': positions, 'count': len(positions)}] if len(positions) else []
+
         node = self.root
         
         for nucleotide in prefix:
@@ -152,6 +1527,15 @@ class DNAAnalyzerApp:
         tb.Button(genome_buttons_frame1, text="Indexar Genoma (k=6)", 
                  bootstyle="success", command=self.index_genome).pack(side=LEFT, padx=3)
 
+        tb.Button(genome_buttons_frame1, text="Indexar FASTA/FASTQ",
+                 bootstyle="primary", command=self.index_sequence_file).pack(side=LEFT, padx=3)
+
+        tb.Button(genome_buttons_frame1, text="Guardar Índice",
+                 bootstyle="secondary", command=self.save_index).pack(side=LEFT, padx=3)
+
+        tb.Button(genome_buttons_frame1, text="Abrir Índice",
+                 bootstyle="secondary", command=self.open_index).pack(side=LEFT, padx=3)
+
         # Dropdown para ejemplos precargados
         sample_frame = tb.Frame(genome_frame)
         sample_frame.pack(pady=5, fill=X)
@@ -210,6 +1594,18 @@ class DNAAnalyzerApp:
         tb.Button(search_buttons, text="Buscar Patrones", 
                  bootstyle="warning-outline", command=self.pattern_search).pack(side=LEFT, padx=5)
 
+        tb.Button(search_buttons, text="Búsqueda Aproximada",
+                 bootstyle="info-outline", command=self.approximate_search).pack(side=LEFT, padx=5)
+        tb.Label(search_buttons, text="desajustes:").pack(side=LEFT)
+        self.mismatches_var = tk.IntVar(value=1)
+        tb.Spinbox(search_buttons, from_=0, to=3, width=3, textvariable=self.mismatches_var,
+                   state="readonly").pack(side=LEFT, padx=(2, 5))
+
+        # ambas hebras: índice de k-mers canónicos y resultados con hebra
+        self.both_strands = tk.BooleanVar(value=False)
+        tb.Checkbutton(search_buttons, text="Ambas hebras", variable=self.both_strands,
+                       bootstyle="round-toggle").pack(side=LEFT, padx=5)
+
         # Listbox para sugerencias
         tb.Label(search_frame, text="Patrones encontrados:").pack(anchor=W, pady=(10,0))
         self.suggestions_listbox = tk.Listbox(search_frame, width=80, height=6, 
@@ -350,15 +1746,14 @@ class DNAAnalyzerApp:
         # Limpiar el Trie anterior
         self.dna_trie = DNATrie()
         
-        if self.dna_trie.insert_kmers(genome, k=6):
-            self.stats_label.config(text=f"Genoma indexado: {len(genome)} nucleótidos, k-mers de 6")
+        canonical = self.both_strands.get()
+        if self.dna_trie.insert_kmers(genome, k=6, canonical=canonical):
+            self.stats_label.config(text=f"Genoma indexado: {len(genome)} nucleótidos, k-mers "
+                                         f"{'canónicos ' if canonical else ''}de 6 + índice FM")
             
-            # Análisis básico del genoma
-            a_count = genome.count('A')
-            c_count = genome.count('C')
-            g_count = genome.count('G')
-            t_count = genome.count('T')
-            gc_content = (c_count + g_count) / len(genome) * 100
+            # Análisis básico del genoma (composición contada al codificarlo)
+            a_count, c_count, g_count, t_count = (int(n) for n in self.dna_trie.profile.composition[:4])
+            gc_content = self.dna_trie.profile.gc_content
             
             self.results_text.delete(1.0, tk.END)
             self.results_text.insert(tk.END, f"✅ GENOMA INDEXADO EXITOSAMENTE\n")
@@ -376,9 +1771,9 @@ class DNAAnalyzerApp:
             # Buscar algunos patrones comunes automáticamente
             common_patterns = ["ATG", "GAATTC", "GGATCC", "TATA", "CGCG"]
             self.results_text.insert(tk.END, f"🔍 ANÁLISIS RÁPIDO DE PATRONES COMUNES:\n")
-            for pattern in common_patterns:
-                positions = self.dna_trie.search_sequence(pattern)
-                count = len(positions)
+            # una sola pasada por el genoma para todo el panel
+            counts = MotifScanner(common_patterns).count(genome)
+            for pattern, count in zip(common_patterns, counts):
                 if count > 0:
                     self.results_text.insert(tk.END, f"  {pattern}: {count} ocurrencias\n")
                 else:
@@ -390,6 +1785,99 @@ class DNAAnalyzerApp:
             self.results_text.insert(tk.END, "❌ Error: El genoma contiene caracteres inválidos\n")
             self.results_text.insert(tk.END, "   Solo se permiten nucleótidos: A, C, G, T\n")
 
+    def index_sequence_file(self):
+        """Indexa un FASTA/FASTQ por trozos, sin pasar el genoma por el cuadro de texto"""
+        path = filedialog.askopenfilename(
+            title="Genoma o lecturas",
+            filetypes=[("FASTA/FASTQ", "*.fa *.fasta *.fna *.fq *.fastq *.gz"), ("Todos", "*")])
+        if not path:
+            return
+
+        dna_trie = DNATrie()
+        try:
+            start = time.perf_counter()
+            profile = dna_trie.index_file(path, k=6, workers=os.cpu_count() or 1,
+                                          canonical=self.both_strands.get())
+            seconds = time.perf_counter() - start
+        except (OSError, ValueError) as e:
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(tk.END, f"❌ Error al leer el archivo: {e}\n")
+            return
+        self.dna_trie = dna_trie
+        self.genome_text.delete(1.0, tk.END)
+        self.stats_label.config(text=f"Archivo indexado: {profile.length} nucleótidos en "
+                                     f"{profile.records} registros, k-mers de 6")
+        self.show_profile(f"✅ ARCHIVO INDEXADO: {os.path.basename(path)}", profile, seconds)
+
+    def save_index(self):
+        """Guarda el índice actual para reabrirlo sin volver a indexar"""
+        if self.dna_trie.kmer_index is None:
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(tk.END, "❌ Error: Primero indexa un genoma\n")
+            return
+        path = filedialog.asksaveasfilename(title="Guardar índice", defaultextension=".p5idx",
+                                            filetypes=[("Índice de k-mers", "*.p5idx")])
+        if not path:
+            return
+        try:
+            start = time.perf_counter()
+            self.dna_trie.save_index(path)
+            seconds = time.perf_counter() - start
+        except OSError as e:
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(tk.END, f"❌ Error al guardar el índice: {e}\n")
+            return
+        self.results_text.insert(tk.END, f"💾 Índice guardado en {os.path.basename(path)} "
+                                         f"({os.path.getsize(path) / 2 ** 20:.1f} MB, {seconds:.2f} s)\n")
+
+    def open_index(self):
+        """Reabre un índice guardado (memoria mapeada: no se reconstruye ni se carga entero)"""
+        path = filedialog.askopenfilename(title="Abrir índice",
+                                          filetypes=[("Índice de k-mers", "*.p5idx"), ("Todos", "*")])
+        if not path:
+            return
+
+        dna_trie = DNATrie()
+        try:
+            start = time.perf_counter()
+            profile = dna_trie.open_index(path)
+            seconds = time.perf_counter() - start
+        except (OSError, ValueError) as e:
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(tk.END, f"❌ Error al abrir el índice: {e}\n")
+            return
+        self.dna_trie = dna_trie
+        self.genome_text.delete(1.0, tk.END)
+        index = dna_trie.kmer_index
+        self.stats_label.config(text=f"Índice abierto: {profile.length} nucleótidos en {profile.records} "
+                                     f"registros, k-mers {'canónicos ' if index.canonical else ''}de {index.k}")
+        self.show_profile(f"✅ ÍNDICE ABIERTO: {os.path.basename(path)}", profile, seconds)
+
+    def show_profile(self, title, profile, seconds):
+        """Resumen de un genoma indexado desde archivo: registros, composición, k-mers y primeras bases"""
+        length = max(profile.length, 1)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"{title}\n")
+        self.results_text.insert(tk.END, "="*45 + "\n")
+        self.results_text.insert(tk.END, f"📄 Registros: {profile.records}\n")
+        self.results_text.insert(tk.END, f"🧬 Longitud total: {profile.length} nucleótidos\n")
+        self.results_text.insert(tk.END, f"⏱️ Tiempo: {seconds:.2f} s "
+                                         f"({profile.length / max(seconds, 1e-9) / 1e6:.1f} Mbp/s)\n")
+        self.results_text.insert(tk.END, f"📊 Contenido GC: {profile.gc_content:.1f}%\n\n")
+
+        self.results_text.insert(tk.END, "📈 COMPOSICIÓN DE NUCLEÓTIDOS:\n")
+        for base, count in zip(BASES + "N", profile.composition):
+            self.results_text.insert(tk.END, f"  {base}: {int(count):4d} ({count / length * 100:.1f}%)\n")
+
+        self.results_text.insert(tk.END, "\n🔍 K-MERS MÁS FRECUENTES:\n")
+        for kmer, count in profile.top_kmers():
+            self.results_text.insert(tk.END, f"  {kmer}: {count} ocurrencias\n")
+
+        self.results_text.insert(tk.END, "\n🔬 PRIMERAS BASES:\n")
+        for i in range(0, len(profile.preview), 60):
+            self.results_text.insert(tk.END, f"{i + 1:>4}: {profile.preview[i:i + 60]}\n")
+        self.results_text.insert(tk.END, "\n🚀 ¡Listo para búsquedas!\n\n")
+
     def update_suggestions(self, event=None):
         """Actualiza las sugerencias mientras se escribe"""
         prefix = self.search_entry.get().upper()
@@ -413,7 +1901,10 @@ class DNAAnalyzerApp:
             self.results_text.insert(tk.END, "❌ Error: La secuencia solo debe contener A, C, G, T\n")
             return
 
-        positions = self.dna_trie.search_sequence(sequence)
+        if self.both_strands.get():
+            positions = [(pos, f" hebra {strand}") for pos, strand in self.dna_trie.search_both_strands(sequence)]
+        else:
+            positions = [(pos, "") for pos in self.dna_trie.search_sequence(sequence)]
         
         self.results_text.delete(1.0, tk.END)
         self.results_text.insert(tk.END, f"🔍 BÚSQUEDA EXACTA: {sequence}\n")
@@ -421,13 +1912,45 @@ class DNAAnalyzerApp:
         
         if positions:
             self.results_text.insert(tk.END, f"✅ Secuencia encontrada en {len(positions)} posiciones:\n")
-            for i, pos in enumerate(positions[:20]):  # Mostrar máximo 20 posiciones
-                self.results_text.insert(tk.END, f"  Posición {pos}\n")
+            for i, (pos, strand) in enumerate(positions[:20]):  # Mostrar máximo 20 posiciones
+                self.results_text.insert(tk.END, f"  Posición {pos}{strand}{self.dna_trie.record_label(pos)}\n")
             if len(positions) > 20:
                 self.results_text.insert(tk.END, f"  ... y {len(positions)-20} posiciones más\n")
         else:
             self.results_text.insert(tk.END, "❌ Secuencia no encontrada en el genoma indexado\n")
 
+    def approximate_search(self):
+        """Busca la secuencia permitiendo desajustes y códigos IUPAC (N, R, Y...)"""
+        sequence = self.search_entry.get().upper().strip()
+        
+        if not sequence:
+            return
+
+        if iupac_masks(sequence) is None:
+            self.results_text.delete(1.0, tk.END)
+            self.results_text.insert(tk.END, "❌ Error: Solo se permiten códigos IUPAC "
+                                             f"({''.join(IUPAC_CODES)})\n")
+            return
+
+        max_mismatches = self.mismatches_var.get()
+        hits = self.dna_trie.search_approximate(sequence, max_mismatches)
+
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"🔍 BÚSQUEDA APROXIMADA: {sequence} (hasta {max_mismatches} desajustes)\n")
+        self.results_text.insert(tk.END, "="*50 + "\n\n")
+
+        if hits:
+            by_cost = [sum(1 for _, cost in hits if cost == d) for d in range(max_mismatches + 1)]
+            summary = ", ".join(f"{count} con {d}" for d, count in enumerate(by_cost))
+            self.results_text.insert(tk.END, f"✅ {len(hits)} apariciones ({summary}):\n")
+            for pos, cost in hits[:20]:  # Mostrar máximo 20 posiciones
+                self.results_text.insert(tk.END, f"  Posición {pos}: {cost} desajustes"
+                                                 f"{self.dna_trie.record_label(pos)}\n")
+            if len(hits) > 20:
+                self.results_text.insert(tk.END, f"  ... y {len(hits)-20} posiciones más\n")
+        else:
+            self.results_text.insert(tk.END, "❌ Ninguna aparición dentro del límite de desajustes\n")
+
     def pattern_search(self):
         """Busca todos los patrones que empiecen con la secuencia dada"""
         prefix = self.search_entry.get().upper().strip()